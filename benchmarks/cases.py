@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from harness import Case
+from vlfm_repro.frontier.frontier_extractor import cluster_frontiers, find_frontier_cells, frontier_mask
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.viz.image_io import encode_png
+from vlfm_repro.viz.raster import render_map
+from vlfm_repro.vlm.observation_updater import Observation, apply_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+SIZES = ((120, 160), (500, 500), (1000, 1000), (2000, 2000), (4000, 4000))
+QUICK_SIZES = ((120, 160), (500, 500))
+DENSITIES = (0.002, 0.02)   # target fraction of cells that are frontier
+CLUSTERS = (8, 128)
+PATCHES = (32, 256)          # update_patch side (cells)
+RADII = (12, 60)             # apply_observation radius (cells)
+
+
+def make_frontier_grid(h: int, w: int, density: float, clusters: int, seed: int = 0) -> OccupancyGrid:
+    """Explored map with `clusters` unknown square holes sized for a target frontier density.
+
+    Every hole is ringed by one 4-connected frontier of about 4*side cells,
+    so the frontier density and cluster count are set independently. Holes
+    sit on a jittered lattice at least 3 cells apart, which caps their side
+    on small maps, and are at least 2 cells wide so that every ring passes
+    the default `min_cluster_size`; the achieved density is reported by
+    the cases.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((h, w), dtype=np.int8)
+    n = math.ceil(math.sqrt(clusters))
+    cell_h, cell_w = h // n, w // n
+    side = int(density * h * w / (4 * clusters))
+    side = max(2, min(side, cell_h - 4, cell_w - 4))
+    slots = rng.permutation(n * n)[:clusters]
+    for k in slots:
+        r0 = (k // n) * cell_h + 2 + int(rng.integers(0, cell_h - side - 3))
+        c0 = (k % n) * cell_w + 2 + int(rng.integers(0, cell_w - side - 3))
+        grid[r0:r0 + side, c0:c0 + side] = -1
+    return OccupancyGrid(grid=grid, resolution=0.05)
+
+
+def make_value_map(h: int, w: int, seed: int = 0) -> ValueMap:
+    rng = np.random.default_rng(seed)
+    vm = ValueMap.zeros(h, w)
+    vm.update_patch(0, 0, rng.random((h, w), dtype=np.float32), np.full((h, w), 0.5, dtype=np.float32))
+    return vm
+
+
+def _frontier_info(og: OccupancyGrid) -> dict:
+    mask = frontier_mask(og)
+    return {"frontier_cells": int(mask.sum()), "density": float(mask.mean())}
+
+
+def _find_cells(h: int, w: int, density: float):
+    def setup():
+        og = make_frontier_grid(h, w, density, clusters=CLUSTERS[-1])
+        return (lambda: find_frontier_cells(og)), _frontier_info(og)
+    return setup
+
+
+def _cluster(h: int, w: int, density: float, clusters: int):
+    def setup():
+        og = make_frontier_grid(h, w, density, clusters)
+        mask = frontier_mask(og)
+        info = {**_frontier_info(og), "clusters": len(cluster_frontiers(og, mask))}
+        return (lambda: cluster_frontiers(og, mask)), info
+    return setup
+
+
+def _rank(h: int, w: int, density: float, clusters: int):
+    def setup():
+        og = make_frontier_grid(h, w, density, clusters)
+        found = cluster_frontiers(og, frontier_mask(og))
+        vm = make_value_map(h, w)
+        return (lambda: rank_frontiers(vm, found)), {"clusters": len(found)}
+    return setup
+
+
+def _update_patch(h: int, w: int, side: int):
+    def setup():
+        rng = np.random.default_rng(0)
+        vm = make_value_map(h, w)
+        ph, pw = min(side, h), min(side, w)
+        value = rng.random((ph, pw), dtype=np.float32)
+        conf = rng.random((ph, pw), dtype=np.float32)
+        r0, c0 = (h - ph) // 2, (w - pw) // 2
+        return (lambda: vm.update_patch(r0, c0, value, conf)), {"patch_cells": ph * pw}
+    return setup
+
+
+def _apply_observation(h: int, w: int, radius: int):
+    def setup():
+        vm = make_value_map(h, w)
+        obs = Observation(center_rc=(h // 2, w // 2), score=0.7, confidence=0.8, radius_cells=radius)
+        return (lambda: apply_observation(vm, obs)), {}
+    return setup
+
+
+def _render(h: int, w: int):
+    def setup():
+        og = make_frontier_grid(h, w, DENSITIES[-1], CLUSTERS[-1])
+        mask = frontier_mask(og)
+        vm = make_value_map(h, w)
+        ranked = rank_frontiers(vm, cluster_frontiers(og, mask))
+        return (lambda: render_map(og.grid, vm.value, vm.conf, mask, ranked)), {}
+    return setup
+
+
+def _encode_png(h: int, w: int):
+    def setup():
+        og = make_frontier_grid(h, w, DENSITIES[-1], CLUSTERS[-1])
+        vm = make_value_map(h, w)
+        img = render_map(og.grid, vm.value, vm.conf)
+        return (lambda: encode_png(img)), {"png_bytes": len(encode_png(img))}
+    return setup
+
+
+def all_cases(sizes=SIZES) -> list[Case]:
+    cases = []
+    for h, w in sizes:
+        size = f"{h}x{w}"
+        for d in DENSITIES:
+            cases.append(Case("frontier.find_cells", {"size": size, "density": d}, _find_cells(h, w, d)))
+            for k in CLUSTERS:
+                params = {"size": size, "density": d, "clusters": k}
+                cases.append(Case("frontier.cluster", params, _cluster(h, w, d, k)))
+                cases.append(Case("nav.rank_frontiers", params, _rank(h, w, d, k)))
+        for side in PATCHES:
+            cases.append(Case("value_map.update_patch", {"size": size, "patch": side}, _update_patch(h, w, side)))
+        for radius in RADII:
+            cases.append(Case("vlm.apply_observation", {"size": size, "radius": radius}, _apply_observation(h, w, radius)))
+        cases.append(Case("viz.render_map", {"size": size}, _render(h, w)))
+        cases.append(Case("viz.encode_png", {"size": size}, _encode_png(h, w)))
+    return cases
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+
+@dataclass
+class Case:
+    """One benchmark: `setup()` builds the inputs once and returns (zero-arg call to time, info dict)."""
+    kernel: str
+    params: dict[str, Any]
+    setup: Callable[[], tuple[Callable[[], Any], dict[str, Any]]]
+
+    @property
+    def id(self) -> str:
+        return f"{self.kernel}[{','.join(f'{k}={v}' for k, v in self.params.items())}]"
+
+
+@dataclass
+class Protocol:
+    warmup: int = 1           # untimed calls before sampling
+    repeat: int = 5           # timed samples
+    min_sample_s: float = 0.01  # each sample loops the call until it takes at least this long
+    max_number: int = 1000
+
+
+@dataclass
+class CaseResult:
+    id: str
+    kernel: str
+    params: dict[str, Any]
+    number: int               # calls per sample
+    samples_ms: list[float]   # per-call time of each sample
+    peak_mem_mb: float        # tracemalloc peak of one call, above the live heap before it
+    info: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.samples_ms)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "kernel": self.kernel,
+            "params": self.params,
+            "number": self.number,
+            "min_ms": self.min_ms,
+            "median_ms": self.median_ms,
+            "samples_ms": self.samples_ms,
+            "peak_mem_mb": self.peak_mem_mb,
+            "info": self.info,
+        }
+
+
+def _calibrate(fn: Callable[[], Any], proto: Protocol) -> int:
+    """Calls per sample so that one sample lasts at least `proto.min_sample_s`."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= proto.min_sample_s or number >= proto.max_number:
+            return number
+        number = min(proto.max_number, max(2 * number, math.ceil(number * proto.min_sample_s / max(dt, 1e-9))))
+
+
+def peak_memory_mb(fn: Callable[[], Any]) -> float:
+    """Peak traced allocation of one call (NumPy buffers included) in MiB."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        out = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        del out
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return max(0, peak - base) / 2**20
+
+
+def run_case(case: Case, proto: Protocol) -> CaseResult:
+    fn, info = case.setup()
+    for _ in range(proto.warmup):
+        fn()
+    # Like timeit: collect garbage left by earlier cases, then keep the
+    # collector out of the timed loops.
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = _calibrate(fn, proto)
+        samples = []
+        for _ in range(proto.repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append(1e3 * (time.perf_counter() - t0) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    # Measured separately: tracing slows allocation-heavy kernels several-fold.
+    mem = peak_memory_mb(fn)
+    return CaseResult(case.id, case.kernel, case.params, number, samples, mem, dict(info))
+
+
+def machine_info() -> dict[str, Any]:
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "node": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def machine_tag(info: dict[str, Any] | None = None) -> str:
+    """Stable name for this machine + interpreter, e.g. ``linux-x86_64-4cpu-py3.11-np1.26.4-1a2b3c``."""
+    m = info or machine_info()
+    host = hashlib.sha1(f"{m['node']}|{m['processor']}".encode("utf-8")).hexdigest()[:6]
+    py = ".".join(m["python"].split(".")[:2])
+    return f"{m['system'].lower()}-{m['machine']}-{m['cpu_count']}cpu-py{py}-np{m['numpy']}-{host}"
+
+
+def save_results(results: list[CaseResult], path: str | Path, proto: Protocol) -> dict[str, Any]:
+    info = machine_info()
+    doc = {
+        "machine_tag": machine_tag(info),
+        "machine": info,
+        "created_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "protocol": vars(proto),
+        "cases": [r.as_dict() for r in results],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return doc
+
+
+@dataclass
+class Regression:
+    id: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = 0.25,
+    min_ms: float = 0.25,
+    min_mem_mb: float = 1.0,
+) -> tuple[list[Regression], list[tuple[str, float]]]:
+    """Cases whose best time or peak memory grew by more than `threshold` over `baseline`.
+
+    Times are compared on the per-call minimum, which is the least noisy
+    statistic for these deterministic kernels. Differences below `min_ms` /
+    `min_mem_mb` are ignored as noise, and cases whose generated workload
+    (`info`) changed are not compared. Also returns (id, time ratio) for
+    every compared case.
+    """
+    base = {c["id"]: c for c in baseline["cases"]}
+    regressions, ratios = [], []
+    for c in current["cases"]:
+        b = base.get(c["id"])
+        if b is None or b.get("info") != c.get("info"):
+            continue
+        ratios.append((c["id"], c["min_ms"] / b["min_ms"] if b["min_ms"] else math.inf))
+        if c["min_ms"] > b["min_ms"] * (1 + threshold) and c["min_ms"] - b["min_ms"] > min_ms:
+            regressions.append(Regression(c["id"], "min_ms", b["min_ms"], c["min_ms"]))
+        if c["peak_mem_mb"] > b["peak_mem_mb"] * (1 + threshold) and c["peak_mem_mb"] - b["peak_mem_mb"] > min_mem_mb:
+            regressions.append(Regression(c["id"], "peak_mem_mb", b["peak_mem_mb"], c["peak_mem_mb"]))
+    return regressions, ratios
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import sys
+import time
+from pathlib import Path
+
+from cases import QUICK_SIZES, SIZES, all_cases
+from harness import Protocol, compare, machine_tag, run_case, save_results
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _parse_size(s: str) -> tuple[int, int]:
+    h, _, w = s.partition("x")
+    return int(h), int(w or h)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Kernel benchmarks with warmup/repeat timing, peak memory and baseline regression checks."
+    )
+    ap.add_argument("--sizes", type=_parse_size, nargs="+", default=None, help="Map sizes as HxW (default: 120x160 .. 4000x4000)")
+    ap.add_argument("--quick", action="store_true", help=f"Only sizes {', '.join(f'{h}x{w}' for h, w in QUICK_SIZES)}")
+    ap.add_argument("-k", "--filter", default="*", help="fnmatch pattern on case ids, e.g. 'frontier.*'")
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-sample-ms", type=float, default=10.0, help="Loop fast kernels until one sample takes this long")
+    ap.add_argument("--out-dir", default=str(ROOT / "results" / "bench"))
+    ap.add_argument("--baseline", default=None, help="Baseline JSON (default: <out-dir>/baseline-<machine tag>.json)")
+    ap.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline for this machine")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown / memory growth (0.25 = 25%%)")
+    ap.add_argument("--min-delta-ms", type=float, default=0.25, help="Ignore slowdowns smaller than this (timer noise)")
+    ap.add_argument("--list", action="store_true", help="Print case ids and exit")
+    args = ap.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    cases = [c for c in all_cases(sizes) if fnmatch.fnmatch(c.id, args.filter)]
+    if args.list:
+        print("\n".join(c.id for c in cases))
+        return 0
+
+    proto = Protocol(warmup=args.warmup, repeat=args.repeat, min_sample_s=args.min_sample_ms / 1e3)
+    results = []
+    print(f"{'case':70s} {'min ms':>10} {'median ms':>10} {'calls':>6} {'peak MiB':>9}")
+    for case in cases:
+        r = run_case(case, proto)
+        results.append(r)
+        print(f"{r.id:70s} {r.min_ms:10.3f} {r.median_ms:10.3f} {r.number:6d} {r.peak_mem_mb:9.1f}", flush=True)
+
+    tag = machine_tag()
+    out_dir = Path(args.out_dir)
+    out = out_dir / f"{tag}-{time.strftime('%Y%m%dT%H%M%S')}.json"
+    doc = save_results(results, out, proto)
+    print(f"[OK] Wrote: {out}")
+
+    baseline_path = Path(args.baseline) if args.baseline else out_dir / f"baseline-{tag}.json"
+    if args.save_baseline:
+        save_results(results, baseline_path, proto)
+        print(f"[OK] Baseline: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"[INFO] No baseline at {baseline_path}; rerun with --save-baseline to create one.")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline.get("machine_tag") != tag:
+        print(f"[WARN] Baseline was recorded on {baseline.get('machine_tag')}, this is {tag}")
+    regressions, ratios = compare(doc, baseline, threshold=args.threshold, min_ms=args.min_delta_ms)
+    if ratios:
+        geo = 1.0
+        for _, x in ratios:
+            geo *= x
+        print(f"Compared {len(ratios)} cases to {baseline_path.name}: geometric mean time ratio {geo ** (1 / len(ratios)):.3f}")
+    for reg in regressions:
+        print(f"[REGRESSION] {reg.id} {reg.metric}: {reg.baseline:.3f} -> {reg.current:.3f} ({reg.ratio:.2f}x)")
+    if regressions:
+        print(f"[FAIL] {len(regressions)} regression(s) beyond {100 * args.threshold:.0f}%")
+        return 1
+    print("[OK] No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
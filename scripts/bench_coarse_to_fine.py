@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import cluster_frontiers, frontier_mask
+from vlfm_repro.mapping.pyramid import MapPyramid
+from vlfm_repro.mapping.synthetic import make_explored_grid, make_office_grid
+from vlfm_repro.nav.coarse_to_fine import coarse_to_fine_frontiers
+from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.vlm.observation_updater import Observation, apply_observations
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def make_value_map(shape: tuple[int, int], n_blobs: int, seed: int = 0) -> ValueMap:
+    """Value map with a few semantic hot spots of varying strength."""
+    rng = np.random.default_rng(seed)
+    vm = ValueMap.zeros(*shape)
+    h, w = shape
+    apply_observations(vm, [
+        Observation(center_rc=(int(r), int(c)), score=float(s), confidence=0.8, radius_cells=int(rad))
+        for r, c, s, rad in zip(
+            rng.integers(0, h, n_blobs), rng.integers(0, w, n_blobs),
+            rng.random(n_blobs), rng.integers(10, 60, n_blobs),
+        )
+    ])
+    return vm
+
+
+def make_mostly_explored_office(n: int, unknown_fraction: float = 0.3, seed: int = 0):
+    """Office lattice that is explored except for some unvisited rooms.
+
+    Frontiers then sit at the doors of the unknown rooms, which is where
+    coarse-to-fine search pays off.
+    """
+    rng = np.random.default_rng(seed)
+    og = make_office_grid(n, seed=seed)
+    step = max(20, n // 10)
+    edges = list(range(0, n, step)) + [n]
+    for r0, r1 in zip(edges[:-1], edges[1:]):
+        for c0, c1 in zip(edges[:-1], edges[1:]):
+            if rng.random() < unknown_fraction:
+                og.grid[r0 + 1:r1, c0 + 1:c1] = -1
+    return og
+
+
+def ranking_loss(fast: list, full: list) -> tuple[float, float]:
+    """(top-k overlap fraction, summed score regret) of `fast` against `full`."""
+    k = len(full)
+    if k == 0:
+        return 1.0, 0.0
+    ids = {tuple(map(tuple, rf.cluster.cells[:1])) for rf in full}
+    hits = sum(tuple(map(tuple, rf.cluster.cells[:1])) in ids for rf in fast)
+    return hits / k, sum(rf.score for rf in full) - sum(rf.score for rf in fast)
+
+
+def best_of(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000])
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--levels", type=int, default=2)
+    ap.add_argument("--factor", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    k = args.top_k
+    scenes = (("rooms", lambda n: make_explored_grid(n, n)), ("office", make_mostly_explored_office))
+    for (scene, make), n in ((sc, n) for sc in scenes for n in args.sizes):
+        og = make(n)
+        vm = make_value_map(og.shape, n_blobs=max(20, n // 50))
+
+        t_full, full = best_of(lambda: rank_frontiers(vm, cluster_frontiers(og, frontier_mask(og)))[:k], args.repeat)
+        t0 = time.perf_counter()
+        pyr = MapPyramid(og, vm, levels=args.levels, factor=args.factor)
+        t_build = time.perf_counter() - t0
+
+        print(f"{scene} {n}x{n}: exhaustive {1e3 * t_full:8.1f} ms, pyramid build {1e3 * t_build:7.1f} ms")
+        for label, cap in (("exact", None), ("top-1 region", 1), (f"top-{k} regions", k)):
+            t, fast = best_of(lambda: coarse_to_fine_frontiers(pyr, top_k=k, max_regions=cap), args.repeat)
+            overlap, regret = ranking_loss(fast, full)
+            print(f"  {label:15s} {1e3 * t:8.1f} ms  ({t_full / t:5.1f}x)  top-{k} overlap {overlap:4.2f}  score regret {regret:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from vlfm_repro.mapping.depth_integration import CameraIntrinsics, CameraPose, DepthIntegrator
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+
+def make_depth_frame(intr: CameraIntrinsics, cam_height: float, rng: np.random.Generator) -> np.ndarray:
+    """Floor plus a few box obstacles at random depths, seen by a level camera."""
+    v = np.arange(intr.height, dtype=np.float32)[:, None]
+    up = -(v - intr.cy) / intr.fy
+    floor = np.where(up < 0, cam_height / np.maximum(-up, 1e-6), np.inf)
+    depth = np.broadcast_to(np.minimum(floor, 4.5), (intr.height, intr.width)).copy()
+    for _ in range(6):
+        c0 = int(rng.integers(0, intr.width - 40))
+        depth[:, c0:c0 + int(rng.integers(20, 120))] = np.minimum(
+            depth[:, c0:c0 + 1], float(rng.uniform(0.8, 4.0))
+        )
+    return depth.astype(np.float32)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=2000, help="Map side (cells)")
+    ap.add_argument("--frames", type=int, default=50)
+    ap.add_argument("--width", type=int, default=640)
+    ap.add_argument("--height", type=int, default=480)
+    ap.add_argument("--stride", type=int, default=1)
+    args = ap.parse_args()
+
+    og = OccupancyGrid(grid=-np.ones((args.size, args.size), dtype=np.int8), resolution=0.05)
+    intr = CameraIntrinsics.from_hfov(args.width, args.height, np.deg2rad(79.0))
+    integ = DepthIntegrator(og, stride=args.stride)
+    rng = np.random.default_rng(0)
+    center = 0.5 * args.size * og.resolution
+
+    times = []
+    for _ in range(args.frames):
+        depth = make_depth_frame(intr, 0.88, rng)
+        pose = CameraPose(
+            x=center + float(rng.uniform(-5, 5)), y=center + float(rng.uniform(-5, 5)),
+            z=0.88, yaw=float(rng.uniform(-np.pi, np.pi)),
+        )
+        t0 = time.perf_counter()
+        integ.integrate(depth, intr, pose)
+        times.append(time.perf_counter() - t0)
+
+    ms = 1e3 * np.array(times[1:])
+    print(f"map {args.size}x{args.size}, {args.width}x{args.height} depth, stride {args.stride}")
+    print(f"per frame: p50 {np.percentile(ms, 50):.2f} ms  p95 {np.percentile(ms, 95):.2f} ms")
+    print(f"known cells: {int(np.count_nonzero(og.grid != -1))}")
+
+
+if __name__ == "__main__":
+    main()
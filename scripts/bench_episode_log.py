@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from vlfm_repro.mapping.episode_log import KIND_KEYFRAME, EpisodeRecorder, EpisodeReplay
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.sim.floorplan import make_floor_plan
+from vlfm_repro.vlm.observation_updater import FovObservation, apply_fov_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def record_walk(path: Path, n: int, steps: int, keyframe_every: int, view: int) -> tuple[list[float], list[float]]:
+    """Random walk that reveals a `view`-sized window of the plan and applies one FOV observation per step."""
+    plan = make_floor_plan(n, n, seed=0)
+    truth = plan.occupancy().grid
+    og = OccupancyGrid(grid=np.full((n, n), -1, dtype=np.int8))
+    vm = ValueMap.zeros(n, n)
+    rng = np.random.default_rng(0)
+    pos = np.array([n // 2, n // 2])
+    step_times, record_times = [], []
+    with EpisodeRecorder(path, og, vm, keyframe_every=keyframe_every) as rec:
+        for _ in range(steps):
+            pos = np.clip(pos + rng.integers(-3, 4, 2), view // 2, n - view // 2 - 1)
+            t0 = time.perf_counter()
+            r0, c0 = (int(v) - view // 2 for v in pos)
+            og.update_region(r0, c0, truth[r0:r0 + view, c0:c0 + view])
+            obs = FovObservation((int(pos[0]), int(pos[1])), float(rng.uniform(-np.pi, np.pi)),
+                                 score=float(rng.random()), confidence=0.8, range_cells=view // 2)
+            apply_fov_observation(vm, og, obs)
+            t1 = time.perf_counter()
+            rec.record(extra={"pos": [int(pos[0]), int(pos[1])]})
+            t2 = time.perf_counter()
+            step_times.append(t1 - t0)
+            record_times.append(t2 - t1)
+    return step_times, record_times
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Recording overhead, size and seek latency of the episode log.")
+    ap.add_argument("--size", type=int, default=400)
+    ap.add_argument("--steps", type=int, default=10_001)
+    ap.add_argument("--keyframe-every", type=int, default=100)
+    ap.add_argument("--view", type=int, default=60)
+    ap.add_argument("--seeks", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.vlog"
+        step_times, record_times = record_walk(path, args.size, args.steps, args.keyframe_every, args.view)
+        size = path.stat().st_size
+        print(f"{args.size}x{args.size}, {args.steps} steps: map update {1e6 * np.median(step_times):7.1f} us/step, "
+              f"record {1e6 * np.median(record_times):7.1f} us/step median, {1e6 * np.mean(record_times):7.1f} mean")
+        raw = args.steps * args.size ** 2 * 9
+        print(f"  log {size / 2**20:.2f} MiB ({size / args.steps / 1024:.1f} KiB/step, raw snapshots {raw / size:.0f}x larger)")
+
+        t0 = time.perf_counter()
+        rp = EpisodeReplay(path)
+        t_open = time.perf_counter() - t0
+        print(f"  open + index: {1e3 * t_open:.2f} ms, {int((rp.index['kind'] == KIND_KEYFRAME).sum())} keyframes")
+        rng = np.random.default_rng(1)
+        targets = [args.steps - 1] + [int(s) for s in rng.integers(0, len(rp), args.seeks)]
+        times = []
+        for step in targets:
+            t0 = time.perf_counter()
+            rp.state_at(step, copy=False)
+            times.append(time.perf_counter() - t0)
+        print(f"  seek to step {targets[0]}: {1e3 * times[0]:.2f} ms; random seeks p50 {1e3 * np.median(times[1:]):.2f} ms, "
+              f"p99 {1e3 * np.percentile(times[1:], 99):.2f} ms")
+        t0 = time.perf_counter()
+        for step in range(len(rp) - 500, len(rp)):
+            rp.state_at(step, copy=False)
+        print(f"  sequential playback: {1e6 * (time.perf_counter() - t0) / 500:.1f} us/step")
+        rp.close()
+
+
+if __name__ == "__main__":
+    main()
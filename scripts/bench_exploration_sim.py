@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from vlfm_repro.sim.explorer import STAGES, ExplorationConfig, ExplorationSim, summarize
+from vlfm_repro.sim.floorplan import make_floor_plan
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="End-to-end steps/sec of the closed-loop 2D exploration simulator")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[200, 400])
+    ap.add_argument("--episodes", type=int, default=3)
+    ap.add_argument("--max-steps", type=int, default=300)
+    ap.add_argument("--prompt", default="chair")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    cfg = ExplorationConfig(max_steps=args.max_steps)
+    for n in args.sizes:
+        results = []
+        for ep in range(args.episodes):
+            plan = make_floor_plan(n, n, seed=args.seed + ep)
+            results.append(ExplorationSim(plan, args.prompt, cfg).run())
+        m = summarize(results)
+        print(
+            f"map {n}x{n}, {args.episodes} episodes: {m['steps_per_sec']:6.1f} steps/s  "
+            f"success {m['success_rate']:.2f}  SPL {m['spl']:.3f}  steps {m['num_steps']:.0f}"
+        )
+        total = sum(m["latency_ms"][s]["mean"] for s in STAGES)
+        for s in STAGES:
+            lat = m["latency_ms"][s]
+            print(
+                f"  {s:<9} mean {lat['mean']:7.2f} ms  p50 {lat['p50']:7.2f}  p95 {lat['p95']:7.2f}"
+                f"  ({100.0 * lat['mean'] / total:4.1f}%)"
+            )
+        print(f"  steps/s spread over episodes: {np.round([r.steps_per_sec for r in results], 1).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from vlfm_repro.mapping.synthetic import make_office_grid
+from vlfm_repro.vlm.observation_updater import FovObservation, apply_fov_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=1000)
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--range", type=int, default=100, help="Max sensing range (cells)")
+    ap.add_argument("--fov-deg", type=float, default=79.0)
+    args = ap.parse_args()
+
+    og = make_office_grid(args.size)
+    vm = ValueMap.zeros(*og.shape)
+    rng = np.random.default_rng(0)
+    free = np.argwhere(og.grid == 0)
+    poses = free[rng.integers(0, len(free), size=args.frames)]
+    headings = rng.uniform(-np.pi, np.pi, size=args.frames)
+
+    times, cells = [], []
+    for (r, c), heading in zip(poses, headings):
+        obs = FovObservation(
+            center_rc=(int(r), int(c)), heading_rad=float(heading), score=float(rng.random()),
+            confidence=1.0, fov_rad=float(np.deg2rad(args.fov_deg)), range_cells=args.range,
+        )
+        t0 = time.perf_counter()
+        rows, _ = apply_fov_observation(vm, og, obs)
+        times.append(time.perf_counter() - t0)
+        cells.append(rows.size)
+
+    ms = 1e3 * np.array(times[1:])  # the first frame builds the ray fan
+    print(f"map {args.size}x{args.size}, range {args.range} cells, fov {args.fov_deg:.0f} deg")
+    print(f"visible cells/frame: mean {np.mean(cells):.0f}")
+    print(f"per frame: p50 {np.percentile(ms, 50):.2f} ms  p95 {np.percentile(ms, 95):.2f} ms  ({1e3 / np.median(ms):.0f} fps)")
+
+
+if __name__ == "__main__":
+    main()
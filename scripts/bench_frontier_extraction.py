@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.synthetic import make_explored_grid
+from vlfm_repro.frontier.frontier_extractor import frontier_mask
+
+
+def legacy_find_frontier_cells(og: OccupancyGrid, connectivity: int, require_free: bool) -> list[tuple[int, int]]:
+    """The original per-cell Python loop, kept here as the speedup reference."""
+    g = og.grid
+    h, w = g.shape
+    frontier = []
+    for r in range(h):
+        for c in range(w):
+            v = int(g[r, c])
+            if require_free and v != 0:
+                continue
+            if not require_free and v == 1:
+                continue
+            for rr, cc in og.neighbors(r, c, connectivity=connectivity):
+                if int(g[rr, cc]) == -1:
+                    frontier.append((r, c))
+                    break
+    return frontier
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[120, 250, 500, 1000, 2000])
+    ap.add_argument("--connectivity", type=int, default=4, choices=[4, 8])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--max-legacy-cells", type=int, default=1_000_000,
+                    help="Skip the Python loop above this many cells (it takes minutes)")
+    ap.add_argument("--out", type=str, default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+
+    rows = []
+    print(f"{'size':>10} {'frontier':>9} {'vectorized_ms':>14} {'legacy_ms':>11} {'speedup':>8}")
+    for n in args.sizes:
+        og = make_explored_grid(n, n)
+        mask = frontier_mask(og, connectivity=args.connectivity)
+        t_vec = best_of(lambda: frontier_mask(og, connectivity=args.connectivity), args.repeat)
+
+        t_legacy = None
+        if n * n <= args.max_legacy_cells:
+            legacy = legacy_find_frontier_cells(og, args.connectivity, True)
+            assert set(legacy) == set(zip(*np.nonzero(mask))), "vectorized frontier differs from legacy loop"
+            t_legacy = best_of(lambda: legacy_find_frontier_cells(og, args.connectivity, True), 1)
+
+        row = {
+            "size": [n, n],
+            "num_frontier_cells": int(mask.sum()),
+            "vectorized_ms": 1e3 * t_vec,
+            "legacy_ms": None if t_legacy is None else 1e3 * t_legacy,
+            "speedup": None if t_legacy is None else t_legacy / t_vec,
+        }
+        rows.append(row)
+        legacy_s = "-" if t_legacy is None else f"{row['legacy_ms']:.1f}"
+        speed_s = "-" if t_legacy is None else f"{row['speedup']:.0f}x"
+        print(f"{n:>5}x{n:<4} {row['num_frontier_cells']:>9} {row['vectorized_ms']:>14.2f} {legacy_s:>11} {speed_s:>8}")
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps({"connectivity": args.connectivity, "rows": rows}, indent=2), encoding="utf-8")
+        print(f"[OK] Wrote: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import math
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from vlfm_repro.service.client import PlanningClient
+from vlfm_repro.service.server import PlanningServer
+from vlfm_repro.sim.floorplan import make_floor_plan
+from vlfm_repro.mapping.visibility import visible_cells
+from vlfm_repro.vlm.observation_updater import FovObservation
+
+
+def _serve(path: str) -> None:
+    import asyncio
+    asyncio.run(PlanningServer().serve_forever(path))
+
+
+def run(client: PlanningClient, gt, route, ack: bool, range_cells: int) -> np.ndarray:
+    """Replay `route` as (sensed cells, observation, rank) steps; returns per-step latency in ms."""
+    h, w = gt.shape
+    client.init((h, w), resolution=gt.resolution)
+    known = np.full((h, w), -1, dtype=np.int8)
+    out = []
+    for k, (pos, heading) in enumerate(route):
+        rows, cols = visible_cells(gt, pos, heading, math.radians(79), range_cells)
+        new = known[rows, cols] != gt.grid[rows, cols]
+        known[rows[new], cols[new]] = gt.grid[rows[new], cols[new]]
+        t0 = time.perf_counter()
+        # A depth frame arrives as a few deltas, then the scored frame, then the query.
+        for part in np.array_split(np.flatnonzero(new), 4):
+            client.set_cells(rows[part], cols[part], gt.grid[rows[part], cols[part]], ack=ack)
+        client.observe(FovObservation(pos, heading, 0.5 + 0.4 * math.sin(k), 0.8, range_cells=range_cells), ack=ack)
+        client.rank(robot_rc=pos, top_k=5)
+        out.append(1e3 * (time.perf_counter() - t0))
+    return np.array(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=400)
+    ap.add_argument("--steps", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    plan = make_floor_plan(args.size, args.size, seed=args.seed)
+    gt = plan.occupancy()
+    free = np.argwhere(gt.grid == 0)
+    rng = np.random.default_rng(args.seed)
+    # Random walk over free cells so that each step reveals a little more map.
+    pos = plan.start_rc
+    route = []
+    for k in range(args.steps):
+        route.append((pos, 0.5 * math.pi * (k % 4)))
+        near = free[np.abs(free - pos).max(axis=1) <= 10]
+        pos = tuple(int(v) for v in near[rng.integers(len(near))])
+
+    path = os.path.join(tempfile.mkdtemp(), "plan.sock")
+    proc = mp.Process(target=_serve, args=(path,), daemon=True)
+    proc.start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    try:
+        with PlanningClient(path) as client:
+            for label, ack in (("acked, one round trip per message", True), ("pipelined", False)):
+                ms = run(client, gt, route, ack, range_cells=100)
+                p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+                print(f"{label:36s} step p50 {p50:6.2f} ms  p90 {p90:6.2f} ms  p99 {p99:6.2f} ms  max {ms.max():6.2f} ms")
+            st = client.stats()
+        print(f"server: {st['refreshes']} refreshes for {st['updates_coalesced']} map updates, "
+              f"{st['batches']} batches (max {st['max_batch']} messages)")
+        for name, lat in st["latency"].items():
+            print(f"  {name:8s} n={lat['count']:5d}  p50 {lat['p50_ms']:6.3f} ms  p99 {lat['p99_ms']:6.3f} ms")
+    finally:
+        proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
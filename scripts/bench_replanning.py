@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from vlfm_repro.mapping.synthetic import make_office_grid
+from vlfm_repro.nav.geodesic import chamfer_distance
+from vlfm_repro.nav.planner import IncrementalPlanner
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=1000)
+    ap.add_argument("--steps", type=int, default=50)
+    ap.add_argument("--window", type=int, default=20, help="Side of the map window updated per step (cells)")
+    ap.add_argument("--robot-radius", type=float, default=0.15)
+    args = ap.parse_args()
+
+    n = args.size
+    og = make_office_grid(n)
+    rng = np.random.default_rng(1)
+    start, goal = (3, 3), (n - 4, n - 4)
+
+    planner = IncrementalPlanner(og, robot_radius_m=args.robot_radius)
+    t0 = time.perf_counter()
+    planner.set_goal(goal)
+    planner.path(start)
+    t_initial = time.perf_counter() - t0
+
+    incremental, scratch = [], []
+    for _ in range(args.steps):
+        r0, c0 = (int(v) for v in rng.integers(0, n - args.window, size=2))
+        patch = (rng.random((args.window, args.window)) < 0.02).astype(np.int8)
+        og.update_region(r0, c0, patch)
+
+        t0 = time.perf_counter()
+        planner.update()
+        planner.path(start)
+        incremental.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        chamfer_distance(planner.inflation.traversable, np.array([goal]))
+        scratch.append(time.perf_counter() - t0)
+
+    inc = 1e3 * np.array(incremental)
+    full = 1e3 * np.array(scratch)
+    print(f"map {n}x{n}, {args.steps} updates of {args.window}x{args.window} cells")
+    print(f"initial plan + path:     {1e3 * t_initial:8.1f} ms")
+    print(f"incremental update+path: p50 {np.percentile(inc, 50):7.2f} ms  p95 {np.percentile(inc, 95):7.2f} ms")
+    print(f"from-scratch field:      p50 {np.percentile(full, 50):7.2f} ms  p95 {np.percentile(full, 95):7.2f} ms")
+    print(f"10 Hz budget met:        {100.0 * np.mean(inc < 100.0):.0f}% of steps")
+
+
+if __name__ == "__main__":
+    main()
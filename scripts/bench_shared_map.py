@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import pickle
+import time
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.shared_map import MapPublisher, MapSubscriber
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def _reader(name: str, mode: str, seconds: float, out) -> None:
+    sub = MapSubscriber(name)
+    n = retries = 0
+    t_end = time.perf_counter() + seconds
+    while time.perf_counter() < t_end:
+        if mode == "view":
+            frame = sub.latest()
+            # A visualizer-sized touch: one 64x64 window of every array.
+            float(frame.value[:64, :64].sum()) + int(frame.grid[:64, :64].sum())
+            retries += not frame.valid()
+            del frame
+        else:
+            sub.read()
+        n += 1
+    sub.close()
+    out.put((n, retries))
+
+
+def bench_size(n: int, readers: int, seconds: float, publish_hz: float) -> None:
+    og = OccupancyGrid(grid=np.full((n, n), -1, dtype=np.int8))
+    vm = ValueMap.zeros(n, n)
+    rng = np.random.default_rng(0)
+    ctx = mp.get_context("spawn")
+    with MapPublisher((n, n)) as pub:
+        t0 = time.perf_counter()
+        pub.publish(og, vm)
+        t_full = time.perf_counter() - t0
+
+        def small_update() -> None:
+            r, c = (int(v) for v in rng.integers(0, n - 100, 2))
+            og.update_region(r, c, np.zeros((100, 100), dtype=np.int8))
+            vm.update_patch(r, c, np.full((100, 100), 0.5, dtype=np.float32), np.full((100, 100), 0.5, dtype=np.float32))
+
+        times = []
+        for _ in range(20):
+            small_update()
+            t0 = time.perf_counter()
+            pub.publish(og, vm)
+            times.append(time.perf_counter() - t0)
+        print(f"{n}x{n}: publish full {1e3 * t_full:7.2f} ms, 100x100 change {1e3 * np.median(times):6.3f} ms")
+
+        for mode in ("view", "copy"):
+            out = ctx.Queue()
+            procs = [ctx.Process(target=_reader, args=(pub.name, mode, seconds, out)) for _ in range(readers)]
+            for p in procs:
+                p.start()
+            published = 0
+            results = []
+            while len(results) < readers:
+                small_update()
+                pub.publish(og, vm)
+                published += 1
+                time.sleep(1.0 / publish_hz)
+                while not out.empty():
+                    results.append(out.get())
+            for p in procs:
+                p.join()
+            reads = sum(r for r, _ in results)
+            retries = sum(t for _, t in results)
+            print(f"  {mode:4s} readers: {reads / seconds:10.0f} reads/s total over {readers} reader(s) "
+                  f"({retries} overtaken, {published} publishes)")
+
+    blob = (og.grid, vm.value, vm.conf)
+    k = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < min(seconds, 1.0):
+        pickle.loads(pickle.dumps(blob, protocol=pickle.HIGHEST_PROTOCOL))
+        k += 1
+    print(f"  pickle round trip (no transport): {k / (time.perf_counter() - t0):10.0f} /s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Readers per second of shared-memory map frames vs. pickling.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[400, 1000, 2000, 4000])
+    ap.add_argument("--readers", type=int, default=2)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    ap.add_argument("--publish-hz", type=float, default=10.0)
+    args = ap.parse_args()
+    for n in args.sizes:
+        bench_size(n, args.readers, args.seconds, args.publish_hz)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,23 @@ import os
 from pathlib import Path
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
 from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
 from vlfm_repro.vlm.value_map import ValueMap
 from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.viz.image_io import write_png
+from vlfm_repro.viz.raster import add_caption, cell_to_px, draw_markers, draw_text, render_map
 
 
 OUT_DIR = "results/ablation"
+SCALE = 4
+# Marker shape and color of each mode's top-3 frontiers.
+MODE_MARKERS = {
+    "low_conf_patch": ("x", (214, 39, 40)),
+    "high_conf_patch": ("^", (44, 160, 44)),
+    "fused": ("o", (148, 103, 189)),
+}
 
 
 def make_synthetic_grid(h: int = 120, w: int = 160) -> OccupancyGrid:
@@ -57,34 +65,24 @@ def summarize_ranked(ranked, top_k: int = 10):
 
 
 def plot_ablation(og: OccupancyGrid, frontier_cells, modes_ranked, out_png: str) -> None:
-    g = og.grid.astype(np.int16)
-    disp = np.zeros_like(g, dtype=np.float32)
-    disp[g == -1] = 0.2  # unknown
-    disp[g == 0] = 0.8   # free
-    disp[g == 1] = 0.0   # occupied
-
-    fig = plt.figure(figsize=(10, 6))
-    plt.imshow(disp, origin="lower")
-
-    if frontier_cells:
-        fr = np.array([p[0] for p in frontier_cells])
-        fc = np.array([p[1] for p in frontier_cells])
-        plt.scatter(fc, fr, s=2)
-
-    # Mark top-3 for each mode with different markers
-    markers = {"low_conf_patch": "x", "high_conf_patch": "^", "fused": "o"}
-    for mode_name, ranked in modes_ranked.items():
+    img = render_map(og.grid, frontiers=frontier_cells, scale=SCALE)
+
+    # Mark top-3 for each mode with its own marker; labels are "<rank>:<score>",
+    # one line per mode so that modes agreeing on a frontier stay readable.
+    # The legend strip on top names the mode of each marker.
+    radius = 2 * SCALE
+    for k, (mode_name, ranked) in enumerate(modes_ranked.items()):
+        shape, color = MODE_MARKERS.get(mode_name, ("s", (0, 0, 0)))
         for i, rf in enumerate(ranked[:3]):
-            cr, cc = rf.cluster.centroid_rc
-            plt.scatter([cc], [cr], s=90, marker=markers.get(mode_name, "o"))
-            plt.text(cc + 2, cr + 2, f"{mode_name}#{i+1}:{rf.score:.2f}", fontsize=8)
-
-    plt.title("Stage C ablation: confidence fusion affects frontier ranking")
-    plt.axis("off")
-    os.makedirs(os.path.dirname(out_png), exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=220)
-    plt.close(fig)
+            (r, c), = cell_to_px(rf.cluster.centroid_rc, og.shape, SCALE, origin_lower=True)
+            draw_markers(img, (r, c), color, shape, radius, width=2)
+            draw_text(img, (r + radius + 2 + 12 * k, c - radius), f"{i + 1}:{rf.score:.2f}", color, scale=2)
+
+    legend = []
+    for name in modes_ranked:
+        shape, color = MODE_MARKERS.get(name, ("s", (0, 0, 0)))
+        legend.append((f"{name} top-3 (rank:score)", color, shape))
+    write_png(out_png, add_caption(img, "Stage C ablation: confidence fusion affects frontier ranking", legend))
 
 
 def main() -> None:
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import argparse
 from datetime import datetime
 from pathlib import Path
 import json
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
 from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
 from vlfm_repro.vlm.value_map import ValueMap
 from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.viz.image_io import write_png
+from vlfm_repro.viz.raster import add_caption, render_map
+from vlfm_repro import profiling
+
+FRAME_SCALE = 4
 
 
 def make_synthetic_grid(h: int = 120, w: int = 160) -> OccupancyGrid:
@@ -23,34 +28,36 @@ def make_synthetic_grid(h: int = 120, w: int = 160) -> OccupancyGrid:
     return OccupancyGrid(grid=grid, resolution=0.05, origin_xy=(0.0, 0.0))
 
 
-def save_png(path: Path, title: str, base: np.ndarray, overlays: list[tuple[np.ndarray, dict]] | None = None):
-    plt.figure(figsize=(10, 6))
-    plt.imshow(base, origin="lower")
-    if overlays:
-        for pts, kw in overlays:
-            plt.scatter(pts[:, 1], pts[:, 0], **kw)
-    plt.title(title)
-    plt.axis("off")
-    path.parent.mkdir(parents=True, exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(path, dpi=220, bbox_inches="tight")
-    plt.close()
+def save_frame(path: Path, title: str, og: OccupancyGrid, vm: ValueMap | None = None, frontiers=None, ranked=None,
+               top_k: int = 0) -> None:
+    img = render_map(
+        og.grid,
+        vm.value if vm is not None else None,
+        vm.conf if vm is not None else None,
+        frontiers=frontiers,
+        ranked=ranked,
+        scale=FRAME_SCALE,
+        top_k=top_k,
+        markers="o",
+    )
+    write_png(path, add_caption(img, title))
 
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cprofile", action="store_true", help="Also write a cProfile of the mapping + ranking pass")
+    args = ap.parse_args()
+
     run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     out_dir = Path("results/habitat_runs") / run_id
     frames = out_dir / "frames"
     frames.mkdir(parents=True, exist_ok=True)
 
-    og = make_synthetic_grid()
+    profiling.reset()
+    profiling.enable()
+    capture = profiling.Capture().start() if args.cprofile else None
 
-    # Visualization base map: unknown=0.2, free=0.8, occupied=0.0
-    g = og.grid.astype(np.int16)
-    base = np.zeros_like(g, dtype=np.float32)
-    base[g == -1] = 0.2
-    base[g == 0] = 0.8
-    base[g == 1] = 0.0
+    og = make_synthetic_grid()
 
     frontier_cells = find_frontier_cells(og, connectivity=4, require_free=True)
     clusters = cluster_frontiers(og, frontier_cells, connectivity=8, min_cluster_size=20)
@@ -64,34 +71,20 @@ def main():
     vm.update_patch(0, 0, hotspot, conf)
 
     ranked = rank_frontiers(vm, clusters, radius_cells=6, mode="mean")
-    best = ranked[0] if ranked else None
-
-    # Save 3 frames
-    if len(frontier_cells) > 0:
-        fpts = np.array(frontier_cells, dtype=int)
-    else:
-        fpts = np.zeros((0, 2), dtype=int)
 
-    save_png(frames / "01_occupancy.png", "Occupancy map (synthetic)", base)
+    if capture is not None:
+        (out_dir / "profile.txt").write_text(capture.stop(), encoding="utf-8")
+    profile = profiling.report()
+    profiling.disable()
 
-    save_png(
-        frames / "02_frontiers.png",
-        f"Frontiers (cells={len(frontier_cells)}, clusters={len(clusters)})",
-        base,
-        overlays=[(fpts, {"s": 2})],
-    )
-
-    overlays = [(fpts, {"s": 2})]
-    if best is not None:
-        cr, cc_ = best.cluster.centroid_rc
-        overlays.append((np.array([[cr, cc_]]), {"s": 110, "marker": "o"}))
-
-    save_png(
-        frames / "03_chosen_frontier.png",
-        "Chosen frontier (rank-1) + frontiers",
-        base,
-        overlays=overlays,
-    )
+    # Save 4 frames (row 0 at the bottom)
+    save_frame(frames / "01_occupancy.png", "Occupancy map (synthetic)", og)
+    save_frame(frames / "02_frontiers.png", f"Frontiers (cells={len(frontier_cells)}, clusters={len(clusters)})",
+               og, frontiers=frontier_cells)
+    save_frame(frames / "03_chosen_frontier.png", "Chosen frontier (rank-1) + frontiers",
+               og, frontiers=frontier_cells, ranked=ranked, top_k=1)
+    save_frame(frames / "04_value_map.png", "Value map + top-3 frontiers",
+               og, vm=vm, frontiers=frontier_cells, ranked=ranked, top_k=3)
 
     # Write evidence + metadata
     meta = {
@@ -106,6 +99,7 @@ def main():
             }
             for r in ranked[:5]
         ],
+        "profile": profile,
     }
     (out_dir / "metrics.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
 
@@ -125,9 +119,16 @@ def main():
                 "",
                 "## Outputs",
                 "- `frames/01_occupancy.png` — occupancy grid",
-                "- `frames/02_frontiers.png` — extracted frontiers",
-                "- `frames/03_chosen_frontier.png` — chosen frontier highlighted",
+                f"- `frames/02_frontiers.png` — extracted frontiers ({len(frontier_cells)} cells, {len(clusters)} clusters)",
+                "- `frames/03_chosen_frontier.png` — chosen frontier highlighted (`#1:<score>`)",
+                "- `frames/04_value_map.png` — value map blended by confidence, top-3 frontiers",
                 "- `metrics.json` — summary metadata",
+                *(["- `profile.txt` — cProfile of the mapping + ranking pass"] if args.cprofile else []),
+                "",
+                "## Timing",
+                "Per-stage wall time of the mapping + ranking pass (`vlfm_repro.profiling`; p50/p95 are log2-bin upper edges).",
+                "",
+                *profiling.markdown_table(profile),
                 "",
                 "Next step: swap synthetic grid for Habitat observations (Issue #4).",
                 "",
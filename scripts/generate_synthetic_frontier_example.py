@@ -3,12 +3,13 @@ from __future__ import annotations
 import json
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
 from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
 from vlfm_repro.vlm.value_map import ValueMap
 from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.viz.image_io import write_png
+from vlfm_repro.viz.raster import add_caption, render_map
 
 OUT_DIR = "results"
 
@@ -37,31 +38,9 @@ def make_synthetic_value_map(h: int, w: int) -> ValueMap:
     return vm
 
 def plot_maps(og: OccupancyGrid, frontier_cells, ranked, out_png: str) -> None:
-    g = og.grid.astype(np.int16)
-    disp = np.zeros_like(g, dtype=np.float32)
-    disp[g == -1] = 0.2  # unknown
-    disp[g == 0] = 0.8   # free
-    disp[g == 1] = 0.0   # occupied
-
-    fig = plt.figure(figsize=(10, 6))
-    plt.imshow(disp, origin="lower")
-
-    if frontier_cells:
-        fr = np.array([p[0] for p in frontier_cells])
-        fc = np.array([p[1] for p in frontier_cells])
-        plt.scatter(fc, fr, s=2)
-
-    for i, rf in enumerate(ranked[:3]):
-        cr, cc = rf.cluster.centroid_rc
-        plt.scatter([cc], [cr], s=80, marker="x")
-        plt.text(cc + 2, cr + 2, f"#{i+1}:{rf.score:.2f}", fontsize=9)
-
-    plt.title("Synthetic Occupancy + Frontiers + Ranked Waypoints")
-    plt.axis("off")
-    os.makedirs(os.path.dirname(out_png), exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=220)
-    plt.close(fig)
+    # Top-3 waypoints as "x" markers labelled "#<rank>:<score>", row 0 at the bottom
+    img = render_map(og.grid, frontiers=frontier_cells, ranked=ranked, scale=4, top_k=3, markers="x")
+    write_png(out_png, add_caption(img, "Synthetic occupancy + frontiers + ranked waypoints"))
 
 def main() -> None:
     os.makedirs(OUT_DIR, exist_ok=True)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from vlfm_repro.frontier.frontier_extractor import frontier_mask
+from vlfm_repro.mapping.episode_log import EpisodeReplay
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.viz.image_io import open_frame_writer
+from vlfm_repro.viz.raster import DEFAULT_PALETTE, render_map
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Render every step of an episode log to a GIF, a video or PNG frames.")
+    ap.add_argument("log", help="Episode log written by EpisodeRecorder (e.g. ExplorationConfig.episode_log)")
+    ap.add_argument("out", help="*.gif, *.mp4 / *.mkv / *.webm (needs ffmpeg), or a directory for PNG frames")
+    ap.add_argument("--start", type=int, default=0)
+    ap.add_argument("--stop", type=int, default=None)
+    ap.add_argument("--every", type=int, default=1, help="Render every N-th step")
+    ap.add_argument("--scale", type=int, default=1)
+    ap.add_argument("--fps", type=float, default=10.0)
+    ap.add_argument("--top-k", type=int, default=3)
+    ap.add_argument("--no-value", action="store_true", help="Occupancy only, no value-map heatmap")
+    ap.add_argument("--no-frontiers", action="store_true", help="Skip recomputing frontier cells per frame")
+    args = ap.parse_args()
+
+    t_render = t_write = 0.0
+    with EpisodeReplay(args.log) as rp, open_frame_writer(args.out, args.fps, DEFAULT_PALETTE.gif_colors) as writer:
+        steps = range(args.start, len(rp) if args.stop is None else min(args.stop, len(rp)), args.every)
+        t0 = time.perf_counter()
+        for step in steps:
+            st = rp.state_at(step, copy=False)
+            t1 = time.perf_counter()
+            show_value = rp.header["has_value"] and not args.no_value
+            img = render_map(
+                st.grid,
+                st.value if show_value else None,
+                st.conf if show_value else None,
+                frontiers=None if args.no_frontiers else frontier_mask(OccupancyGrid(grid=st.grid)),
+                ranked=st.frontiers,
+                scale=args.scale,
+                top_k=args.top_k,
+            )
+            t2 = time.perf_counter()
+            writer.append(img)
+            t_render += t2 - t1
+            t_write += time.perf_counter() - t2
+        total = time.perf_counter() - t0
+    n = max(1, len(steps))
+    print(f"{len(steps)} frames -> {args.out} in {total:.2f} s ({len(steps) / max(total, 1e-9):.1f} frames/s): "
+          f"render {1e3 * t_render / n:.2f} ms, encode {1e3 * t_write / n:.2f} ms per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from vlfm_repro.service.server import PlanningServer, PlanningState
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Planning service: keeps map, value and frontier state warm behind a Unix socket.")
+    ap.add_argument("--socket", default="/tmp/vlfm_planner.sock")
+    ap.add_argument("--min-cluster-size", type=int, default=5)
+    args = ap.parse_args()
+
+    server = PlanningServer(PlanningState(min_cluster_size=args.min_cluster_size))
+    print(f"[OK] Listening on {args.socket}")
+    try:
+        asyncio.run(server.serve_forever(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from vlfm_repro import profiling
+from vlfm_repro.sim.explorer import ExplorationConfig, ExplorationSim, summarize
+from vlfm_repro.sim.floorplan import make_floor_plan
+
 
 @dataclass
 class SmokeConfig:
@@ -15,6 +19,9 @@ class SmokeConfig:
     max_steps: int = 50
     prompt: str = "chair"
     out_root: str = "results/habitat_runs"
+    sim_size: int = 400
+    seed: int = 0
+    cprofile_step: Optional[int] = None
 
 
 def utc_run_id() -> str:
@@ -39,6 +46,23 @@ def try_import_habitat() -> Optional[str]:
         return None
 
 
+def run_sim2d(cfg: SmokeConfig, out_dir: Path) -> Dict[str, Any]:
+    """Closed-loop episodes in procedural 2D floor plans (one plan per episode).
+
+    With `cprofile_step` set, that step of the first episode is cProfiled
+    into profile_step.txt.
+    """
+    results = []
+    for ep in range(cfg.episodes):
+        plan = make_floor_plan(cfg.sim_size, cfg.sim_size, seed=cfg.seed + ep)
+        step = cfg.cprofile_step if ep == 0 else None
+        sim = ExplorationSim(plan, cfg.prompt, ExplorationConfig(max_steps=cfg.max_steps, cprofile_step=step))
+        results.append(sim.run())
+        if sim.cprofile_text is not None:
+            write_text(out_dir / "profile_step.txt", sim.cprofile_text)
+    return summarize(results)
+
+
 def main() -> None:
     cfg = SmokeConfig(
         scene=os.environ.get("SCENE", "example_scene"),
@@ -46,6 +70,9 @@ def main() -> None:
         max_steps=int(os.environ.get("MAX_STEPS", "50")),
         prompt=os.environ.get("PROMPT", "chair"),
         out_root=os.environ.get("OUT_ROOT", "results/habitat_runs"),
+        sim_size=int(os.environ.get("SIM_SIZE", "400")),
+        seed=int(os.environ.get("SEED", "0")),
+        cprofile_step=int(os.environ["CPROFILE_STEP"]) if os.environ.get("CPROFILE_STEP") else None,
     )
 
     run_id = utc_run_id()
@@ -67,32 +94,57 @@ def main() -> None:
     }
 
     if not habitat_marker:
+        metrics["mode"] = "sim2d"
+        metrics["scene"] = f"procedural_{cfg.sim_size}x{cfg.sim_size}"
+        profiling.reset()
+        profiling.enable()
+        metrics["results"] = run_sim2d(cfg, out_dir)
+        metrics["profile"] = profiling.report()
+        profiling.disable()
         metrics["notes"].append(
-            "Habitat not available on this machine. This is a stub run to prove pipeline + schema."
+            "Habitat not available on this machine. Episodes ran in the built-in 2D simulator "
+            "(vlfm_repro.sim) with DummyScorer values."
         )
         write_json(out_dir / "metrics.json", metrics)
+        res = metrics["results"]
+        latency = [
+            f"- {stage}: p50 {v['p50']:.2f} ms, p95 {v['p95']:.2f} ms"
+            for stage, v in res["latency_ms"].items()
+        ]
         write_text(
             out_dir / "EVIDENCE.md",
             "\n".join(
                 [
-                    "# Stage D — Habitat smoke run (stub)",
+                    "# Stage D — 2D simulator smoke run",
                     "",
                     f"Run ID: {run_id}",
                     "",
-                    "Habitat is not installed/available on this machine.",
-                    "This run proves the Stage D output pipeline and schema.",
+                    "Habitat is not installed/available on this machine, so the episodes ran in",
+                    f"procedural {cfg.sim_size}x{cfg.sim_size} floor plans (seeds {cfg.seed}..{cfg.seed + cfg.episodes - 1}).",
+                    "",
+                    f"- success rate: {res['success_rate']:.3f}",
+                    f"- SPL: {res['spl']:.3f}",
+                    f"- path length: {res['path_length']:.2f} m",
+                    f"- steps: {res['num_steps']:.1f}",
+                    f"- steps/sec: {res['steps_per_sec']:.1f}",
+                    "",
+                    "Per-stage latency:",
+                    *latency,
+                    "",
+                    "## Timing",
+                    "",
+                    *profiling.markdown_table(metrics["profile"]),
                     "",
                     "Outputs:",
                     "- metrics.json",
                     "- EVIDENCE.md",
+                    *(["- profile_step.txt"] if cfg.cprofile_step is not None else []),
                     "- frames/ (reserved)",
                     "",
-                    "Next step: run on Linux with Habitat-Sim/Habitat-Lab installed, then wire env + metrics.",
-                    "",
                 ]
             ),
         )
-        print(f"[OK] Stub run written to: {out_dir}")
+        print(f"[OK] 2D simulator run written to: {out_dir}")
         return
 
     metrics["notes"].append(
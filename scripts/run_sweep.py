@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+
+from vlfm_repro.sim.sweep import run_sweep, sweep_grid
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Parameter sweep over 2D simulator episodes on a process pool. "
+        "Rerun with the same --out to resume an interrupted sweep."
+    )
+    ap.add_argument("--out", default="results/sweeps/default")
+    ap.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2, 3])
+    ap.add_argument("--radius-cells", type=int, nargs="+", default=[3, 6])
+    ap.add_argument("--min-cluster-size", type=int, nargs="+", default=[5, 20])
+    ap.add_argument("--score-mode", nargs="+", default=["mean", "max"], choices=["mean", "max"])
+    ap.add_argument("--size", type=int, default=400, help="Floor plan side (cells)")
+    ap.add_argument("--max-steps", type=int, default=500)
+    ap.add_argument("--prompt", default="chair")
+    ap.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count; 0 = in-process)")
+    args = ap.parse_args()
+
+    cells = sweep_grid(
+        seed=args.seeds,
+        radius_cells=args.radius_cells,
+        min_cluster_size=args.min_cluster_size,
+        score_mode=args.score_mode,
+    )
+    rows = run_sweep(
+        cells,
+        args.out,
+        map_size=(args.size, args.size),
+        prompt=args.prompt,
+        config={"max_steps": args.max_steps},
+        workers=args.workers,
+        progress=True,
+    )
+    print(f"[OK] {len(rows)} episodes in {args.out}/results.csv, summary in {args.out}/summary.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import matplotlib.image as mpimg
 
 from vlfm_repro.vlm.value_map import ValueMap
 from vlfm_repro.vlm.scorers import DummyScorer
+from vlfm_repro.vlm.score_cache import CachedScorer
 from vlfm_repro.vlm.observation_updater import Observation, apply_observation
 
 
@@ -29,6 +30,7 @@ def main():
     ap.add_argument("--prompt", type=str, default="chair", help="Text prompt")
     ap.add_argument("--seed", type=int, default=0, help="Dummy scorer seed")
     ap.add_argument("--out", type=str, default="results/vlm_smoke", help="Output folder")
+    ap.add_argument("--cache", type=str, default=None, help="Optional sqlite score cache shared across runs")
     args = ap.parse_args()
 
     out_dir = Path(args.out)
@@ -36,15 +38,21 @@ def main():
 
     img = load_image(args.image)
     scorer = DummyScorer(seed=args.seed)
-    score, conf = scorer.score(img, args.prompt)
+    cache_stats = None
+    if args.cache:
+        with CachedScorer(scorer, path=args.cache) as cached:
+            score, conf = cached.score(img, args.prompt)
+            cache_stats = cached.stats()
+    else:
+        score, conf = scorer.score(img, args.prompt)
 
     vm = ValueMap.zeros(120, 160)
     apply_observation(vm, Observation(center_rc=(55, 80), score=score, confidence=conf, radius_cells=14))
 
-    (out_dir / "vlm_score.json").write_text(
-        json.dumps({"prompt": args.prompt, "seed": args.seed, "score": float(score), "confidence": float(conf)}, indent=2),
-        encoding="utf-8",
-    )
+    payload = {"prompt": args.prompt, "seed": args.seed, "score": float(score), "confidence": float(conf)}
+    if cache_stats is not None:
+        payload["cache"] = cache_stats
+    (out_dir / "vlm_score.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
     plt.figure()
     plt.imshow(vm.value, origin="lower")
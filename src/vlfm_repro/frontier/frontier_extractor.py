@@ -5,13 +5,76 @@ import numpy as np
 from typing import Iterable
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.frontier.labeling import mask_components
+from vlfm_repro.profiling import profiled
 
 @dataclass(frozen=True)
 class FrontierCluster:
-    cells: list[tuple[int, int]]          # (r,c)
+    cells: np.ndarray | list[tuple[int, int]]  # (N,2) int32 array or list of (r,c)
     centroid_rc: tuple[float, float]      # float centroid in grid coords
     centroid_xy: tuple[float, float]      # world coords centroid
 
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare `cells` arrays elementwise and raise.
+        if not isinstance(other, FrontierCluster):
+            return NotImplemented
+        return (
+            self.centroid_rc == other.centroid_rc
+            and self.centroid_xy == other.centroid_xy
+            and np.array_equal(np.asarray(self.cells), np.asarray(other.cells))
+        )
+
+_NEIGHBOR_DELTAS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_NEIGHBOR_DELTAS_8 = _NEIGHBOR_DELTAS_4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+def _neighbor_deltas(connectivity: int) -> tuple[tuple[int, int], ...]:
+    if connectivity == 4:
+        return _NEIGHBOR_DELTAS_4
+    if connectivity == 8:
+        return _NEIGHBOR_DELTAS_8
+    raise ValueError("connectivity must be 4 or 8")
+
+@profiled("frontier.mask", size=lambda og, *a, **k: og.grid.size)
+def frontier_mask(
+    og: OccupancyGrid,
+    connectivity: int = 4,
+    require_free: bool = True,
+) -> np.ndarray:
+    """Boolean (H,W) mask of frontier cells, computed with whole-grid array ops.
+
+    Same definition as `find_frontier_cells`: a candidate cell (free, or any
+    non-occupied cell when ``require_free=False``) with at least one in-bounds
+    unknown neighbor.
+    """
+    return _frontier_mask_array(og.grid, connectivity, require_free)
+
+def _frontier_mask_array(g: np.ndarray, connectivity: int, require_free: bool) -> np.ndarray:
+    """Frontier mask of a raw grid array; cells outside `g` count as known."""
+    deltas = _neighbor_deltas(connectivity)
+    h, w = g.shape
+    if require_free:
+        candidate = g == 0
+    else:
+        candidate = g != 1
+
+    # Pad by one cell of "known" so out-of-bounds neighbors never count.
+    unknown = np.zeros((h + 2, w + 2), dtype=bool)
+    unknown[1:-1, 1:-1] = g == -1
+
+    touches_unknown = np.zeros((h, w), dtype=bool)
+    for dr, dc in deltas:
+        touches_unknown |= unknown[1 + dr:1 + dr + h, 1 + dc:1 + dc + w]
+    return candidate & touches_unknown
+
+def frontier_indices(
+    og: OccupancyGrid,
+    connectivity: int = 4,
+    require_free: bool = True,
+) -> np.ndarray:
+    """Frontier cells as an (N,2) int array of (r,c), in row-major order."""
+    return np.argwhere(frontier_mask(og, connectivity=connectivity, require_free=require_free))
+
+@profiled("frontier.find_cells", size=lambda og, *a, **k: og.grid.size)
 def find_frontier_cells(
     og: OccupancyGrid,
     connectivity: int = 4,
@@ -22,68 +85,62 @@ def find_frontier_cells(
     A frontier cell is typically defined as:
     - a free cell (0)
     - with at least one neighbor that is unknown (-1)
+
+    Cells are returned in row-major order. Use `frontier_mask` or
+    `frontier_indices` to stay in array form on large maps.
     """
-    g = og.grid
-    h, w = g.shape
-    frontier = []
-    for r in range(h):
-        for c in range(w):
-            v = int(g[r, c])
-            if require_free and v != 0:
-                continue
-            if not require_free and v == 1:
-                continue
-            for rr, cc in og.neighbors(r, c, connectivity=connectivity):
-                if int(g[rr, cc]) == -1:
-                    frontier.append((r, c))
-                    break
-    return frontier
-
-def _bfs_components(
-    cells: set[tuple[int, int]],
-    og: OccupancyGrid,
-    connectivity: int = 8
-) -> list[list[tuple[int, int]]]:
-    comps: list[list[tuple[int, int]]] = []
-    visited: set[tuple[int, int]] = set()
-    for cell in cells:
-        if cell in visited:
-            continue
-        q = [cell]
-        visited.add(cell)
-        comp = []
-        while q:
-            cur = q.pop()
-            comp.append(cur)
-            for nb in og.neighbors(cur[0], cur[1], connectivity=connectivity):
-                if nb in cells and nb not in visited:
-                    visited.add(nb)
-                    q.append(nb)
-        comps.append(comp)
-    return comps
+    idx = frontier_indices(og, connectivity=connectivity, require_free=require_free)
+    return [(int(r), int(c)) for r, c in idx]
 
+@profiled("frontier.cluster", size=lambda og, *a, **k: og.grid.size)
 def cluster_frontiers(
     og: OccupancyGrid,
-    frontier_cells: Iterable[tuple[int, int]],
+    frontier_cells: Iterable[tuple[int, int]] | np.ndarray,
     connectivity: int = 8,
     min_cluster_size: int = 5
 ) -> list[FrontierCluster]:
-    """Cluster frontier cells into connected components and compute centroids."""
-    cell_set = set(frontier_cells)
-    comps = _bfs_components(cell_set, og, connectivity=connectivity)
-    clusters: list[FrontierCluster] = []
-    for comp in comps:
-        if len(comp) < min_cluster_size:
-            continue
-        rs = np.array([p[0] for p in comp], dtype=np.float32)
-        cs = np.array([p[1] for p in comp], dtype=np.float32)
-        cr = float(rs.mean())
-        cc = float(cs.mean())
-        rr = int(round(cr))
-        rc = int(round(cc))
-        rr = max(0, min(rr, og.shape[0] - 1))
-        rc = max(0, min(rc, og.shape[1] - 1))
-        cx, cy = og.world_xy(rr, rc)
-        clusters.append(FrontierCluster(cells=list(comp), centroid_rc=(cr, cc), centroid_xy=(cx, cy)))
-    clusters.sort(key=lambda cl: len(cl.cells), reverse=True)
+    """Cluster frontier cells into connected components and compute centroids.
+
+    `frontier_cells` may be an iterable of (r,c), an (N,2) index array, or a
+    boolean (H,W) frontier mask as returned by `frontier_mask`. Cluster cells
+    are returned as (N,2) int32 arrays in row-major order.
+    """
+    comps = mask_components(
+        _as_mask(og, frontier_cells),
+        connectivity=connectivity,
+        min_size=min_cluster_size,
+    )
+    clusters = [
+        _make_cluster(og, comps.component(k), comps.centroids[k])
+        for k in range(len(comps))
+    ]
+    clusters.sort(key=_cluster_sort_key)
     return clusters
+
+def _as_mask(og: OccupancyGrid, frontier_cells: Iterable[tuple[int, int]] | np.ndarray) -> np.ndarray:
+    if isinstance(frontier_cells, np.ndarray) and frontier_cells.dtype == bool:
+        if frontier_cells.shape != og.shape:
+            raise ValueError("frontier mask must have the grid shape")
+        return frontier_cells
+    idx = np.asarray(
+        frontier_cells if isinstance(frontier_cells, np.ndarray) else list(frontier_cells),
+        dtype=np.intp,
+    ).reshape(-1, 2)
+    mask = np.zeros(og.shape, dtype=bool)
+    mask[idx[:, 0], idx[:, 1]] = True
+    return mask
+
+def _make_cluster(og: OccupancyGrid, cells: np.ndarray, centroid_rc: np.ndarray) -> FrontierCluster:
+    cr = float(centroid_rc[0])
+    cc = float(centroid_rc[1])
+    rr = int(round(cr))
+    rc = int(round(cc))
+    rr = max(0, min(rr, og.shape[0] - 1))
+    rc = max(0, min(rc, og.shape[1] - 1))
+    cx, cy = og.world_xy(rr, rc)
+    return FrontierCluster(cells=cells, centroid_rc=(cr, cc), centroid_xy=(cx, cy))
+
+def _cluster_sort_key(cl: FrontierCluster) -> tuple[int, int, int]:
+    # Largest first; ties broken by the first cell in row-major order.
+    r, c = cl.cells[0]
+    return (-len(cl.cells), int(r), int(c))
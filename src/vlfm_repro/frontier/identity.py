@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import weakref
+
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster
+from vlfm_repro.nav.frontier_ranker import RankedFrontier, cluster_path_costs
+from vlfm_repro.nav.window_scoring import ValueWindowIndex
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+@dataclass
+class TrackedFrontier:
+    """A frontier cluster with an identity that persists across steps."""
+    id: int
+    cluster: FrontierCluster
+    born_step: int
+    changed: bool = True                      # cells differ from the previous step
+    parents: tuple[int, ...] = ()             # previous-step ids it overlapped or matched
+    # Cached ranking inputs; see `FrontierIdentityTracker.rank`.
+    _score: float | None = field(default=None, repr=False)
+    _score_key: tuple | None = field(default=None, repr=False)
+    _cost: float | None = field(default=None, repr=False)
+    _cost_key: object = field(default=None, repr=False)
+
+
+@dataclass
+class FrontierEvents:
+    """What `FrontierIdentityTracker.update` saw happen between two steps."""
+    born: list[int] = field(default_factory=list)
+    vanished: list[int] = field(default_factory=list)
+    splits: dict[int, list[int]] = field(default_factory=dict)   # parent id -> ids it split into
+    merges: dict[int, list[int]] = field(default_factory=dict)   # id -> previous ids merged into it
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    return (cells[:, 0] << 32) | (cells[:, 1] & 0xFFFFFFFF)
+
+
+def _overlaps(prev: list[FrontierCluster], cur: list[FrontierCluster]) -> np.ndarray:
+    """(len(prev), len(cur)) counts of shared cells."""
+    out = np.zeros((len(prev), len(cur)), dtype=np.int64)
+    if not prev or not cur:
+        return out
+    pk = [_cell_keys(cl.cells) for cl in prev]
+    ck = [_cell_keys(cl.cells) for cl in cur]
+    pkeys = np.concatenate(pk)
+    plab = np.repeat(np.arange(len(prev)), [k.size for k in pk])
+    order = np.argsort(pkeys, kind="stable")
+    pkeys, plab = pkeys[order], plab[order]
+    ckeys = np.concatenate(ck)
+    clab = np.repeat(np.arange(len(cur)), [k.size for k in ck])
+    pos = np.minimum(np.searchsorted(pkeys, ckeys), pkeys.size - 1)
+    hit = pkeys[pos] == ckeys
+    np.add.at(out, (plab[pos[hit]], clab[hit]), 1)
+    return out
+
+
+def _same_cells(a: FrontierCluster, b: FrontierCluster) -> bool:
+    if a is b:
+        return True
+    ca, cb = np.asarray(a.cells), np.asarray(b.cells)
+    return ca.shape == cb.shape and bool(np.array_equal(ca, cb))
+
+
+class FrontierIdentityTracker:
+    """Gives frontier clusters ids that persist from one planning step to the next.
+
+    `update(clusters)` matches the new clusters against the previous step's.
+    A new cluster sharing cells with old ones inherits the id of the one it
+    overlaps most. When several new clusters claim the same old id (a split),
+    the largest overlap keeps it and the others get fresh ids. Clusters with
+    no overlap are then matched to unclaimed old ones by nearest centroid
+    within `max_centroid_dist` cells, which follows a frontier that moved
+    as the map grew. Everything else is born with a fresh id.
+
+    `rank` caches each frontier's score until its cells change or the value
+    map writes into its scoring window, and its path cost until its cells or
+    the caller's `cost_key` change. Frontiers that are unchanged are
+    re-ranked without touching the value map or distance field.
+    """
+
+    def __init__(self, max_centroid_dist: float = 10.0) -> None:
+        self.max_centroid_dist = float(max_centroid_dist)
+        self.step = 0
+        self.frontiers: list[TrackedFrontier] = []
+        self.events = FrontierEvents()
+        self.last_scored = 0     # scores recomputed by the last `rank`
+        self.last_costed = 0     # path costs recomputed by the last `rank`
+        self._next_id = 1
+        self._incumbent: int | None = None
+
+    def _new_id(self) -> int:
+        fid = self._next_id
+        self._next_id += 1
+        return fid
+
+    def update(self, clusters: list[FrontierCluster]) -> list[TrackedFrontier]:
+        """Match `clusters` to the previous step's frontiers; returns them in the given order."""
+        self.step += 1
+        prev = self.frontiers
+        overlap = _overlaps([f.cluster for f in prev], clusters)
+        events = FrontierEvents()
+
+        owner = np.full(len(clusters), -1, dtype=np.int64)   # index into prev
+        claimed: dict[int, int] = {}                          # prev index -> cur index
+        if prev and clusters:
+            best = overlap.argmax(axis=0)
+            for j in np.argsort(-overlap[best, np.arange(len(clusters))], kind="stable"):
+                i = int(best[j])
+                if overlap[i, j] > 0 and i not in claimed:
+                    claimed[i] = int(j)
+                    owner[j] = i
+
+            # Frontiers with no shared cells: nearest unclaimed centroid.
+            free_prev = [i for i in range(len(prev)) if i not in claimed and not overlap[i].any()]
+            free_cur = [j for j in range(len(clusters)) if owner[j] < 0 and not overlap[:, j].any()]
+            if free_prev and free_cur:
+                pc = np.array([prev[i].cluster.centroid_rc for i in free_prev])
+                cc = np.array([clusters[j].centroid_rc for j in free_cur])
+                d = np.hypot(*(pc[:, None, :] - cc[None, :, :]).transpose(2, 0, 1))
+                for flat in np.argsort(d, axis=None, kind="stable"):
+                    a, b = divmod(int(flat), len(free_cur))
+                    if d[a, b] > self.max_centroid_dist:
+                        break
+                    i, j = free_prev[a], free_cur[b]
+                    if i in claimed or owner[j] >= 0:
+                        continue
+                    claimed[i] = j
+                    owner[j] = i
+
+        out = []
+        for j, cl in enumerate(clusters):
+            parents = tuple(int(prev[i].id) for i in np.flatnonzero(overlap[:, j]))
+            i = int(owner[j])
+            if i >= 0:
+                old = prev[i]
+                tf = TrackedFrontier(
+                    id=old.id, cluster=cl, born_step=old.born_step,
+                    changed=not _same_cells(old.cluster, cl),
+                    parents=parents or (old.id,),
+                )
+                if not tf.changed:
+                    tf._score, tf._score_key = old._score, old._score_key
+                    tf._cost, tf._cost_key = old._cost, old._cost_key
+            else:
+                tf = TrackedFrontier(id=self._new_id(), cluster=cl, born_step=self.step, parents=parents)
+                events.born.append(tf.id)
+            out.append(tf)
+
+        children: dict[int, list[int]] = {}
+        for tf in out:
+            for p in tf.parents:
+                children.setdefault(p, []).append(tf.id)
+            if len(tf.parents) > 1:
+                events.merges[tf.id] = list(tf.parents)
+        events.splits = {p: kids for p, kids in children.items() if len(kids) > 1}
+        events.vanished = [f.id for i, f in enumerate(prev) if i not in claimed]
+        self.frontiers = out
+        self.events = events
+        return out
+
+    def rank(
+        self,
+        value_map: ValueMap,
+        radius_cells: int = 3,
+        mode: str = "mean",
+        distance_field: np.ndarray | None = None,
+        cost_key: object = None,
+        cost_weight: float = 0.1,
+        stickiness: float = 0.0,
+        index: ValueWindowIndex | None = None,
+    ) -> list[RankedFrontier]:
+        """Rank the current frontiers like `rank_frontiers` (or `rank_frontiers_with_cost`).
+
+        With `distance_field`, frontiers are ranked by ``score - cost_weight *
+        path_cost`` and unreachable ones are dropped. Path costs are reused
+        while `cost_key` (e.g. the step the field was built for) is not None
+        and unchanged. The previous top frontier stays on top unless another
+        beats its ranking key by more than `stickiness`, which damps
+        oscillation between near-equal frontiers. Ties rank older ids first.
+        """
+        params = (radius_cells, mode)
+        stale = []
+        for tf in self.frontiers:
+            cr, cc = tf.cluster.centroid_rc
+            r, c = int(round(cr)), int(round(cc))
+            box = (r - radius_cells, c - radius_cells, r + radius_cells + 1, c + radius_cells + 1)
+            if (
+                tf._score is None
+                or tf._score_key[0]() is not value_map
+                or tf._score_key[1] != params
+                or value_map.changed_since(tf._score_key[2], box)
+            ):
+                stale.append(tf)
+        if stale:
+            if index is None:
+                index = ValueWindowIndex(value_map.value)
+            centers = np.array([tf.cluster.centroid_rc for tf in stale], dtype=np.float64)
+            # The score-cache key holds the map by weak reference: an `id` could
+            # be reused by a new map once the old one is freed, and a strong
+            # reference would keep the old map alive.
+            map_ref = weakref.ref(value_map)
+            for tf, s in zip(stale, index.scores(centers, radius_cells, mode)):
+                tf._score = float(s)
+                tf._score_key = (map_ref, params, value_map.version)
+        self.last_scored = len(stale)
+
+        self.last_costed = 0
+        if distance_field is not None:
+            todo = [tf for tf in self.frontiers if cost_key is None or tf._cost is None or tf._cost_key != cost_key]
+            for tf, d in zip(todo, cluster_path_costs(distance_field, [tf.cluster for tf in todo])):
+                tf._cost, tf._cost_key = float(d), cost_key
+            self.last_costed = len(todo)
+
+        ranked = []
+        for tf in self.frontiers:
+            if distance_field is None:
+                ranked.append(RankedFrontier(cluster=tf.cluster, score=tf._score, frontier_id=tf.id))
+            elif np.isfinite(tf._cost):
+                ranked.append(RankedFrontier(
+                    cluster=tf.cluster, score=tf._score, path_cost=tf._cost,
+                    utility=tf._score - cost_weight * tf._cost, frontier_id=tf.id,
+                ))
+
+        def key(rf: RankedFrontier) -> float:
+            return rf.score if rf.utility is None else rf.utility
+
+        ranked.sort(key=lambda rf: (-key(rf), rf.frontier_id))
+        if ranked and stickiness > 0.0:
+            for i, rf in enumerate(ranked):
+                if rf.frontier_id == self._incumbent:
+                    if key(ranked[0]) - key(rf) <= stickiness:
+                        ranked.insert(0, ranked.pop(i))
+                    break
+        self._incumbent = ranked[0].frontier_id if ranked else None
+        return ranked
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid, expand_box
+from vlfm_repro.frontier.frontier_extractor import (
+    FrontierCluster,
+    _cluster_sort_key,
+    _frontier_mask_array,
+    _make_cluster,
+    frontier_mask,
+)
+from vlfm_repro.frontier.labeling import mask_components
+
+
+class IncrementalFrontierTracker:
+    """Keeps frontier cells and clusters of an `OccupancyGrid` up to date.
+
+    Each `refresh()` reads the grid's dirty boxes (see
+    `OccupancyGrid.dirty_since`) and recomputes the frontier mask only inside
+    those boxes plus a one-cell halo, then relabels only the clusters that
+    touch the recomputed region. The result always equals a full
+    `find_frontier_cells` + `cluster_frontiers` pass with the same parameters.
+
+    All connected components are tracked, including those smaller than
+    `min_cluster_size`, so that a small component growing past the threshold
+    is picked up without a rescan.
+    """
+
+    def __init__(
+        self,
+        og: OccupancyGrid,
+        connectivity: int = 4,
+        require_free: bool = True,
+        cluster_connectivity: int = 8,
+        min_cluster_size: int = 5,
+    ) -> None:
+        self.og = og
+        self.connectivity = connectivity
+        self.require_free = require_free
+        self.cluster_connectivity = cluster_connectivity
+        self.min_cluster_size = min_cluster_size
+
+        self._version = og.version
+        self._mask = frontier_mask(og, connectivity=connectivity, require_free=require_free)
+        self._labels = np.zeros(og.shape, dtype=np.int32)
+        self._components: dict[int, tuple[np.ndarray, np.ndarray]] = {}  # id -> (cells, centroid)
+        self._clusters: dict[int, FrontierCluster] = {}
+        self._next_id = 1
+        self._add_components(self._mask, (0, 0))
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Boolean (H,W) frontier mask. Treat as read-only."""
+        return self._mask
+
+    def refresh(self) -> list[Box]:
+        """Bring the tracker up to date with the grid; returns the recomputed boxes."""
+        boxes = self.og.dirty_since(self._version)
+        self._version = self.og.version
+        if not boxes:
+            return []
+
+        shape = self.og.shape
+        windows = [expand_box(b, 1, shape) for b in boxes]
+        for r0, c0, r1, c1 in windows:
+            # One more cell of grid context so every window cell sees all its neighbors.
+            sr0, sc0, sr1, sc1 = expand_box((r0, c0, r1, c1), 1, shape)
+            sub = _frontier_mask_array(self.og.grid[sr0:sr1, sc0:sc1], self.connectivity, self.require_free)
+            self._mask[r0:r1, c0:c1] = sub[r0 - sr0:r1 - sr0, c0 - sc0:c1 - sc0]
+
+        # Any component adjacent to a recomputed cell may have split, merged or grown.
+        affected: set[int] = set()
+        pieces = []
+        for win in windows:
+            r0, c0, r1, c1 = expand_box(win, 1, shape)
+            affected.update(int(i) for i in np.unique(self._labels[r0:r1, c0:c1]) if i != 0)
+            r0, c0, r1, c1 = win
+            pieces.append(np.argwhere(self._mask[r0:r1, c0:c1]) + (r0, c0))
+
+        for cid in affected:
+            cells, _ = self._components.pop(cid)
+            self._clusters.pop(cid, None)
+            self._labels[cells[:, 0], cells[:, 1]] = 0
+            pieces.append(cells)
+
+        # Relabel the affected cells, each group of touching pieces inside its
+        # own bounding window, so edits far apart do not relabel the map
+        # between them. Unaffected components are never adjacent to these
+        # cells, so they are left out.
+        pieces = [p.astype(np.intp, copy=False) for p in pieces]
+        pieces = [p[self._mask[p[:, 0], p[:, 1]]] for p in pieces]
+        for (r0, c0, r1, c1), cells in _touching_groups([p for p in pieces if p.shape[0]]):
+            local = np.zeros((r1 - r0, c1 - c0), dtype=bool)
+            local[cells[:, 0] - r0, cells[:, 1] - c0] = True
+            self._add_components(local, (r0, c0))
+        return windows
+
+    def clusters(self) -> list[FrontierCluster]:
+        """Clusters of at least `min_cluster_size` cells, ordered like `cluster_frontiers`."""
+        out = []
+        for cid, (cells, centroid) in self._components.items():
+            if cells.shape[0] < self.min_cluster_size:
+                continue
+            cl = self._clusters.get(cid)
+            if cl is None:
+                cl = _make_cluster(self.og, cells, centroid)
+                self._clusters[cid] = cl
+            out.append(cl)
+        out.sort(key=_cluster_sort_key)
+        return out
+
+    def _add_components(self, mask: np.ndarray, offset: tuple[int, int]) -> None:
+        comps = mask_components(mask, connectivity=self.cluster_connectivity, offset=offset)
+        for k in range(len(comps)):
+            cid = self._next_id
+            self._next_id += 1
+            cells = comps.component(k)
+            self._components[cid] = (cells, comps.centroids[k])
+            self._labels[cells[:, 0], cells[:, 1]] = cid
+
+
+def _touching_groups(pieces: list[np.ndarray]) -> list[tuple[Box, np.ndarray]]:
+    """Merge (N,2) cell arrays whose bounding boxes overlap or touch.
+
+    Cells of different groups are never 8-adjacent, so each group can be
+    labeled on its own. Returns (bounding box, cells) per group.
+    """
+    groups: list[tuple[Box, list[np.ndarray]]] = []
+    for p in pieces:
+        (r0, c0), (r1, c1) = p.min(axis=0), p.max(axis=0) + 1
+        groups.append(((int(r0), int(c0), int(r1), int(c1)), [p]))
+    merged = True
+    while merged:
+        merged = False
+        out: list[tuple[Box, list[np.ndarray]]] = []
+        for box, cells in groups:
+            for i, (other, other_cells) in enumerate(out):
+                if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    out[i] = (
+                        (min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3])),
+                        other_cells + cells,
+                    )
+                    merged = True
+                    break
+            else:
+                out.append((box, cells))
+        groups = out
+    return [(box, np.concatenate(cells)) for box, cells in groups]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+
+# Connected-component labeling over boolean masks.
+#
+# The mask is first decomposed into horizontal runs. Runs in adjacent rows are
+# joined with vectorized range queries, and the resulting run graph is resolved
+# with an array union-find (hook larger roots onto smaller ones, then pointer
+# jumping). Work is proportional to the number of runs, not cells, and no
+# per-cell Python code is executed.
+
+
+@dataclass(frozen=True)
+class Components:
+    """Connected components of a mask, in order of their first row-major cell.
+
+    Attributes:
+        cells: (N,2) int32 array of (r,c) for all kept cells, grouped by
+            component and row-major within each component.
+        offsets: (K+1,) start offsets into `cells`; component k is
+            ``cells[offsets[k]:offsets[k+1]]``.
+        sizes: (K,) int64 cell counts.
+        centroids: (K,2) float64 mean (r,c) per component.
+    """
+    cells: np.ndarray
+    offsets: np.ndarray
+    sizes: np.ndarray
+    centroids: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.sizes.shape[0])
+
+    def component(self, k: int) -> np.ndarray:
+        return self.cells[self.offsets[k]:self.offsets[k + 1]]
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Horizontal runs of True as (row, start, end) arrays; `end` is exclusive."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    d = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(d == 1)
+    _, ends = np.nonzero(d == -1)
+    return rows, starts, ends
+
+
+def _run_labels(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int, connectivity: int) -> tuple[np.ndarray, int]:
+    """Component id per run (0..K-1, ordered by first run) and K."""
+    if connectivity not in (4, 8):
+        raise ValueError("connectivity must be 4 or 8")
+    n = rows.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), 0
+    k = 1 if connectivity == 8 else 0
+
+    # Runs in row r+1 overlapping run a are a contiguous index range [lo, hi).
+    stride = width + 3
+    start_key = rows * stride + starts + 1
+    end_key = rows * stride + ends + 1
+    next_row = (rows + 1) * stride
+    lo = np.searchsorted(end_key, next_row + starts - k + 1, side="right")
+    hi = np.searchsorted(start_key, next_row + ends + k + 1, side="left")
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    a = np.repeat(np.arange(n), counts)
+    b = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+    parent = np.arange(n)
+    while a.size:
+        pa, pb = parent[a], parent[b]
+        active = pa != pb
+        if not active.any():
+            break
+        a, b, pa, pb = a[active], b[active], pa[active], pb[active]
+        np.minimum.at(parent, np.maximum(pa, pb), np.minimum(pa, pb))
+        while True:
+            nxt = parent[parent]
+            if np.array_equal(nxt, parent):
+                break
+            parent = nxt
+
+    roots, run_label = np.unique(parent, return_inverse=True)
+    return run_label.reshape(-1), int(roots.shape[0])
+
+
+def label_components(mask: np.ndarray, connectivity: int = 8) -> tuple[np.ndarray, int]:
+    """Label connected True regions of a 2D mask.
+
+    Returns (labels, K): int32 (H,W) labels with 0 as background and 1..K
+    ordered by each component's first row-major cell.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, starts, ends = _runs(mask)
+    run_label, k = _run_labels(rows, starts, ends, mask.shape[1], connectivity)
+    lengths = ends - starts
+    labels = np.zeros(mask.shape, dtype=np.int32)
+    r, c = _expand_runs(rows, starts, lengths)
+    labels[r, c] = np.repeat(run_label + 1, lengths)
+    return labels, k
+
+
+def _expand_runs(rows: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    total = int(lengths.sum())
+    first = np.cumsum(lengths) - lengths
+    r = np.repeat(rows, lengths)
+    c = np.arange(total) - np.repeat(first - starts, lengths)
+    return r, c
+
+
+def mask_components(
+    mask: np.ndarray,
+    connectivity: int = 8,
+    min_size: int = 1,
+    offset: tuple[int, int] = (0, 0),
+) -> Components:
+    """Connected components of `mask` with sizes and centroids from run reductions.
+
+    Components smaller than `min_size` are dropped. `offset` is added to
+    every (r,c); pass the window origin when labeling a crop of a larger map
+    so cells and centroids come back in map coordinates.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, starts, ends = _runs(mask)
+    run_label, k = _run_labels(rows, starts, ends, mask.shape[1], connectivity)
+    r_off, c_off = offset
+    rows = rows + r_off
+    starts = starts + c_off
+    ends = ends + c_off
+    lengths = ends - starts
+
+    # Per-run sums; float64 keeps integer sums exact so centroids are order-free.
+    sizes = np.bincount(run_label, weights=lengths, minlength=k).astype(np.int64)
+    row_sum = np.bincount(run_label, weights=rows * lengths.astype(np.float64), minlength=k)
+    col_sum = np.bincount(run_label, weights=lengths * (starts + ends - 1) / 2.0, minlength=k)
+
+    keep = sizes >= min_size
+    new_id = np.cumsum(keep) - 1
+    run_keep = keep[run_label]
+    rows, starts, lengths, run_label = rows[run_keep], starts[run_keep], lengths[run_keep], new_id[run_label[run_keep]]
+
+    sizes = sizes[keep]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centroids = np.stack([row_sum[keep], col_sum[keep]], axis=1) / sizes[:, None]
+
+    r, c = _expand_runs(rows, starts, lengths)
+    order = np.argsort(np.repeat(run_label, lengths), kind="stable")
+    cells = np.empty((r.shape[0], 2), dtype=np.int32)
+    cells[:, 0] = r[order]
+    cells[:, 1] = c[order]
+    offsets = np.zeros(sizes.shape[0] + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return Components(cells=cells, offsets=offsets, sizes=sizes, centroids=centroids)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import MAX_DIRTY_LOG, Box, OccupancyGrid
+
+CHUNK_SIZE = 64
+
+
+@dataclass
+class ChunkedOccupancyGrid:
+    """Sparse occupancy grid stored as square int8 chunks keyed by chunk coordinates.
+
+    Cell (r,c) may be any integer pair, including negative ones, so the map
+    grows in every direction without copying. A chunk is allocated on its
+    first write. A chunk that holds only unknown (-1) cells is dropped, so
+    memory tracks the explored area rather than its bounding box.
+
+    Cell values and the world frame match `OccupancyGrid`. `bounds` is the
+    cell box covered by allocated chunks. The map itself has no edge: cells
+    outside every chunk are unknown, not out of bounds, so `in_bounds` holds
+    for every cell and `neighbors` never drops one. Algorithms that need
+    dense arrays (frontier extraction, ranking, planning) run on
+    `dense_view` windows.
+    """
+    resolution: float = 0.05
+    origin_xy: tuple[float, float] = (0.0, 0.0)
+    chunk_size: int = CHUNK_SIZE
+    chunks: dict[tuple[int, int], np.ndarray] = field(default_factory=dict, repr=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    _dirty_log: list[tuple[int, Box]] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dense(cls, og: OccupancyGrid, chunk_size: int = CHUNK_SIZE) -> "ChunkedOccupancyGrid":
+        out = cls(resolution=og.resolution, origin_xy=og.origin_xy, chunk_size=chunk_size)
+        out.update_region(0, 0, og.grid)
+        return out
+
+    @property
+    def bounds(self) -> Box:
+        """(r0, c0, r1, c1) covered by allocated chunks; empty at the origin when none are."""
+        if not self.chunks:
+            return (0, 0, 0, 0)
+        keys = np.array(list(self.chunks))
+        n = self.chunk_size
+        (kr0, kc0), (kr1, kc1) = keys.min(axis=0), keys.max(axis=0) + 1
+        return (int(kr0) * n, int(kc0) * n, int(kr1) * n, int(kc1) * n)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        r0, c0, r1, c1 = self.bounds
+        return (r1 - r0, c1 - c0)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ch.nbytes for ch in self.chunks.values())
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        """Always True: cells outside the allocated chunks exist and read as unknown."""
+        return True
+
+    def is_allocated(self, r: int, c: int) -> bool:
+        return (r // self.chunk_size, c // self.chunk_size) in self.chunks
+
+    def neighbors(self, r: int, c: int, connectivity: int = 4) -> list[tuple[int, int]]:
+        """All 4- or 8-neighbours of (r,c); unallocated ones read as unknown via `get`."""
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8")
+        deltas = [(-1,0),(1,0),(0,-1),(0,1)]
+        if connectivity == 8:
+            deltas += [(-1,-1),(-1,1),(1,-1),(1,1)]
+        return [(r + dr, c + dc) for dr, dc in deltas]
+
+    def world_xy(self, r: int, c: int) -> tuple[float, float]:
+        """World (x,y) at the center of cell (r,c)."""
+        ox, oy = self.origin_xy
+        return (ox + (c + 0.5) * self.resolution, oy + (r + 0.5) * self.resolution)
+
+    def cell_rc(self, x: np.ndarray | float, y: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        """Cell (row, col) containing world (x,y); the inverse of `world_xy`. Accepts arrays."""
+        ox, oy = self.origin_xy
+        rows = np.floor((np.asarray(y) - oy) / self.resolution).astype(np.int64)
+        cols = np.floor((np.asarray(x) - ox) / self.resolution).astype(np.int64)
+        return rows, cols
+
+    def get(self, r: int, c: int) -> int:
+        n = self.chunk_size
+        chunk = self.chunks.get((r // n, c // n))
+        return -1 if chunk is None else int(chunk[r % n, c % n])
+
+    def window(self, r0: int, c0: int, r1: int, c1: int) -> np.ndarray:
+        """Dense int8 copy of cells [r0:r1, c0:c1]; implicit chunks read as unknown.
+
+        Only the chunk slots under the window are looked up, so the cost
+        does not grow with the number of allocated chunks.
+        """
+        out = np.full((max(0, r1 - r0), max(0, c1 - c0)), -1, dtype=np.int8)
+        if out.size == 0:
+            return out
+        n = self.chunk_size
+        for (kr, kc), chunk, (ar0, ac0, ar1, ac1) in self._overlapping(r0, c0, r1, c1):
+            if chunk is not None:
+                out[ar0 - r0:ar1 - r0, ac0 - c0:ac1 - c0] = chunk[ar0 - kr * n:ar1 - kr * n, ac0 - kc * n:ac1 - kc * n]
+        return out
+
+    def dense_view(self, box: Box | None = None) -> OccupancyGrid:
+        """`OccupancyGrid` copy of `box` in the same world frame.
+
+        The default box is `bounds` grown by one unknown cell on every side,
+        so explored cells on the outer edge of the chunks keep their unknown
+        neighbours and show up as frontiers. An explicit `box` is copied as
+        is; frontier callers should pass one with such a one-cell halo.
+        Cell (i,j) of the view is cell (r0+i, c0+j) here, and `world_xy`
+        agrees between the two.
+        """
+        if box is None:
+            r0, c0, r1, c1 = self.bounds
+            box = (r0 - 1, c0 - 1, r1 + 1, c1 + 1) if self.chunks else (r0, c0, r1, c1)
+        r0, c0, r1, c1 = box
+        ox, oy = self.origin_xy
+        return OccupancyGrid(
+            grid=self.window(r0, c0, r1, c1),
+            resolution=self.resolution,
+            origin_xy=(ox + c0 * self.resolution, oy + r0 * self.resolution),
+        )
+
+    def update_region(self, r0: int, c0: int, patch: np.ndarray) -> None:
+        """Write `patch` with its top-left corner at (r0,c0), allocating chunks as needed."""
+        patch = np.asarray(patch, dtype=np.int8)
+        if patch.ndim != 2:
+            raise ValueError("patch must be 2D")
+        ph, pw = patch.shape
+        if ph == 0 or pw == 0:
+            return
+        n = self.chunk_size
+        for key, chunk, (ar0, ac0, ar1, ac1) in self._overlapping(r0, c0, r0 + ph, c0 + pw):
+            src = patch[ar0 - r0:ar1 - r0, ac0 - c0:ac1 - c0]
+            if chunk is None:
+                if np.all(src == -1):
+                    continue
+                chunk = self.chunks[key] = np.full((n, n), -1, dtype=np.int8)
+            chunk[ar0 - key[0] * n:ar1 - key[0] * n, ac0 - key[1] * n:ac1 - key[1] * n] = src
+            self._drop_if_unknown(key)
+        self.mark_dirty(r0, c0, r0 + ph, c0 + pw)
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray | int) -> None:
+        """Scatter `values` into cells (rows[i], cols[i]), grouped by chunk."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        if rows.size == 0:
+            return
+        values = np.broadcast_to(np.asarray(values, dtype=np.int8), rows.shape)
+        n = self.chunk_size
+        kr, kc = rows // n, cols // n
+        keys, inverse = np.unique(np.stack([kr, kc], axis=1), axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        splits = np.cumsum(np.bincount(inverse.ravel(), minlength=len(keys)))[:-1]
+        for key, sel in zip(map(tuple, keys.tolist()), np.split(order, splits)):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if np.all(values[sel] == -1):
+                    continue
+                chunk = self.chunks[key] = np.full((n, n), -1, dtype=np.int8)
+            chunk[rows[sel] % n, cols[sel] % n] = values[sel]
+            self._drop_if_unknown(key)
+        self.mark_dirty(int(rows.min()), int(cols.min()), int(rows.max()) + 1, int(cols.max()) + 1)
+
+    def mark_dirty(self, r0: int, c0: int, r1: int, c1: int) -> None:
+        """Record that cells in the half-open box [r0:r1, c0:c1] may have changed."""
+        if r0 >= r1 or c0 >= c1:
+            return
+        self.version += 1
+        self._dirty_log.append((self.version, (int(r0), int(c0), int(r1), int(c1))))
+        if len(self._dirty_log) > MAX_DIRTY_LOG:
+            del self._dirty_log[: len(self._dirty_log) - MAX_DIRTY_LOG]
+
+    def dirty_since(self, version: int) -> list[Box]:
+        """Boxes written after `version`; `bounds` when the log no longer reaches back."""
+        if version >= self.version:
+            return []
+        if not self._dirty_log or self._dirty_log[0][0] > version + 1:
+            return [self.bounds]
+        return [box for v, box in self._dirty_log if v > version]
+
+    def _overlapping(self, r0: int, c0: int, r1: int, c1: int):
+        """(key, chunk or None, clipped cell box) for every chunk slot a box overlaps."""
+        n = self.chunk_size
+        for kr in range(r0 // n, (r1 - 1) // n + 1):
+            for kc in range(c0 // n, (c1 - 1) // n + 1):
+                box = (max(r0, kr * n), max(c0, kc * n), min(r1, (kr + 1) * n), min(c1, (kc + 1) * n))
+                yield (kr, kc), self.chunks.get((kr, kc)), box
+
+    def _drop_if_unknown(self, key: tuple[int, int]) -> None:
+        if np.all(self.chunks[key] == -1):
+            del self.chunks[key]
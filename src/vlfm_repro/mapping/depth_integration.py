@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid
+
+
+@dataclass(frozen=True)
+class CameraIntrinsics:
+    """Pinhole intrinsics in pixels (OpenCV convention: x right, y down, z forward)."""
+    fx: float
+    fy: float
+    cx: float
+    cy: float
+    width: int
+    height: int
+
+    @classmethod
+    def from_hfov(cls, width: int, height: int, hfov_rad: float) -> "CameraIntrinsics":
+        f = 0.5 * width / np.tan(0.5 * hfov_rad)
+        return cls(fx=f, fy=f, cx=0.5 * (width - 1), cy=0.5 * (height - 1), width=width, height=height)
+
+
+@dataclass(frozen=True)
+class CameraPose:
+    """Camera position in world meters (z up), yaw about +z and downward pitch.
+
+    `yaw` is measured from world +x toward +y, i.e. from +col toward +row.
+    """
+    x: float
+    y: float
+    z: float
+    yaw: float
+    pitch: float = 0.0
+
+
+@lru_cache(maxsize=8)
+def _pixel_rays(intrinsics: CameraIntrinsics, stride: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-pixel (left, up) offsets per meter of depth, flattened for a strided image."""
+    v, u = np.mgrid[0:intrinsics.height:stride, 0:intrinsics.width:stride].astype(np.float32)
+    left = -(u - np.float32(intrinsics.cx)) / np.float32(intrinsics.fx)
+    up = -(v - np.float32(intrinsics.cy)) / np.float32(intrinsics.fy)
+    return left.ravel(), up.ravel()
+
+
+def depth_to_points(
+    depth: np.ndarray,
+    intrinsics: CameraIntrinsics,
+    pose: CameraPose,
+    max_depth: float = 5.0,
+    stride: int = 1,
+) -> np.ndarray:
+    """Back-project a metric depth image (distance along the optical axis) to world points.
+
+    Pixels that are non-finite, non-positive or beyond `max_depth` are
+    dropped. `stride` subsamples rows and columns. Returns float32 (N,3) x,y,z.
+    """
+    d = np.asarray(depth, dtype=np.float32)[::stride, ::stride].ravel()
+    idx = np.flatnonzero((d > 0) & (d <= max_depth))  # NaN fails both tests
+    left, up = _pixel_rays(intrinsics, int(stride))
+    d, left, up = d[idx], left[idx], up[idx]
+
+    # Body frame (forward, left, up) per meter of depth, then pitch and yaw.
+    cp, sp = np.float32(np.cos(pose.pitch)), np.float32(np.sin(pose.pitch))
+    cy, sy = np.float32(np.cos(pose.yaw)), np.float32(np.sin(pose.yaw))
+    fwd = cp + up * sp
+    out = np.empty((idx.size, 3), dtype=np.float32)
+    out[:, 0] = (fwd * cy - left * sy) * d + np.float32(pose.x)
+    out[:, 1] = (fwd * sy + left * cy) * d + np.float32(pose.y)
+    out[:, 2] = (up * cp - sp) * d + np.float32(pose.z)
+    return out
+
+
+def ray_cells(start_rc: tuple[int, int], ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Cells crossed by the segments from `start_rc` to each (N,2) end cell, ends excluded.
+
+    Batched DDA: every ray takes ``max(|dr|, |dc|)`` unit steps along its
+    major axis, so all rays advance in lockstep as one (N, L) array
+    operation. Cells may repeat across rays.
+    """
+    ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+    dr = ends[:, 0] - start_rc[0]
+    dc = ends[:, 1] - start_rc[1]
+    n = np.maximum(np.abs(dr), np.abs(dc))
+    if n.size == 0 or n.max() == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    k = np.arange(int(n.max()), dtype=np.float32)
+    keep = k[None, :] < n[:, None]
+    inv = 1.0 / np.maximum(n, 1).astype(np.float32)
+    rows = np.rint(k[None, :] * (dr * inv)[:, None])[keep].astype(np.int64) + start_rc[0]
+    cols = np.rint(k[None, :] * (dc * inv)[:, None])[keep].astype(np.int64) + start_rc[1]
+    return rows, cols
+
+
+def farthest_per_direction(start_rc: tuple[int, int], ends: np.ndarray, spacing: float = 0.5) -> np.ndarray:
+    """Subset of (N,2) `ends` keeping the farthest cell per angular bin around `start_rc`.
+
+    Bins are `spacing` cells wide at the farthest end. A ray to a nearer end
+    in the same bin runs along the kept ray, so carving only the kept rays
+    visits nearly the same cells.
+    """
+    ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+    dr = ends[:, 0] - start_rc[0]
+    dc = ends[:, 1] - start_rc[1]
+    length = np.maximum(np.abs(dr), np.abs(dc))
+    if length.size == 0:
+        return ends
+    n_bins = max(1, int(np.ceil(2.0 * np.pi * length.max() / spacing)))
+    b = ((np.arctan2(dr, dc) + np.pi) * (n_bins / (2.0 * np.pi))).astype(np.int64) % n_bins
+    order = np.lexsort((length, b))
+    b = b[order]
+    last = np.r_[b[1:] != b[:-1], True]
+    return ends[order[last]]
+
+
+class DepthIntegrator:
+    """Fuses depth frames into an `OccupancyGrid` through a log-odds buffer.
+
+    Each frame is back-projected and height-filtered. Points between
+    `min_height` and `max_height` are obstacle hits. Points below
+    `min_height` are floor and count as free. Points above `max_height` are
+    ignored. Hits are binned per cell. Free space is carved along DDA rays
+    from the camera cell toward the hit and floor cells, keeping one ray (the
+    farthest end) per angular bin.
+
+    Every cell observed in a frame gets one update: `l_hit` if any hit fell
+    in it, else `l_miss`. The log-odds value is clamped to
+    [`l_min`, `l_max`] and thresholded back into the grid's -1/0/1 cells.
+    Only changed cells are written, through `OccupancyGrid.set_cells`, so
+    dirty-box consumers see the update.
+    """
+
+    def __init__(
+        self,
+        og: OccupancyGrid,
+        min_height: float = 0.1,
+        max_height: float = 1.5,
+        max_depth: float = 5.0,
+        l_hit: float = 0.85,
+        l_miss: float = -0.4,
+        l_min: float = -2.0,
+        l_max: float = 3.5,
+        occupied_above: float = 0.5,
+        free_below: float = -0.2,
+        min_hits: int = 1,
+        stride: int = 1,
+    ) -> None:
+        self.og = og
+        self.min_height = min_height
+        self.max_height = max_height
+        self.max_depth = max_depth
+        self.l_hit, self.l_miss = np.float32(l_hit), np.float32(l_miss)
+        self.l_min, self.l_max = np.float32(l_min), np.float32(l_max)
+        self.occupied_above = occupied_above
+        self.free_below = free_below
+        self.min_hits = int(min_hits)
+        self.stride = int(stride)
+        self.log_odds = np.zeros(og.shape, dtype=np.float32)
+
+    def integrate(self, depth: np.ndarray, intrinsics: CameraIntrinsics, pose: CameraPose) -> Box | None:
+        """Fuse one depth frame; returns the box of cells it observed (None if nothing)."""
+        pts = depth_to_points(depth, intrinsics, pose, max_depth=self.max_depth, stride=self.stride)
+        z = pts[:, 2]
+        obstacle = (z >= self.min_height) & (z <= self.max_height)
+        keep = obstacle | (z < self.min_height)
+        rows, cols = self.og.cell_rc(pts[keep, 0], pts[keep, 1])
+        obstacle = obstacle[keep]
+        h, w = self.og.shape
+        inside = (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+        rows, cols, obstacle = rows[inside], cols[inside], obstacle[inside]
+        sr, sc = (int(v) for v in self.og.cell_rc(pose.x, pose.y))
+        if rows.size == 0:
+            return None
+
+        # Everything below happens in the frame's bounding box, in flat indices.
+        r0, c0 = min(int(rows.min()), sr), min(int(cols.min()), sc)
+        r1, c1 = max(int(rows.max()), sr) + 1, max(int(cols.max()), sc) + 1
+        bw = c1 - c0
+        n = (r1 - r0) * bw
+        local = (rows - r0) * bw + (cols - c0)
+        hits = np.bincount(local[obstacle], minlength=n) >= self.min_hits
+        ends = np.flatnonzero(np.bincount(local, minlength=n))
+        er, ec = np.divmod(ends, bw)
+        start = (sr - r0, sc - c0)
+        fr, fc = ray_cells(start, farthest_per_direction(start, np.stack([er, ec], axis=1)))
+        seen = np.zeros(n, dtype=bool)
+        seen[ends] = True
+        seen[fr * bw + fc] = True
+        hits &= seen
+
+        # The camera may sit outside the map; crop the box back to the grid.
+        cr0, cc0, cr1, cc1 = max(r0, 0), max(c0, 0), min(r1, h), min(c1, w)
+        crop = (slice(cr0 - r0, cr1 - r0), slice(cc0 - c0, cc1 - c0))
+        seen = seen.reshape(r1 - r0, bw)[crop]
+        hits = hits.reshape(r1 - r0, bw)[crop]
+        lo = self.log_odds[cr0:cr1, cc0:cc1]
+        lo += np.where(hits, self.l_hit, np.where(seen, self.l_miss, np.float32(0.0)))
+        np.clip(lo, self.l_min, self.l_max, out=lo)
+
+        state = np.where(lo > self.occupied_above, 1, np.where(lo < self.free_below, 0, -1)).astype(np.int8)
+        rr, cc = np.nonzero(seen & (state != self.og.grid[cr0:cr1, cc0:cc1]))
+        self.og.set_cells(rr + cr0, cc + cc0, state[rr, cc])
+        return (cr0, cc0, cr1, cc1)
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+# Append-only, compressed record of how an episode's maps evolved.
+#
+# `<path>` holds a file header (magic | u32 format version | u32 JSON length
+# | JSON) followed by one record per step: u32 payload length | u32 step |
+# u32 crc32 | u8 kind | 3 pad bytes | zlib payload. A payload lists grid
+# windows, value/conf windows, ranked frontiers and a JSON `extra` dict.
+# Delta records carry the windows written since the previous step;
+# keyframes carry whole maps, so replay starts at the keyframe at or before
+# the wanted step. `<path>.idx` holds one fixed-size entry per record for
+# seeking and is rebuilt from the log if it is missing or behind.
+
+from dataclasses import dataclass
+import json
+import mmap
+from pathlib import Path
+import struct
+import zlib
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+from vlfm_repro.profiling import profiled
+from vlfm_repro.vlm.value_map import ValueMap
+
+EPISODE_LOG_MAGIC = b"VLFMELOG"
+FORMAT_VERSION = 1
+KIND_DELTA = 0
+KIND_KEYFRAME = 1
+
+_PREFIX = struct.Struct("<8sII")
+_RECORD = struct.Struct("<IIIB3x")
+_COUNT = struct.Struct("<I")
+_BOX = struct.Struct("<IIII")
+INDEX_DTYPE = np.dtype([("step", "<u4"), ("kind", "<u4"), ("offset", "<u8")])
+FRONTIER_DTYPE = np.dtype([
+    ("id", "<i4"), ("score", "<f4"), ("utility", "<f4"), ("path_cost", "<f4"),
+    ("centroid_r", "<f4"), ("centroid_c", "<f4"), ("size", "<u4"),
+])
+
+
+def _frontier_array(ranked: list[RankedFrontier] | None) -> np.ndarray:
+    out = np.zeros(len(ranked or ()), dtype=FRONTIER_DTYPE)
+    for k, rf in enumerate(ranked or ()):
+        cr, cc = rf.cluster.centroid_rc
+        out[k] = (
+            -1 if rf.frontier_id is None else rf.frontier_id, rf.score,
+            np.nan if rf.utility is None else rf.utility,
+            np.nan if rf.path_cost is None else rf.path_cost,
+            cr, cc, len(rf.cluster.cells),
+        )
+    return out
+
+
+def _encode(og: OccupancyGrid, grid_boxes: list[Box], vm: ValueMap | None, value_boxes: list[Box],
+            frontiers: np.ndarray, extra: dict | None) -> list[bytes]:
+    parts = [_COUNT.pack(len(grid_boxes))]
+    for r0, c0, r1, c1 in grid_boxes:
+        parts += [_BOX.pack(r0, c0, r1, c1), og.grid[r0:r1, c0:c1].tobytes()]
+    parts.append(_COUNT.pack(len(value_boxes)))
+    for r0, c0, r1, c1 in value_boxes:
+        parts += [_BOX.pack(r0, c0, r1, c1), vm.value[r0:r1, c0:c1].tobytes(), vm.conf[r0:r1, c0:c1].tobytes()]
+    parts += [_COUNT.pack(len(frontiers)), frontiers.tobytes()]
+    blob = json.dumps(extra).encode("utf-8") if extra else b""
+    parts += [_COUNT.pack(len(blob)), blob]
+    return parts
+
+
+@dataclass
+class EpisodeState:
+    step: int
+    grid: np.ndarray
+    value: np.ndarray
+    conf: np.ndarray
+    frontiers: np.ndarray   # FRONTIER_DTYPE records, best first; NaN utility/path cost when unset
+    extra: dict
+
+
+class EpisodeRecorder:
+    """Appends one compressed record per `record()` call (a "step").
+
+    Deltas hold only the grid boxes logged by `OccupancyGrid.dirty_since`
+    and the value-map tiles written since the previous step, so direct
+    array writes must be followed by `mark_dirty`. A keyframe is written
+    every `keyframe_every` steps, or earlier once the deltas since the last
+    one add up to `max_delta_ratio` times a keyframe's raw size, which
+    bounds the work of any seek.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        og: OccupancyGrid,
+        vm: ValueMap | None = None,
+        keyframe_every: int = 100,
+        max_delta_ratio: float = 4.0,
+        level: int = 1,
+        meta: dict | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.og = og
+        self.vm = vm
+        self.keyframe_every = keyframe_every
+        self.level = level
+        h, w = og.shape
+        self._keyframe_bytes = h * w * (9 if vm is not None else 1)
+        self._max_delta_bytes = max_delta_ratio * self._keyframe_bytes
+        self.steps = 0
+        self.bytes_written = 0
+        self._delta_bytes = 0.0
+        self._og_version = og.version
+        self._vm_version = vm.version if vm is not None else 0
+
+        header = json.dumps({
+            "shape": [h, w],
+            "resolution": float(og.resolution),
+            "origin_xy": [float(v) for v in og.origin_xy],
+            "has_value": vm is not None,
+            "keyframe_every": keyframe_every,
+            "meta": meta or {},
+        }).encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.path, "wb")
+        self._idx = open(self._index_path(self.path), "wb")
+        self._log.write(_PREFIX.pack(EPISODE_LOG_MAGIC, FORMAT_VERSION, len(header)) + header)
+        self._offset = _PREFIX.size + len(header)
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_name(path.name + ".idx")
+
+    @profiled("episode_log.record")
+    def record(self, frontiers: list[RankedFrontier] | None = None, extra: dict | None = None) -> int:
+        """Log the maps' changes since the previous call; returns the step number.
+
+        The record is flushed before returning, so a crash of this process
+        loses no finished step.
+        """
+        og, vm = self.og, self.vm
+        h, w = og.shape
+        step = self.steps
+        grid_boxes = og.dirty_since(self._og_version)
+        value_boxes = vm.changed_boxes(self._vm_version) if vm is not None else []
+        raw = sum((b[2] - b[0]) * (b[3] - b[1]) for b in grid_boxes)
+        raw += 8 * sum((b[2] - b[0]) * (b[3] - b[1]) for b in value_boxes)
+        keyframe = step % self.keyframe_every == 0 or self._delta_bytes + raw > self._max_delta_bytes
+        if keyframe:
+            grid_boxes = [(0, 0, h, w)]
+            value_boxes = [(0, 0, h, w)] if vm is not None else []
+            self._delta_bytes = 0.0
+        else:
+            self._delta_bytes += raw
+
+        payload = zlib.compress(b"".join(_encode(og, grid_boxes, vm, value_boxes, _frontier_array(frontiers), extra)), self.level)
+        kind = KIND_KEYFRAME if keyframe else KIND_DELTA
+        self._log.write(_RECORD.pack(len(payload), step, zlib.crc32(payload), kind))
+        self._log.write(payload)
+        self._idx.write(np.array([(step, kind, self._offset)], dtype=INDEX_DTYPE).tobytes())
+        self._offset += _RECORD.size + len(payload)
+        self.bytes_written = self._offset
+
+        self._og_version = og.version
+        self._vm_version = vm.version if vm is not None else 0
+        self.steps += 1
+        self.flush()
+        return step
+
+    def flush(self) -> None:
+        self._log.flush()
+        self._idx.flush()
+
+    def close(self) -> None:
+        if not self._log.closed:
+            self._log.close()
+            self._idx.close()
+
+    def __enter__(self) -> "EpisodeRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EpisodeReplay:
+    """Random-access reader of an `EpisodeRecorder` log.
+
+    `state_at(step)` decodes the keyframe at or before `step` and applies the
+    deltas after it; moving forward from the last reconstructed step only
+    applies the deltas in between. A record cut off by a crash ends the log.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, hlen = _PREFIX.unpack_from(self._mm, 0)
+        if magic != EPISODE_LOG_MAGIC:
+            raise ValueError(f"{path} is not an episode log")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported episode log format {version}")
+        self.header = json.loads(self._mm[_PREFIX.size:_PREFIX.size + hlen].decode("utf-8"))
+        self.shape = tuple(self.header["shape"])
+        self.meta = self.header["meta"]
+        self.index = self._load_index(_PREFIX.size + hlen)
+        self._keyframes = np.flatnonzero(self.index["kind"] == KIND_KEYFRAME)
+        h, w = self.shape
+        self._grid = np.full((h, w), -1, dtype=np.int8)
+        self._value = np.zeros((h, w), dtype=np.float32)
+        self._conf = np.zeros((h, w), dtype=np.float32)
+        self._step = -1
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "EpisodeReplay":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _record_ok(self, offset: int) -> int | None:
+        """End offset of the record at `offset`, or None if it is cut off or corrupt."""
+        if offset + _RECORD.size > len(self._mm):
+            return None
+        length, _, crc, _ = _RECORD.unpack_from(self._mm, offset)
+        end = offset + _RECORD.size + length
+        if end > len(self._mm) or zlib.crc32(self._mm[offset + _RECORD.size:end]) != crc:
+            return None
+        return end
+
+    def _load_index(self, first: int) -> np.ndarray:
+        idx_path = EpisodeRecorder._index_path(self.path)
+        index = np.zeros(0, dtype=INDEX_DTYPE)
+        if idx_path.exists():
+            raw = idx_path.read_bytes()
+            index = np.frombuffer(raw[: len(raw) - len(raw) % INDEX_DTYPE.itemsize], dtype=INDEX_DTYPE)
+        # Trust the index up to its last entry whose record is intact, then scan the rest of the log.
+        offset = first
+        while len(index):
+            end = self._record_ok(int(index["offset"][-1]))
+            if end is not None:
+                offset = end
+                break
+            index = index[:-1]
+        extra = []
+        while (end := self._record_ok(offset)) is not None:
+            _, step, _, kind = _RECORD.unpack_from(self._mm, offset)
+            extra.append((step, kind, offset))
+            offset = end
+        if extra:
+            index = np.concatenate([index, np.array(extra, dtype=INDEX_DTYPE)])
+        return np.ascontiguousarray(index)
+
+    def _payload(self, i: int) -> bytes:
+        offset = int(self.index["offset"][i])
+        length = _RECORD.unpack_from(self._mm, offset)[0]
+        return zlib.decompress(self._mm[offset + _RECORD.size:offset + _RECORD.size + length])
+
+    def _apply(self, i: int) -> tuple[np.ndarray, dict]:
+        """Write record `i`'s windows into the working maps; returns its frontiers and extra."""
+        buf = self._payload(i)
+        o = 0
+        (n,) = _COUNT.unpack_from(buf, o)
+        o += 4
+        for _ in range(n):
+            r0, c0, r1, c1 = _BOX.unpack_from(buf, o)
+            o += _BOX.size
+            k = (r1 - r0) * (c1 - c0)
+            self._grid[r0:r1, c0:c1] = np.frombuffer(buf, dtype=np.int8, count=k, offset=o).reshape(r1 - r0, c1 - c0)
+            o += k
+        (n,) = _COUNT.unpack_from(buf, o)
+        o += 4
+        for _ in range(n):
+            r0, c0, r1, c1 = _BOX.unpack_from(buf, o)
+            o += _BOX.size
+            k = (r1 - r0) * (c1 - c0)
+            shape = (r1 - r0, c1 - c0)
+            self._value[r0:r1, c0:c1] = np.frombuffer(buf, dtype=np.float32, count=k, offset=o).reshape(shape)
+            self._conf[r0:r1, c0:c1] = np.frombuffer(buf, dtype=np.float32, count=k, offset=o + 4 * k).reshape(shape)
+            o += 8 * k
+        return self._tail(buf, o)
+
+    @staticmethod
+    def _tail(buf: bytes, o: int) -> tuple[np.ndarray, dict]:
+        (n,) = _COUNT.unpack_from(buf, o)
+        o += 4
+        frontiers = np.frombuffer(buf, dtype=FRONTIER_DTYPE, count=n, offset=o).copy()
+        o += n * FRONTIER_DTYPE.itemsize
+        (n,) = _COUNT.unpack_from(buf, o)
+        extra = json.loads(buf[o + 4:o + 4 + n].decode("utf-8")) if n else {}
+        return frontiers, extra
+
+    def state_at(self, step: int, copy: bool = True) -> EpisodeState:
+        """Maps, frontiers and extra as they were logged at `step` (negative counts from the end).
+
+        With ``copy=False`` the arrays are the replayer's working buffers,
+        valid until the next `state_at` call.
+        """
+        n = len(self.index)
+        if step < 0:
+            step += n
+        if not 0 <= step < n:
+            raise IndexError(f"step {step} outside 0..{n - 1}")
+        k = int(self._keyframes[np.searchsorted(self._keyframes, step, side="right") - 1])
+        start = self._step + 1 if k <= self._step <= step else k
+        frontiers, extra = None, None
+        for i in range(start, step + 1):
+            frontiers, extra = self._apply(i)
+        if frontiers is None:
+            # Already at `step`: only its frontiers and extra are needed.
+            frontiers, extra = self.record_info(step)
+        self._step = step
+        grid, value, conf = self._grid, self._value, self._conf
+        if copy:
+            grid, value, conf = grid.copy(), value.copy(), conf.copy()
+        return EpisodeState(step, grid, value, conf, frontiers, extra)
+
+    def record_info(self, step: int) -> tuple[np.ndarray, dict]:
+        """Frontiers and extra of one step, without touching the maps."""
+        buf = self._payload(step)
+        o = 4
+        (n,) = _COUNT.unpack_from(buf, 0)
+        for _ in range(n):
+            r0, c0, r1, c1 = _BOX.unpack_from(buf, o)
+            o += _BOX.size + (r1 - r0) * (c1 - c0)
+        (n,) = _COUNT.unpack_from(buf, o)
+        o += 4
+        for _ in range(n):
+            r0, c0, r1, c1 = _BOX.unpack_from(buf, o)
+            o += _BOX.size + 8 * (r1 - r0) * (c1 - c0)
+        return self._tail(buf, o)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 
 # Convention:
@@ -8,6 +8,18 @@ import numpy as np
 #    0 = free
 #    1 = occupied
 
+# Half-open cell box (r0, c0, r1, c1).
+Box = tuple[int, int, int, int]
+
+def expand_box(box: Box, halo: int, shape: tuple[int, int]) -> Box:
+    """Grow `box` by `halo` cells on every side, clipped to `shape`."""
+    r0, c0, r1, c1 = box
+    h, w = shape
+    return (max(0, r0 - halo), max(0, c0 - halo), min(h, r1 + halo), min(w, c1 + halo))
+
+# How many dirty boxes a grid remembers; older consumers fall back to a full refresh.
+MAX_DIRTY_LOG = 256
+
 @dataclass
 class OccupancyGrid:
     """Simple 2D occupancy grid.
@@ -16,10 +28,18 @@ class OccupancyGrid:
         grid: int8 array of shape (H, W) with values in {-1,0,1}.
         resolution: meters per cell.
         origin_xy: world (x,y) of grid cell (0,0) lower-left corner.
+        version: incremented on every write made through the update API
+            (`update_region`, `set_cells`, `mark_dirty`).
+
+    Writes made through the update API are logged as dirty boxes so that
+    consumers can refresh only what changed (see `dirty_since`). Direct writes
+    to `grid` are not tracked unless followed by `mark_dirty`.
     """
     grid: np.ndarray
     resolution: float = 0.05
     origin_xy: tuple[float, float] = (0.0, 0.0)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    _dirty_log: list[tuple[int, Box]] = field(default_factory=list, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not isinstance(self.grid, np.ndarray):
@@ -56,3 +76,58 @@ class OccupancyGrid:
         x = ox + (c + 0.5) * self.resolution
         y = oy + (r + 0.5) * self.resolution
         return (x, y)
+
+    def cell_rc(self, x: np.ndarray | float, y: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        """Cell (row, col) containing world (x,y); the inverse of `world_xy`. Accepts arrays."""
+        ox, oy = self.origin_xy
+        rows = np.floor((np.asarray(y) - oy) / self.resolution).astype(np.int64)
+        cols = np.floor((np.asarray(x) - ox) / self.resolution).astype(np.int64)
+        return rows, cols
+
+    def mark_dirty(self, r0: int, c0: int, r1: int, c1: int) -> None:
+        """Record that cells in the half-open box [r0:r1, c0:c1] may have changed."""
+        h, w = self.grid.shape
+        r0, c0 = max(0, int(r0)), max(0, int(c0))
+        r1, c1 = min(h, int(r1)), min(w, int(c1))
+        if r0 >= r1 or c0 >= c1:
+            return
+        self.version += 1
+        self._dirty_log.append((self.version, (r0, c0, r1, c1)))
+        if len(self._dirty_log) > MAX_DIRTY_LOG:
+            del self._dirty_log[: len(self._dirty_log) - MAX_DIRTY_LOG]
+
+    def update_region(self, r0: int, c0: int, patch: np.ndarray) -> None:
+        """Write `patch` with its top-left corner at (r0,c0), clipped to the grid."""
+        patch = np.asarray(patch)
+        if patch.ndim != 2:
+            raise ValueError("patch must be 2D")
+        h, w = self.grid.shape
+        ph, pw = patch.shape
+        rr0, cc0 = max(0, r0), max(0, c0)
+        rr1, cc1 = min(h, r0 + ph), min(w, c0 + pw)
+        if rr0 >= rr1 or cc0 >= cc1:
+            return
+        self.grid[rr0:rr1, cc0:cc1] = patch[rr0 - r0:rr1 - r0, cc0 - c0:cc1 - c0]
+        self.mark_dirty(rr0, cc0, rr1, cc1)
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray | int) -> None:
+        """Scatter `values` into cells (rows[i], cols[i]); indices must be in bounds."""
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        if rows.size == 0:
+            return
+        self.grid[rows, cols] = values
+        self.mark_dirty(int(rows.min()), int(cols.min()), int(rows.max()) + 1, int(cols.max()) + 1)
+
+    def dirty_since(self, version: int) -> list[Box]:
+        """Boxes written after `version`.
+
+        Returns the whole grid as a single box when the log no longer reaches
+        back to `version`.
+        """
+        if version >= self.version:
+            return []
+        if not self._dirty_log or self._dirty_log[0][0] > version + 1:
+            h, w = self.grid.shape
+            return [(0, 0, h, w)]
+        return [box for v, box in self._dirty_log if v > version]
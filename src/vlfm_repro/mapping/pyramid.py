@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid
+from vlfm_repro.vlm.value_map import VALUE_TILE, ValueMap
+
+
+@dataclass
+class PyramidLevel:
+    """Block summaries of the full-resolution maps; block (i,j) covers
+    cells [i*scale:(i+1)*scale, j*scale:(j+1)*scale] (clipped at the border)."""
+    scale: int
+    any_unknown: np.ndarray   # bool (h,w)
+    any_free: np.ndarray      # bool (h,w)
+    any_occupied: np.ndarray  # bool (h,w)
+    value_max: np.ndarray     # float32 (h,w)
+    value_sum: np.ndarray     # float64 (h,w)
+    count: np.ndarray         # int64 (h,w), cells per block
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.any_unknown.shape
+
+    @property
+    def value_mean(self) -> np.ndarray:
+        return self.value_sum / np.maximum(self.count, 1)
+
+
+def _block_reduce(a: np.ndarray, f: int, op: np.ufunc, fill) -> np.ndarray:
+    """Reduce non-overlapping f x f blocks of `a` with `op`, padding with `fill`."""
+    h, w = a.shape
+    hb, wb = -(-h // f), -(-w // f)
+    if (hb * f, wb * f) != (h, w):
+        padded = np.full((hb * f, wb * f), fill, dtype=a.dtype)
+        padded[:h, :w] = a
+        a = padded
+    return op.reduce(op.reduce(a.reshape(hb, f, wb, f), axis=3), axis=1)
+
+
+_FIELDS = (
+    ("any_unknown", np.logical_or, False),
+    ("any_free", np.logical_or, False),
+    ("any_occupied", np.logical_or, False),
+    ("value_max", np.maximum, -np.inf),
+    ("value_sum", np.add, 0.0),
+    ("count", np.add, 0),
+)
+
+
+class MapPyramid:
+    """Coarse summaries of an `OccupancyGrid` (and optionally a `ValueMap`).
+
+    Level k (1-based) reduces `factor**k` x `factor**k` blocks to whether they
+    hold any unknown/free/occupied cell and to the max and mean value. Each
+    level is built from the one below it. `refresh()` only rebuilds blocks
+    under the grid's dirty boxes and the value map's changed tiles.
+    """
+
+    def __init__(self, og: OccupancyGrid, vm: ValueMap | None = None, levels: int = 3, factor: int = 4) -> None:
+        if levels < 1 or factor < 2:
+            raise ValueError("need levels >= 1 and factor >= 2")
+        self.og = og
+        self.vm = vm
+        self.factor = factor
+        h, w = og.shape
+        self.levels: list[PyramidLevel] = []
+        for k in range(1, levels + 1):
+            s = factor ** k
+            shape = (-(-h // s), -(-w // s))
+            self.levels.append(PyramidLevel(
+                scale=s,
+                any_unknown=np.zeros(shape, dtype=bool),
+                any_free=np.zeros(shape, dtype=bool),
+                any_occupied=np.zeros(shape, dtype=bool),
+                value_max=np.zeros(shape, dtype=np.float32),
+                value_sum=np.zeros(shape, dtype=np.float64),
+                count=np.zeros(shape, dtype=np.int64),
+            ))
+        self._og_version = og.version
+        self._vm_version = vm.version if vm is not None else 0
+        self._rebuild((0, 0, h, w))
+
+    def level(self, k: int) -> PyramidLevel:
+        """Level k >= 1 (scale ``factor**k``)."""
+        return self.levels[k - 1]
+
+    def refresh(self) -> list[Box]:
+        """Rebuild blocks touched since the last refresh; returns the cell boxes rebuilt."""
+        top = self.levels[-1]
+        s = top.scale
+        stale = np.zeros(top.shape, dtype=bool)
+        for r0, c0, r1, c1 in self.og.dirty_since(self._og_version):
+            stale[r0 // s:(r1 - 1) // s + 1, c0 // s:(c1 - 1) // s + 1] = True
+        self._og_version = self.og.version
+        if self.vm is not None:
+            t = VALUE_TILE
+            for tr, tc in np.argwhere(self.vm.changed_tiles(self._vm_version)):
+                stale[tr * t // s:((tr + 1) * t - 1) // s + 1, tc * t // s:((tc + 1) * t - 1) // s + 1] = True
+            self._vm_version = self.vm.version
+
+        h, w = self.og.shape
+        boxes = []
+        for i in np.flatnonzero(stale.any(axis=1)):
+            cols = np.flatnonzero(stale[i])
+            # One box per run of consecutive stale blocks in this block row.
+            breaks = np.flatnonzero(np.diff(cols) > 1)
+            for a, b in zip(np.r_[0, breaks + 1], np.r_[breaks, cols.size - 1]):
+                box = (int(i) * s, int(cols[a]) * s, min(h, (int(i) + 1) * s), min(w, (int(cols[b]) + 1) * s))
+                self._rebuild(box)
+                boxes.append(box)
+        return boxes
+
+    def _rebuild(self, box: Box) -> None:
+        # `box` starts on a top-level block corner, so it nests at every level.
+        r0, c0, r1, c1 = box
+        g = self.og.grid[r0:r1, c0:c1]
+        if self.vm is not None:
+            value = self.vm.value[r0:r1, c0:c1]
+        else:
+            value = np.zeros(g.shape, dtype=np.float32)
+        src = {
+            "any_unknown": g == -1,
+            "any_free": g == 0,
+            "any_occupied": g == 1,
+            "value_max": value,
+            "value_sum": value.astype(np.float64),
+            "count": np.ones(g.shape, dtype=np.int64),
+        }
+        f = self.factor
+        for lvl in self.levels:
+            s = lvl.scale
+            window = (slice(r0 // s, -(-r1 // s)), slice(c0 // s, -(-c1 // s)))
+            for name, op, fill in _FIELDS:
+                src[name] = _block_reduce(src[name], f, op, fill)
+                getattr(lvl, name)[window] = src[name]
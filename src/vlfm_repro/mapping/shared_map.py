@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+# Lock-free publishing of map state to other processes.
+#
+# One shared-memory block holds a control word array, one header per slot
+# and `slots` copies of the map arrays. The writer fills the slot after the
+# latest one under a seqlock (slot sequence odd while writing), then bumps
+# the published version. Readers take read-only views of the latest slot
+# without copying or locking and check afterwards with `MapFrame.valid()`
+# that the writer has not started to reuse it; with three slots a reader
+# has two full publish periods before that can happen.
+#
+# Correctness relies on aligned 8-byte stores being atomic and seen in
+# program order by other processes, which holds on x86-64.
+
+from dataclasses import dataclass
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid
+from vlfm_repro.vlm.value_map import VALUE_TILE, ValueMap
+
+SHARED_MAP_MAGIC = 0x564C464D_53484D31  # "VLFMSHM1"
+_ALIGN = 64
+_PAGE = 4096
+# Control words: magic, slots, h, w, has_value, latest version.
+_CTRL_WORDS = 8
+# Per-slot header words: seq, version, publish time (ns), changed box r0, c0, r1, c1.
+_SLOT_WORDS = 8
+
+
+def _round_up(n: int, k: int) -> int:
+    return -(-n // k) * k
+
+
+def _layout(h: int, w: int, slots: int, has_value: bool) -> tuple[int, int, int, int]:
+    """(data offset, slot stride, value offset in slot, total size) in bytes."""
+    data = _round_up(8 * (_CTRL_WORDS + slots * _SLOT_WORDS), _PAGE)
+    value_off = _round_up(h * w, _ALIGN)
+    stride = _round_up(value_off + (8 * h * w if has_value else 0), _PAGE)
+    return data, stride, value_off, data + slots * stride
+
+
+# Before Python 3.13 every process that attaches a block registers it with
+# its resource tracker, which unlinks it when that process exits. The block
+# is therefore kept out of the trackers and the publisher unlinks it itself.
+_TRACK_ARG = sys.version_info >= (3, 13)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if _TRACK_ARG:
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _union(a: Box | None, b: Box | None) -> Box | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _tile_box(tiles: np.ndarray, shape: tuple[int, int]) -> Box | None:
+    """Cell box covering the True tiles of a `ValueMap.changed_tiles` mask."""
+    rows = np.flatnonzero(tiles.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(tiles.any(axis=0))
+    t = VALUE_TILE
+    return (int(rows[0]) * t, int(cols[0]) * t, min(shape[0], (int(rows[-1]) + 1) * t), min(shape[1], (int(cols[-1]) + 1) * t))
+
+
+class _Block:
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        self.shm = shm
+        self.ctrl = np.ndarray((_CTRL_WORDS,), dtype=np.uint64, buffer=shm.buf)
+        if int(self.ctrl[0]) != SHARED_MAP_MAGIC:
+            raise ValueError(f"shared memory block {shm.name!r} is not a shared map")
+        self.slots, h, w, has_value = (int(v) for v in self.ctrl[1:5])
+        self.shape = (h, w)
+        self.has_value = bool(has_value)
+        self.headers = np.ndarray((self.slots, _SLOT_WORDS), dtype=np.uint64, buffer=shm.buf, offset=8 * _CTRL_WORDS)
+        data, stride, value_off, _ = _layout(h, w, self.slots, self.has_value)
+        self.grids, self.values, self.confs = [], [], []
+        for k in range(self.slots):
+            base = data + k * stride
+            self.grids.append(np.ndarray((h, w), dtype=np.int8, buffer=shm.buf, offset=base))
+            if self.has_value:
+                self.values.append(np.ndarray((h, w), dtype=np.float32, buffer=shm.buf, offset=base + value_off))
+                self.confs.append(np.ndarray((h, w), dtype=np.float32, buffer=shm.buf, offset=base + value_off + 4 * h * w))
+
+    def release(self) -> None:
+        del self.ctrl, self.headers, self.grids, self.values, self.confs
+        self.shm.close()
+
+
+class MapPublisher:
+    """Writer side: `publish(og, vm)` makes the current maps visible to every `MapSubscriber`.
+
+    Only regions changed since a slot was last written are copied into it,
+    using the grid's dirty log and the value map's tile versions, so direct
+    array writes must be followed by `mark_dirty` (or use ``full=True``).
+    """
+
+    def __init__(self, shape: tuple[int, int], with_value: bool = True, slots: int = 3, name: str | None = None) -> None:
+        if slots < 2:
+            raise ValueError("need at least 2 slots")
+        h, w = shape
+        size = _layout(h, w, slots, with_value)[3]
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        if not _TRACK_ARG:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        ctrl = np.ndarray((_CTRL_WORDS,), dtype=np.uint64, buffer=shm.buf)
+        ctrl[:] = (SHARED_MAP_MAGIC, slots, h, w, int(with_value), 0, 0, 0)
+        del ctrl
+        self._block = _Block(shm)
+        self.version = 0
+        # Per slot: (grid object, grid version, value map object, value version) it holds.
+        self._held: list[tuple | None] = [None] * slots
+        self._last: tuple | None = None
+
+    @property
+    def name(self) -> str:
+        return self._block.shm.name
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._block.shape
+
+    def publish(self, og: OccupancyGrid, vm: ValueMap | None = None, full: bool = False) -> int:
+        """Publish a new version; returns its number (starting at 1)."""
+        b = self._block
+        if og.shape != b.shape:
+            raise ValueError(f"grid shape {og.shape} does not match the shared map {b.shape}")
+        if b.has_value and vm is None:
+            raise ValueError("this shared map carries a value map; pass `vm`")
+        version = self.version + 1
+        slot = version % b.slots
+        hdr = b.headers[slot]
+        state = (og, og.version, vm, vm.version if vm is not None else 0)
+
+        hdr[0] += np.uint64(1)  # odd: being written
+        self._copy_into(slot, og, vm, self._held[slot], full)
+        changed = self._changed_since(self._last, state)
+        hdr[1] = version
+        hdr[2] = time.time_ns()
+        hdr[3:7] = changed if changed is not None else (0, 0, 0, 0)
+        hdr[0] += np.uint64(1)  # even: stable
+        b.ctrl[5] = version
+
+        self._held[slot] = state
+        self._last = state
+        self.version = version
+        return version
+
+    def _changed_since(self, held: tuple | None, state: tuple) -> Box | None:
+        og, _, vm, _ = state
+        h, w = og.shape
+        if held is None or held[0] is not og or held[2] is not vm:
+            return (0, 0, h, w)
+        box = None
+        for gb in og.dirty_since(held[1]):
+            box = _union(box, gb)
+        if vm is not None:
+            box = _union(box, _tile_box(vm.changed_tiles(held[3]), (h, w)))
+        return box
+
+    def _copy_into(self, slot: int, og: OccupancyGrid, vm: ValueMap | None, held: tuple | None, full: bool) -> None:
+        b = self._block
+        h, w = og.shape
+        if full or held is None or held[0] is not og or held[2] is not vm:
+            grid_boxes = value_boxes = [(0, 0, h, w)]
+        else:
+            grid_boxes = og.dirty_since(held[1])
+            value_boxes = vm.changed_boxes(held[3]) if vm is not None else []
+        for r0, c0, r1, c1 in grid_boxes:
+            b.grids[slot][r0:r1, c0:c1] = og.grid[r0:r1, c0:c1]
+        if b.has_value:
+            for r0, c0, r1, c1 in value_boxes:
+                b.values[slot][r0:r1, c0:c1] = vm.value[r0:r1, c0:c1]
+                b.confs[slot][r0:r1, c0:c1] = vm.conf[r0:r1, c0:c1]
+
+    def close(self, unlink: bool = True) -> None:
+        shm = self._block.shm
+        self._block.release()
+        if unlink:
+            if not _TRACK_ARG:
+                # `unlink` unregisters; register first so the tracker stays balanced.
+                resource_tracker.register(shm._name, "shared_memory")
+            shm.unlink()
+
+    def __enter__(self) -> "MapPublisher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class MapFrame:
+    """Zero-copy, read-only views of one published version.
+
+    The views stay consistent only while `valid()` is True; check it after
+    using them and read again if it turned False.
+    """
+    version: int
+    grid: np.ndarray
+    value: np.ndarray | None
+    conf: np.ndarray | None
+    changed_box: Box | None     # cells changed since the previous version (None: nothing)
+    published_ns: int
+    _header: np.ndarray
+    _seq: int
+
+    def valid(self) -> bool:
+        return int(self._header[0]) == self._seq
+
+
+class MapSubscriber:
+    """Reader side: attach to a `MapPublisher` block by name, from any process."""
+
+    def __init__(self, name: str) -> None:
+        self._block = _Block(_attach(name))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._block.shape
+
+    @property
+    def version(self) -> int:
+        """Latest published version (0 before the first publish)."""
+        return int(self._block.ctrl[5])
+
+    def latest(self) -> MapFrame | None:
+        """Views of the latest version, or None if nothing was published yet. Never blocks."""
+        b = self._block
+        while True:
+            version = int(b.ctrl[5])
+            if version == 0:
+                return None
+            slot = version % b.slots
+            hdr = b.headers[slot]
+            seq = int(hdr[0])
+            if seq & 1 or int(hdr[1]) != version:
+                continue  # The writer lapped this reader; the newer version is ready shortly.
+            r0, c0, r1, c1 = (int(v) for v in hdr[3:7])
+            frame = MapFrame(
+                version=version,
+                grid=b.grids[slot].view(),
+                value=b.values[slot].view() if b.has_value else None,
+                conf=b.confs[slot].view() if b.has_value else None,
+                changed_box=(r0, c0, r1, c1) if r1 > r0 else None,
+                published_ns=int(hdr[2]),
+                _header=hdr,
+                _seq=seq,
+            )
+            if not frame.valid():
+                continue
+            for a in (frame.grid, frame.value, frame.conf):
+                if a is not None:
+                    a.flags.writeable = False
+            return frame
+
+    def read(self) -> MapFrame | None:
+        """Consistent private copies of the latest version (retries if the writer overtakes the copy)."""
+        while True:
+            frame = self.latest()
+            if frame is None:
+                return None
+            grid = frame.grid.copy()
+            value = frame.value.copy() if frame.value is not None else None
+            conf = frame.conf.copy() if frame.conf is not None else None
+            if frame.valid():
+                frame.grid, frame.value, frame.conf = grid, value, conf
+                return frame
+
+    def wait(self, after: int, timeout: float | None = None) -> int | None:
+        """Block until a version newer than `after` is published; returns it, or None on timeout.
+
+        Polls the version word with exponential backoff from 50 us to 5 ms.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 5e-5
+        while True:
+            v = self.version
+            if v > after:
+                return v
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(delay)
+            delay = min(2 * delay, 5e-3)
+
+    def close(self) -> None:
+        """Detach; frames taken with `latest` must be dropped first."""
+        self._block.release()
+
+    def __enter__(self) -> "MapSubscriber":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import struct
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.vlm.multi_value_map import MultiValueMap
+from vlfm_repro.vlm.value_map import ValueMap
+
+# Layout: magic | u32 format version | u32 header length | JSON header,
+# then each array's raw C-order bytes starting on a page boundary.
+SNAPSHOT_MAGIC = b"VLFMSNAP"
+FORMAT_VERSION = 1
+PAGE_SIZE = 4096
+_PREFIX = struct.Struct("<8sII")
+
+
+@dataclass
+class MapSnapshot:
+    og: OccupancyGrid
+    vm: ValueMap | MultiValueMap | None = None
+    meta: dict = field(default_factory=dict)
+
+
+def pack_occupancy(grid: np.ndarray) -> np.ndarray:
+    """Pack -1/0/1 cells into 2 bits each (4 cells per byte, row-major)."""
+    codes = (np.asarray(grid, dtype=np.int8).ravel() + 1).astype(np.uint8)
+    codes = np.concatenate([codes, np.zeros(-codes.size % 4, dtype=np.uint8)]).reshape(-1, 4)
+    return codes[:, 0] | (codes[:, 1] << 2) | (codes[:, 2] << 4) | (codes[:, 3] << 6)
+
+
+def unpack_occupancy(packed: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Inverse of `pack_occupancy`."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    codes = np.stack([(packed >> s) & 0b11 for s in (0, 2, 4, 6)], axis=1).ravel()
+    return (codes[: shape[0] * shape[1]].astype(np.int8) - 1).reshape(shape)
+
+
+def save_snapshot(
+    path: str | Path,
+    og: OccupancyGrid,
+    vm: ValueMap | MultiValueMap | None = None,
+    meta: dict | None = None,
+    pack: bool = False,
+) -> int:
+    """Write grid (+ value map) state to `path`; returns the file size in bytes.
+
+    The header, padding and every array go out in one vectored write to a
+    temporary file that then replaces `path`, so readers never see a
+    partial snapshot. `pack=True` stores occupancy at 2 bits per cell for
+    archival; such grids are unpacked (copied) on load.
+    """
+    arrays: dict[str, np.ndarray] = {"occupancy": pack_occupancy(og.grid) if pack else og.grid}
+    if vm is not None:
+        arrays["value"] = vm.value
+        arrays["conf"] = vm.conf
+    arrays = {k: np.ascontiguousarray(a) for k, a in arrays.items()}
+
+    header = {
+        "resolution": float(og.resolution),
+        "origin_xy": [float(v) for v in og.origin_xy],
+        "shape": list(og.shape),
+        "occupancy_packing": "2bit" if pack else None,
+        "prompts": list(vm.prompts) if isinstance(vm, MultiValueMap) else None,
+        "meta": meta or {},
+        "arrays": {},
+    }
+    # Offsets depend on the header length, which depends on the offsets;
+    # reserving whole pages for the header breaks the cycle.
+    header_pages = 1
+    while True:
+        offset = header_pages * PAGE_SIZE
+        for name, a in arrays.items():
+            header["arrays"][name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset += -(-a.nbytes // PAGE_SIZE) * PAGE_SIZE
+        blob = json.dumps(header, sort_keys=True).encode("utf-8")
+        if _PREFIX.size + len(blob) <= header_pages * PAGE_SIZE:
+            break
+        header_pages += 1
+
+    buffers: list = [_PREFIX.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, len(blob)), blob]
+    pos = _PREFIX.size + len(blob)
+    for name, a in arrays.items():
+        start = header["arrays"][name]["offset"]
+        buffers.append(bytes(start - pos))
+        buffers.append(memoryview(a).cast("B"))
+        pos = start + a.nbytes
+    buffers.append(bytes(-pos % PAGE_SIZE))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        total = _write_all(fd, [memoryview(b).cast("B") for b in buffers])
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    return total
+
+
+def _write_all(fd: int, views: list[memoryview]) -> int:
+    """One `writev` call for all buffers; loops only if the OS writes short."""
+    done = 0
+    while views:
+        n = os.writev(fd, views) if hasattr(os, "writev") else os.write(fd, views[0])
+        done += n
+        while views and n >= len(views[0]):
+            n -= len(views[0])
+            views.pop(0)
+        if views:
+            views[0] = views[0][n:]
+    return done
+
+
+def read_header(path: str | Path) -> dict:
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path}: not a map snapshot")
+        magic, version, length = _PREFIX.unpack(prefix)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path}: not a map snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {version} (expected {FORMAT_VERSION})")
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def load_snapshot(path: str | Path, mode: str = "r") -> MapSnapshot:
+    """Open a snapshot with every array memory-mapped, without copying.
+
+    `mode` is passed to `np.memmap`: "r" (read-only, shareable between
+    processes), "c" (copy-on-write, private edits) or "r+" (edits go to
+    the file).
+    """
+    header = read_header(path)
+
+    def array(name: str) -> np.ndarray:
+        spec = header["arrays"][name]
+        return np.memmap(path, dtype=np.dtype(spec["dtype"]), mode=mode, offset=spec["offset"], shape=tuple(spec["shape"]))
+
+    shape = tuple(header["shape"])
+    occ = array("occupancy")
+    if header["occupancy_packing"] == "2bit":
+        occ = unpack_occupancy(occ, shape)
+    og = OccupancyGrid(grid=occ, resolution=header["resolution"], origin_xy=tuple(header["origin_xy"]))
+
+    vm = None
+    if "value" in header["arrays"]:
+        value, conf = array("value"), array("conf")
+        if header["prompts"] is not None:
+            vm = MultiValueMap(value=value, conf=conf, prompts=tuple(header["prompts"]))
+        else:
+            vm = ValueMap(value=value, conf=conf)
+    return MapSnapshot(og=og, vm=vm, meta=header["meta"])
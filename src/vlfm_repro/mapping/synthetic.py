@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+# Synthetic occupancy grids shared by the benchmark scripts.
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+
+def make_explored_grid(h: int, w: int, seed: int = 0) -> OccupancyGrid:
+    """Unknown map with a few explored rectangular rooms and wall segments."""
+    rng = np.random.default_rng(seed)
+    grid = -1 * np.ones((h, w), dtype=np.int8)
+    for _ in range(max(4, (h * w) // 40000)):
+        rh, rw = int(rng.integers(h // 10 + 2, h // 3 + 3)), int(rng.integers(w // 10 + 2, w // 3 + 3))
+        r0, c0 = int(rng.integers(0, h - rh)), int(rng.integers(0, w - rw))
+        grid[r0:r0 + rh, c0:c0 + rw] = 0
+        grid[r0 + rh // 2, c0:c0 + rw // 2] = 1
+    return OccupancyGrid(grid=grid)
+
+
+def make_office_grid(n: int, seed: int = 0) -> OccupancyGrid:
+    """Free square map with a lattice of walls that have door gaps."""
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((n, n), dtype=np.int8)
+    step = max(20, n // 10)
+    walls = list(range(step, n, step))
+    for k in walls:
+        grid[k, :] = 1
+        grid[:, k] = 1
+    # One door per wall segment between crossings keeps every room connected.
+    bounds = [0] + walls + [n]
+    for k in walls:
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            door = int(rng.integers(lo + 2, max(lo + 3, hi - 14)))
+            grid[k, door:door + 12] = 0
+            grid[door:door + 12, k] = 0
+    return OccupancyGrid(grid=grid, resolution=0.05)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import (
+    _cluster_sort_key,
+    _frontier_mask_array,
+    _make_cluster,
+)
+from vlfm_repro.frontier.labeling import label_components, mask_components
+from vlfm_repro.mapping.pyramid import MapPyramid
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+from vlfm_repro.nav.window_scoring import ValueWindowIndex
+
+
+def _dilate8(mask: np.ndarray) -> np.ndarray:
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1] + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    h, w = mask.shape
+    out = np.zeros_like(mask)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            out |= padded[dr:dr + h, dc:dc + w]
+    return out
+
+
+def frontier_regions(pyramid: MapPyramid, level: int) -> tuple[np.ndarray, int]:
+    """8-connected regions of blocks that may hold frontier cells, as (labels, count).
+
+    A block qualifies if it has a free cell and it or a neighboring block
+    has an unknown cell. That is a superset of the blocks holding frontier
+    cells, and every frontier cluster lies inside a single region.
+    """
+    lvl = pyramid.level(level)
+    candidate = lvl.any_free & _dilate8(lvl.any_unknown)
+    return label_components(candidate, connectivity=8)
+
+
+def coarse_to_fine_frontiers(
+    pyramid: MapPyramid,
+    top_k: int = 5,
+    level: int | None = None,
+    radius_cells: int = 3,
+    mode: str = "mean",
+    connectivity: int = 4,
+    cluster_connectivity: int = 8,
+    min_cluster_size: int = 5,
+    max_regions: int | None = None,
+) -> list[RankedFrontier]:
+    """Top-k frontier clusters, found on a coarse level and refined locally.
+
+    Frontier regions are found at `level` (default: the coarsest) and
+    visited in order of an upper bound on any cluster score inside them: the
+    largest block `value_max` around the region. Each visited region is
+    refined at full resolution: frontier mask, clustering and window scores
+    restricted to that region. The search stops once k clusters score at
+    least the next region's bound, so the scores equal the top k of
+    `rank_frontiers` over all clusters; among clusters tied with the k-th
+    score, a different one may be returned.
+
+    `max_regions` caps how many regions are refined. That is faster but no
+    longer exact; the benchmark in `scripts/bench_coarse_to_fine.py`
+    measures the ranking loss.
+    """
+    if pyramid.vm is None:
+        raise ValueError("coarse-to-fine ranking needs a pyramid over a ValueMap")
+    pyramid.refresh()
+    level = len(pyramid.levels) if level is None else level
+    lvl = pyramid.level(level)
+    s = lvl.scale
+    labels, k = frontier_regions(pyramid, level)
+    if k == 0:
+        return []
+
+    # Block bounding box of every region.
+    br, bc = np.nonzero(labels)
+    lab = labels[br, bc] - 1
+    rmin = np.full(k, br.max(), dtype=np.int64)
+    cmin = np.full(k, bc.max(), dtype=np.int64)
+    np.minimum.at(rmin, lab, br)
+    np.minimum.at(cmin, lab, bc)
+    rmax = np.zeros(k, dtype=np.int64)
+    cmax = np.zeros(k, dtype=np.int64)
+    np.maximum.at(rmax, lab, br)
+    np.maximum.at(cmax, lab, bc)
+
+    # Cluster centroids lie in the region's cell box, and their windows
+    # reach `radius_cells` further.
+    pad = -(-radius_cells // s)
+    bounds = np.array([
+        lvl.value_max[max(0, r0 - pad):r1 + 1 + pad, max(0, c0 - pad):c1 + 1 + pad].max()
+        for r0, c0, r1, c1 in zip(rmin, cmin, rmax, cmax)
+    ])
+    order = np.argsort(-bounds, kind="stable")
+    if max_regions is not None:
+        order = order[:max_regions]
+
+    og, vm = pyramid.og, pyramid.vm
+    h, w = og.shape
+    index = ValueWindowIndex(vm.value)
+    # Min-heap of the current top k, worst first; ties rank like `rank_frontiers`.
+    best: list[tuple] = []
+    for j in order:
+        if len(best) >= top_k and best[0][0] >= bounds[j]:
+            break
+        r0, c0 = int(rmin[j]) * s, int(cmin[j]) * s
+        r1, c1 = min(h, (int(rmax[j]) + 1) * s), min(w, (int(cmax[j]) + 1) * s)
+        # One cell of context so the border cells see their true neighbors.
+        er0, ec0, er1, ec1 = max(0, r0 - 1), max(0, c0 - 1), min(h, r1 + 1), min(w, c1 + 1)
+        fm = _frontier_mask_array(og.grid[er0:er1, ec0:ec1], connectivity, True)
+        fm = fm[r0 - er0:r1 - er0, c0 - ec0:c1 - ec0]
+        own = labels[rmin[j]:rmax[j] + 1, cmin[j]:cmax[j] + 1] == j + 1
+        fm &= np.repeat(np.repeat(own, s, axis=0), s, axis=1)[:r1 - r0, :c1 - c0]
+
+        comps = mask_components(fm, connectivity=cluster_connectivity, min_size=min_cluster_size, offset=(r0, c0))
+        clusters = [_make_cluster(og, comps.component(i), comps.centroids[i]) for i in range(len(comps))]
+        if not clusters:
+            continue
+        centers = np.array([cl.centroid_rc for cl in clusters], dtype=np.float64)
+        for cl, score in zip(clusters, index.scores(centers, radius_cells, mode)):
+            n, r, c = _cluster_sort_key(cl)
+            item = (float(score), -n, -r, -c, RankedFrontier(cluster=cl, score=float(score)))
+            if len(best) < top_k:
+                heapq.heappush(best, item)
+            elif item[:4] > best[0][:4]:
+                heapq.heapreplace(best, item)
+
+    ranked = [item[-1] for item in best]
+    ranked.sort(key=lambda rf: (-rf.score, _cluster_sort_key(rf.cluster)))
+    return ranked
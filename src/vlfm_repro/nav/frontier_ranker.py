@@ -5,11 +5,17 @@ import numpy as np
 
 from vlfm_repro.frontier.frontier_extractor import FrontierCluster
 from vlfm_repro.vlm.value_map import ValueMap
+from vlfm_repro.vlm.multi_value_map import MultiValueMap
+from vlfm_repro.nav.window_scoring import ValueWindowIndex
+from vlfm_repro.profiling import profiled
 
 @dataclass(frozen=True)
 class RankedFrontier:
     cluster: FrontierCluster
     score: float
+    path_cost: float | None = None   # meters, set by cost-aware ranking
+    utility: float | None = None     # ranking key of cost-aware ranking
+    frontier_id: int | None = None   # persistent id, set by `FrontierIdentityTracker`
 
 def score_cluster(
     value_map: ValueMap,
@@ -37,12 +43,92 @@ def score_cluster(
         return float(window.max())
     raise ValueError("mode must be 'mean' or 'max'")
 
+@profiled("nav.score_clusters", size=lambda value_map, clusters, *a, **k: len(clusters))
+def score_clusters(
+    value_map: ValueMap | MultiValueMap,
+    clusters: list[FrontierCluster],
+    radius_cells: int = 3,
+    mode: str = "mean",
+    index: ValueWindowIndex | None = None,
+) -> np.ndarray:
+    """Batched `score_cluster` for all clusters at once.
+
+    Uses an integral image for `mean` and a sliding-window max filter for
+    `max`, so each cluster costs O(1) after one pass over the map. Pass an
+    `index` built from `value_map.value` to reuse those tables across calls
+    while the value map is unchanged.
+
+    A `MultiValueMap` is scored for every prompt in the same pass and yields
+    a (K,N) array instead of (N,).
+    """
+    if index is None:
+        index = ValueWindowIndex(value_map.value)
+    centers = np.array([cl.centroid_rc for cl in clusters], dtype=np.float64).reshape(-1, 2)
+    return index.scores(centers, radius_cells, mode)
+
+@profiled("nav.rank_frontiers", size=lambda value_map, clusters, *a, **k: len(clusters))
 def rank_frontiers(
     value_map: ValueMap,
     clusters: list[FrontierCluster],
     radius_cells: int = 3,
     mode: str = "mean",
+    index: ValueWindowIndex | None = None,
 ) -> list[RankedFrontier]:
-    ranked = [RankedFrontier(cluster=cl, score=score_cluster(value_map, cl, radius_cells, mode)) for cl in clusters]
+    scores = score_clusters(value_map, clusters, radius_cells, mode, index=index)
+    ranked = [RankedFrontier(cluster=cl, score=float(s)) for cl, s in zip(clusters, scores)]
     ranked.sort(key=lambda rf: rf.score, reverse=True)
     return ranked
+
+def rank_frontiers_multi(
+    value_map: MultiValueMap,
+    clusters: list[FrontierCluster],
+    radius_cells: int = 3,
+    mode: str = "mean",
+    index: ValueWindowIndex | None = None,
+) -> dict[str, list[RankedFrontier]]:
+    """`rank_frontiers` for every prompt of a `MultiValueMap`, scored in one call."""
+    scores = score_clusters(value_map, clusters, radius_cells, mode, index=index)
+    out = {}
+    for prompt, row in zip(value_map.prompts, scores):
+        ranked = [RankedFrontier(cluster=cl, score=float(s)) for cl, s in zip(clusters, row)]
+        ranked.sort(key=lambda rf: rf.score, reverse=True)
+        out[prompt] = ranked
+    return out
+
+def cluster_path_costs(distance_field: np.ndarray, clusters: list[FrontierCluster]) -> np.ndarray:
+    """Cheapest distance-field value over each cluster's cells (inf if unreachable)."""
+    if not clusters:
+        return np.zeros(0, dtype=np.float64)
+    cells = [np.asarray(cl.cells, dtype=np.intp).reshape(-1, 2) for cl in clusters]
+    sizes = np.array([len(c) for c in cells])
+    allc = np.concatenate(cells)
+    vals = distance_field[allc[:, 0], allc[:, 1]].astype(np.float64)
+    starts = np.cumsum(sizes) - sizes
+    return np.minimum.reduceat(vals, starts)
+
+@profiled("nav.rank_frontiers_with_cost", size=lambda value_map, clusters, *a, **k: len(clusters))
+def rank_frontiers_with_cost(
+    value_map: ValueMap,
+    clusters: list[FrontierCluster],
+    distance_field: np.ndarray,
+    cost_weight: float = 0.1,
+    radius_cells: int = 3,
+    mode: str = "mean",
+    index: ValueWindowIndex | None = None,
+) -> list[RankedFrontier]:
+    """Rank by ``utility = score - cost_weight * path_cost``.
+
+    `distance_field` is one geodesic field per step (see
+    `vlfm_repro.nav.geodesic.geodesic_distance`), shared by all clusters. A
+    cluster's path cost is the distance to its nearest cell; clusters with no
+    reachable cell are dropped.
+    """
+    scores = score_clusters(value_map, clusters, radius_cells, mode, index=index)
+    costs = cluster_path_costs(distance_field, clusters)
+    ranked = [
+        RankedFrontier(cluster=cl, score=float(s), path_cost=float(d), utility=float(s - cost_weight * d))
+        for cl, s, d in zip(clusters, scores, costs)
+        if np.isfinite(d)
+    ]
+    ranked.sort(key=lambda rf: rf.utility, reverse=True)
+    return ranked
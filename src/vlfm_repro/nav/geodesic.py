@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+# Integer chamfer step costs: 7/5 approximates sqrt(2) to within 1%.
+ORTHO_COST = 5
+DIAG_COST = 7
+UNREACHABLE = np.iinfo(np.int32).max
+
+_STEPS_4 = ((-1, 0, ORTHO_COST), (1, 0, ORTHO_COST), (0, -1, ORTHO_COST), (0, 1, ORTHO_COST))
+_STEPS_8 = _STEPS_4 + ((-1, -1, DIAG_COST), (-1, 1, DIAG_COST), (1, -1, DIAG_COST), (1, 1, DIAG_COST))
+
+
+def chamfer_distance(
+    passable: np.ndarray,
+    sources: np.ndarray,
+    connectivity: int = 8,
+    max_cost: int | None = None,
+) -> np.ndarray:
+    """Multi-source shortest-path cost over passable cells, in chamfer units.
+
+    Dijkstra with small integer edge costs, run as a vectorized wavefront:
+    every cell whose tentative cost is below ``lowest + ORTHO_COST`` is final,
+    so that whole band is expanded in one set of array operations.
+
+    Args:
+        passable: bool (H,W); paths only step onto passable cells.
+        sources: (N,2) source cells or a bool (H,W) mask. Sources start at 0
+            whether or not they are passable.
+        connectivity: 4 or 8.
+        max_cost: stop expanding past this cost (cells beyond stay unreachable).
+
+    Returns:
+        int32 (H,W) costs with `UNREACHABLE` where no path exists. Divide by
+        `ORTHO_COST` to get cells.
+    """
+    h, w = passable.shape
+    ok = np.ascontiguousarray(passable, dtype=bool).ravel()
+    dist = np.full(h * w, UNREACHABLE, dtype=np.int32)
+
+    sources = np.asarray(sources)
+    if sources.dtype == bool:
+        front = np.flatnonzero(sources)
+    else:
+        src = sources.reshape(-1, 2).astype(np.int64)
+        front = np.unique(src[:, 0] * w + src[:, 1])
+    dist[front] = 0
+    propagate(dist, ok, front, (h, w), connectivity=connectivity, max_cost=max_cost)
+    return dist.reshape(h, w)
+
+
+def chamfer_steps(connectivity: int) -> tuple[tuple[int, int, int], ...]:
+    """(dr, dc, cost) moves for 4- or 8-connectivity."""
+    if connectivity == 4:
+        return _STEPS_4
+    if connectivity == 8:
+        return _STEPS_8
+    raise ValueError("connectivity must be 4 or 8")
+
+
+def propagate(
+    dist: np.ndarray,
+    ok: np.ndarray,
+    front: np.ndarray,
+    shape: tuple[int, int],
+    connectivity: int = 8,
+    max_cost: int | None = None,
+    stop_at: int | None = None,
+) -> np.ndarray:
+    """Relax flat `dist` in place outward from the unique flat indices `front`.
+
+    `dist` must already hold valid upper bounds everywhere (`UNREACHABLE` for
+    unknown costs) and `front` must contain every cell whose value may
+    improve a neighbor. Used both for fresh fields and for repairing a field
+    after local changes.
+
+    With `stop_at` (a flat index), expansion pauses as soon as that cell and
+    every cell cheaper than it are final. The unexpanded front is returned so
+    a later call can resume from it.
+    """
+    steps = chamfer_steps(connectivity)
+    h, w = shape
+    # `queued` marks cells in `front`; `stamp` dedupes new cells without sorting.
+    queued = np.zeros(h * w, dtype=bool)
+    queued[front] = True
+    stamp = np.empty(h * w, dtype=np.int64)
+    while front.size:
+        d = dist[front]
+        lo = d.min()
+        if stop_at is not None and lo > dist[stop_at]:
+            break
+        band = d < lo + ORTHO_COST
+        cur, front = front[band], front[~band]
+        queued[cur] = False
+        r, c = np.divmod(cur, w)
+        dcur = dist[cur]
+        grown = []
+        for dr, dc, cost in steps:
+            nd = dcur + cost
+            rr, cc = r + dr, c + dc
+            keep = (rr >= 0) & (rr < h) & (cc >= 0) & (cc < w)
+            if max_cost is not None:
+                keep &= nd <= max_cost
+            nb = rr[keep] * w + cc[keep]
+            nd = nd[keep]
+            better = ok[nb] & (nd < dist[nb])
+            nb, nd = nb[better], nd[better]
+            np.minimum.at(dist, nb, nd)
+            grown.append(nb[~queued[nb]])
+        new = np.concatenate(grown)
+        pos = np.arange(new.size)
+        stamp[new] = pos
+        new = new[stamp[new] == pos]
+        queued[new] = True
+        front = np.concatenate([front, new])
+    return front
+
+
+def geodesic_distance(
+    og: OccupancyGrid,
+    start_rc: tuple[int, int],
+    connectivity: int = 8,
+    allow_unknown: bool = False,
+    max_distance_m: float | None = None,
+) -> np.ndarray:
+    """Path length in meters from `start_rc` to every cell over free space.
+
+    One call per planning step serves every frontier; unreachable cells are
+    ``inf``. Unknown cells are only traversed when `allow_unknown` is set.
+    """
+    passable = og.grid == 0
+    if allow_unknown:
+        passable |= og.grid == -1
+    max_cost = None
+    if max_distance_m is not None:
+        max_cost = int(np.floor(max_distance_m / og.resolution * ORTHO_COST))
+    cost = chamfer_distance(passable, np.array([start_rc]), connectivity=connectivity, max_cost=max_cost)
+    out = cost.astype(np.float32) * np.float32(og.resolution / ORTHO_COST)
+    out[cost == UNREACHABLE] = np.inf
+    return out
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import heapq
+import math
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import Box, OccupancyGrid, expand_box
+from vlfm_repro.nav.geodesic import (
+    DIAG_COST,
+    ORTHO_COST,
+    UNREACHABLE,
+    chamfer_distance,
+    chamfer_steps,
+    propagate,
+)
+
+
+class InflationLayer:
+    """Traversable mask with occupied cells grown by the robot radius.
+
+    Cells within `robot_radius_m` (chamfer distance) of an occupied cell are
+    blocked. The mask is cached and `refresh()` only recomputes windows
+    around the grid's dirty boxes, so it is rebuilt only when the grid changes.
+    """
+
+    def __init__(self, og: OccupancyGrid, robot_radius_m: float = 0.0, allow_unknown: bool = False) -> None:
+        self.og = og
+        self.radius_cells = int(math.ceil(robot_radius_m / og.resolution - 1e-9))
+        self.allow_unknown = allow_unknown
+        self._version = og.version
+        h, w = og.shape
+        self.traversable = self._compute((0, 0, h, w))
+
+    def refresh(self) -> list[Box]:
+        """Recompute around grid changes; returns the windows that may have changed."""
+        boxes = self.og.dirty_since(self._version)
+        self._version = self.og.version
+        windows = [expand_box(b, self.radius_cells, self.og.shape) for b in boxes]
+        for r0, c0, r1, c1 in windows:
+            self.traversable[r0:r1, c0:c1] = self._compute((r0, c0, r1, c1))
+        return windows
+
+    def _compute(self, box: Box) -> np.ndarray:
+        r0, c0, r1, c1 = box
+        rad = self.radius_cells
+        # Obstacles up to `rad` cells outside the window still inflate into it.
+        cr0, cc0, cr1, cc1 = expand_box(box, rad, self.og.shape)
+        sub = self.og.grid[cr0:cr1, cc0:cc1]
+        passable = sub == 0
+        if self.allow_unknown:
+            passable |= sub == -1
+        if rad > 0:
+            clearance = chamfer_distance(
+                np.ones(sub.shape, dtype=bool),
+                sub == 1,
+                max_cost=rad * ORTHO_COST,
+            )
+            passable &= clearance > rad * ORTHO_COST
+        return passable[r0 - cr0:r1 - cr0, c0 - cc0:c1 - cc0]
+
+
+def _octile(dr: int, dc: int, connectivity: int) -> int:
+    dr, dc = abs(dr), abs(dc)
+    if connectivity == 4:
+        return ORTHO_COST * (dr + dc)
+    return DIAG_COST * min(dr, dc) + ORTHO_COST * abs(dr - dc)
+
+
+def astar(
+    traversable: np.ndarray,
+    start_rc: tuple[int, int],
+    goal_rc: tuple[int, int],
+    connectivity: int = 8,
+) -> list[tuple[int, int]] | None:
+    """Single-query A* with the chamfer step costs of `vlfm_repro.nav.geodesic`.
+
+    Start and goal may lie on non-traversable cells (e.g. inside the
+    inflation band); every other path cell is traversable. Returns the cell
+    path including both ends, or None when the goal is unreachable.
+    """
+    steps = chamfer_steps(connectivity)
+    h, w = traversable.shape
+    start = (int(start_rc[0]), int(start_rc[1]))
+    goal = (int(goal_rc[0]), int(goal_rc[1]))
+    g = {start: 0}
+    parent: dict[tuple[int, int], tuple[int, int]] = {}
+    heap = [(_octile(goal[0] - start[0], goal[1] - start[1], connectivity), 0, start)]
+    while heap:
+        _, d, cur = heapq.heappop(heap)
+        if cur == goal:
+            path = [cur]
+            while cur in parent:
+                cur = parent[cur]
+                path.append(cur)
+            return path[::-1]
+        if d > g[cur]:
+            continue
+        r, c = cur
+        for dr, dc, cost in steps:
+            rr, cc = r + dr, c + dc
+            if not (0 <= rr < h and 0 <= cc < w):
+                continue
+            nb = (rr, cc)
+            if nb != goal and not traversable[rr, cc]:
+                continue
+            nd = d + cost
+            if nd < g.get(nb, UNREACHABLE):
+                g[nb] = nd
+                parent[nb] = cur
+                heapq.heappush(heap, (nd + _octile(goal[0] - rr, goal[1] - cc, connectivity), nd, nb))
+    return None
+
+
+class IncrementalPlanner:
+    """Cost-to-goal field on the inflated grid, repaired in place after updates.
+
+    Like D* Lite, the planner keeps costs toward a fixed goal so the robot can
+    move freely and map updates only repair the part of the field they
+    affect: cells whose cost was routed through a newly blocked cell are
+    reset and re-seeded from their valid neighbors, and newly freed cells are
+    seeded directly. Also like D* Lite, expansion is lazy: `path()` only
+    settles the field up to the robot's own cost and keeps the remaining
+    wavefront for later, so cells farther from the goal than the robot are
+    never expanded unless a path query needs them.
+
+    `cost_to_goal` settles the whole field, which then equals a from-scratch
+    Dijkstra on the current inflated grid.
+    """
+
+    def __init__(
+        self,
+        og: OccupancyGrid,
+        robot_radius_m: float = 0.0,
+        connectivity: int = 8,
+        allow_unknown: bool = False,
+    ) -> None:
+        self.og = og
+        self.connectivity = connectivity
+        self.inflation = InflationLayer(og, robot_radius_m=robot_radius_m, allow_unknown=allow_unknown)
+        self.goal_rc: tuple[int, int] | None = None
+        self._known = self.inflation.traversable.copy()
+        self._g = np.zeros(0, dtype=np.int32)
+        self._front = np.zeros(0, dtype=np.int64)
+
+    @property
+    def cost_to_goal(self) -> np.ndarray:
+        """int32 (H,W) chamfer cost to the goal; `UNREACHABLE` where no path exists."""
+        self._settle(None)
+        return self._g.reshape(self.og.shape)
+
+    def set_goal(self, goal_rc: tuple[int, int]) -> None:
+        """Start a fresh field toward `goal_rc`; cells are expanded on demand."""
+        self.inflation.refresh()
+        self._known[:] = self.inflation.traversable
+        self.goal_rc = (int(goal_rc[0]), int(goal_rc[1]))
+        h, w = self.og.shape
+        self._g = np.full(h * w, UNREACHABLE, dtype=np.int32)
+        goal = self.goal_rc[0] * w + self.goal_rc[1]
+        self._g[goal] = 0
+        self._front = np.array([goal], dtype=np.int64)
+
+    def update(self) -> int:
+        """Apply pending grid changes; returns how many cells changed traversability."""
+        windows = self.inflation.refresh()
+        trav = self.inflation.traversable
+        w = self.og.shape[1]
+        blocked, freed = [], []
+        for r0, c0, r1, c1 in windows:
+            old = self._known[r0:r1, c0:c1]
+            new = trav[r0:r1, c0:c1]
+            for out, diff in ((blocked, old & ~new), (freed, new & ~old)):
+                rr, cc = np.nonzero(diff)
+                out.append((rr + r0) * w + (cc + c0))
+            self._known[r0:r1, c0:c1] = new
+        blocked = np.unique(np.concatenate(blocked)) if blocked else np.zeros(0, dtype=np.int64)
+        freed = np.unique(np.concatenate(freed)) if freed else np.zeros(0, dtype=np.int64)
+        if self.goal_rc is not None and (blocked.size or freed.size):
+            self._repair(blocked, freed)
+        return int(blocked.size + freed.size)
+
+    def path(self, start_rc: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """Follow the cost field downhill from `start_rc` to the goal."""
+        if self.goal_rc is None:
+            raise RuntimeError("set_goal() must be called before path()")
+        h, w = self.og.shape
+        steps = chamfer_steps(self.connectivity)
+        g = self._g
+        cur = (int(start_rc[0]), int(start_rc[1]))
+        self._settle_around(cur)
+        path = [cur]
+        cur_cost = g.item(cur[0] * w + cur[1])
+        while cur != self.goal_rc:
+            best, best_cost = None, cur_cost
+            for dr, dc, cost in steps:
+                rr, cc = cur[0] + dr, cur[1] + dc
+                if 0 <= rr < h and 0 <= cc < w:
+                    nd = g.item(rr * w + cc)
+                    if nd != UNREACHABLE and nd + cost <= best_cost:
+                        best, best_cost = (rr, cc), nd + cost
+            if best is None:
+                return None
+            cur = best
+            cur_cost = g.item(cur[0] * w + cur[1])
+            path.append(cur)
+        return path
+
+    def _settle(self, stop_at: int | None) -> None:
+        if self._front.size:
+            self._front = propagate(
+                self._g, self._known.ravel(), self._front, self.og.shape,
+                connectivity=self.connectivity, stop_at=stop_at,
+            )
+
+    def _settle_around(self, cell: tuple[int, int]) -> None:
+        # A start cell off the traversable set is left through its cheapest
+        # neighbor, so settle every traversable cell the path may start from.
+        h, w = self.og.shape
+        ok = self._known
+        goal = self.goal_rc
+        for dr, dc, _ in ((0, 0, 0),) + chamfer_steps(self.connectivity):
+            rr, cc = cell[0] + dr, cell[1] + dc
+            if 0 <= rr < h and 0 <= cc < w and (ok[rr, cc] or (rr, cc) == goal):
+                self._settle(rr * w + cc)
+
+    def _dependents(self, cells: np.ndarray) -> np.ndarray:
+        """`cells` plus every cell whose cost is achieved through one of them."""
+        g = self._g
+        h, w = self.og.shape
+        steps = chamfer_steps(self.connectivity)
+        mark = np.zeros(h * w, dtype=bool)
+        mark[cells] = True
+        out = [cells]
+        front = cells[g[cells] != UNREACHABLE]
+        while front.size:
+            r, c = np.divmod(front, w)
+            gf = g[front].astype(np.int64)
+            grown = []
+            for dr, dc, cost in steps:
+                rr, cc = r + dr, c + dc
+                keep = (rr >= 0) & (rr < h) & (cc >= 0) & (cc < w)
+                nb = rr[keep] * w + cc[keep]
+                nb = nb[(g[nb] == gf[keep] + cost) & ~mark[nb]]
+                mark[nb] = True
+                grown.append(nb)
+            front = np.concatenate(grown)
+            out.append(front)
+        return np.concatenate(out)
+
+    def _repair(self, blocked: np.ndarray, freed: np.ndarray) -> None:
+        g = self._g
+        h, w = self.og.shape
+        goal = self.goal_rc[0] * w + self.goal_rc[1]
+        ok = self._known.ravel()
+
+        invalid = self._dependents(blocked)
+        invalid = invalid[invalid != goal]
+        g[invalid] = UNREACHABLE
+
+        # Blocked and freed cells are disjoint, and freed cells had no dependents.
+        seeds = np.concatenate([invalid, freed])
+        seeds = seeds[ok[seeds] & (seeds != goal)]
+        r, c = np.divmod(seeds, w)
+        best = np.full(seeds.size, UNREACHABLE, dtype=np.int64)
+        for dr, dc, cost in chamfer_steps(self.connectivity):
+            rr, cc = r + dr, c + dc
+            keep = (rr >= 0) & (rr < h) & (cc >= 0) & (cc < w)
+            nbg = np.full(seeds.size, UNREACHABLE, dtype=np.int64)
+            nbg[keep] = g[rr[keep] * w + cc[keep]]
+            best = np.minimum(best, np.where(nbg != UNREACHABLE, nbg + cost, UNREACHABLE))
+        g[seeds] = np.minimum(g[seeds], best).astype(np.int32)
+        front = np.concatenate([self._front, seeds])
+        pos = np.arange(front.size)
+        stamp = np.empty(h * w, dtype=np.int64)
+        stamp[front] = pos
+        front = front[stamp[front] == pos]
+        self._front = front[g[front] != UNREACHABLE]
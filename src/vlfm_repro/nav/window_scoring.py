@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Batched square-window statistics over value maps.
+#
+# All functions operate on the last two axes, so a (K,H,W) stack of value maps
+# is handled in the same pass as a single (H,W) map.
+
+
+def summed_area_table(a: np.ndarray) -> np.ndarray:
+    """Integral image of `a` with a leading zero row/column, in float64.
+
+    ``S[..., r, c]`` is the sum of ``a[..., :r, :c]``.
+    """
+    a = np.asarray(a)
+    *lead, h, w = a.shape
+    sat = np.zeros((*lead, h + 1, w + 1), dtype=np.float64)
+    np.cumsum(a, axis=-2, dtype=np.float64, out=sat[..., 1:, 1:])
+    np.cumsum(sat[..., 1:, 1:], axis=-1, out=sat[..., 1:, 1:])
+    return sat
+
+
+def _sliding_max_last_axis(a: np.ndarray, radius: int) -> np.ndarray:
+    """Max over [i-radius, i+radius] along the last axis (van Herk/Gil-Werman).
+
+    Windows are clipped at the borders. Runs in three passes regardless of the
+    window size: a prefix max and a suffix max within blocks of length
+    2*radius+1, combined once per output element.
+    """
+    n = a.shape[-1]
+    k = 2 * radius + 1
+    nb = -(-(n + 2 * radius) // k)
+    padded = np.full((*a.shape[:-1], nb * k), -np.inf, dtype=a.dtype)
+    padded[..., radius:radius + n] = a
+    blocks = padded.reshape(*a.shape[:-1], nb, k)
+    prefix = np.maximum.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    return np.maximum(suffix[..., :n], prefix[..., k - 1:k - 1 + n])
+
+
+def window_max_filter(a: np.ndarray, radius: int) -> np.ndarray:
+    """Max over the clipped (2*radius+1)^2 window centered at every cell."""
+    a = np.asarray(a)
+    if not np.issubdtype(a.dtype, np.floating):
+        a = a.astype(np.float64)
+    if radius <= 0:
+        return a.copy()
+    out = _sliding_max_last_axis(a, radius)
+    out = _sliding_max_last_axis(np.swapaxes(out, -1, -2), radius)
+    return np.ascontiguousarray(np.swapaxes(out, -1, -2))
+
+
+class ValueWindowIndex:
+    """Answers window mean/max queries for many centers at once.
+
+    Build one per planning step (or keep it while the value map is unchanged).
+    The integral image is built on the first `mean` query and the max filter
+    on the first `max` query for each radius; both are cached. When no table
+    is cached yet and the windows together cover much less than the map, the
+    windows are gathered directly instead, since building a table costs a few
+    full passes over the map.
+
+    Window semantics match `score_cluster`: the window is the
+    (2*radius+1)^2 square around the rounded center, clipped to the map, and
+    an empty window scores 0.
+    """
+
+    def __init__(self, value: np.ndarray) -> None:
+        self.value = np.asarray(value)
+        self._sat: np.ndarray | None = None
+        self._max: dict[int, np.ndarray] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.value.shape[-2:]
+
+    def sat(self) -> np.ndarray:
+        if self._sat is None:
+            self._sat = summed_area_table(self.value)
+        return self._sat
+
+    def max_filter(self, radius: int) -> np.ndarray:
+        out = self._max.get(radius)
+        if out is None:
+            out = window_max_filter(self.value, radius)
+            self._max[radius] = out
+        return out
+
+    def scores(self, centers_rc: np.ndarray, radius: int, mode: str = "mean") -> np.ndarray:
+        """Window statistic for each (r,c) center; shape (..., N) for (..., H, W) values."""
+        if mode not in ("mean", "max"):
+            raise ValueError("mode must be 'mean' or 'max'")
+        centers = np.asarray(centers_rc, dtype=np.float64).reshape(-1, 2)
+        lead = self.value.shape[:-2]
+        out = np.zeros((*lead, centers.shape[0]), dtype=np.float64)
+        if centers.shape[0] == 0:
+            return out
+
+        h, w = self.shape
+        r = np.rint(centers[:, 0]).astype(np.int64)
+        c = np.rint(centers[:, 1]).astype(np.int64)
+        r0 = np.clip(r - radius, 0, h)
+        r1 = np.clip(r + radius + 1, 0, h)
+        c0 = np.clip(c - radius, 0, w)
+        c1 = np.clip(c + radius + 1, 0, w)
+        nonempty = (r1 > r0) & (c1 > c0)
+
+        cached = self._sat is not None if mode == "mean" else radius in self._max
+        if not cached and 4 * centers.shape[0] * (2 * radius + 1) ** 2 < h * w:
+            return self._gather_scores(r, c, radius, mode)
+
+        if mode == "mean":
+            s = self.sat()
+            sums = s[..., r1, c1] - s[..., r0, c1] - s[..., r1, c0] + s[..., r0, c0]
+            area = np.maximum((r1 - r0) * (c1 - c0), 1)
+            out[..., nonempty] = (sums / area)[..., nonempty]
+            return out
+
+        inside = (r >= 0) & (r < h) & (c >= 0) & (c < w)
+        mf = self.max_filter(radius)
+        out[..., inside] = mf[..., r[inside], c[inside]]
+        # Centers off the map can still clip a window onto it; reduce those directly.
+        for i in np.flatnonzero(nonempty & ~inside):
+            out[..., i] = self.value[..., r0[i]:r1[i], c0[i]:c1[i]].max(axis=(-2, -1))
+        return out
+
+    def _gather_scores(self, r: np.ndarray, c: np.ndarray, radius: int, mode: str) -> np.ndarray:
+        h, w = self.shape
+        d = np.arange(-radius, radius + 1)
+        rows = r[:, None, None] + d[None, :, None]
+        cols = c[:, None, None] + d[None, None, :]
+        valid = (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+        win = self.value[..., np.clip(rows, 0, h - 1), np.clip(cols, 0, w - 1)].astype(np.float64)
+        count = valid.sum(axis=(-2, -1))
+        if mode == "mean":
+            total = np.where(valid, win, 0.0).sum(axis=(-2, -1))
+            return np.where(count > 0, total / np.maximum(count, 1), 0.0)
+        best = np.where(valid, win, -np.inf).max(axis=(-2, -1))
+        return np.where(count > 0, best, 0.0)
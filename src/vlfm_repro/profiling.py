@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+# Opt-in per-stage instrumentation.
+#
+# Functions decorated with `profiled` and blocks wrapped in `stage` record
+# call counts, a log2 wall-time histogram and the size of their main array
+# into a process-wide registry, but only while profiling is enabled. When it
+# is disabled a decorated call costs one extra Python call and a global
+# flag check (about 0.2 us), and `stage` returns a shared no-op context
+# manager. With VLFM_PROFILING=0 in the environment at import time,
+# `profiled` returns functions unchanged, so the hooks cost nothing at all,
+# and `enable` raises.
+
+import cProfile
+import functools
+import io
+import math
+import os
+import pstats
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+# Histogram bin k counts calls that took [2**(k-1), 2**k) microseconds
+# (bin 0: under 1 us); the last bin is open-ended.
+N_BINS = 32
+
+_enabled = False
+_AVAILABLE = os.environ.get("VLFM_PROFILING", "1") != "0"
+
+
+class StageStats:
+    __slots__ = ("name", "count", "total_s", "max_s", "hist", "size_total", "size_max")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.hist = [0] * N_BINS
+        self.size_total = 0
+        self.size_max = 0
+
+    def record(self, seconds: float, size: int = 0) -> None:
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+        us = seconds * 1e6
+        self.hist[min(N_BINS - 1, math.frexp(us)[1]) if us >= 1.0 else 0] += 1
+        self.size_total += size
+        if size > self.size_max:
+            self.size_max = size
+
+    def percentile_ms(self, q: float) -> float:
+        """Upper edge of the histogram bin holding the q-th percentile call."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for k, n in enumerate(self.hist):
+            seen += n
+            if seen >= rank and n:
+                return min(2.0 ** k / 1e3, self.max_s * 1e3)
+        return self.max_s * 1e3
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": 1e3 * self.total_s,
+            "mean_ms": 1e3 * self.total_s / self.count if self.count else 0.0,
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "max_ms": 1e3 * self.max_s,
+            "mean_size": self.size_total / self.count if self.count else 0.0,
+            "max_size": self.size_max,
+            "hist_us_log2": list(self.hist),
+        }
+
+
+_registry: dict[str, StageStats] = {}
+
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    if flag and not _AVAILABLE:
+        raise RuntimeError("profiling hooks were stripped at import time (VLFM_PROFILING=0)")
+    _enabled = bool(flag)
+
+
+def disable() -> None:
+    enable(False)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    _registry.clear()
+
+
+def record(name: str, seconds: float, size: int = 0) -> None:
+    """Add one timed call of `name` (a no-op while profiling is disabled)."""
+    if not _enabled:
+        return
+    stats = _registry.get(name)
+    if stats is None:
+        stats = _registry[name] = StageStats(name)
+    stats.record(seconds, size)
+
+
+def _first_array_size(args: tuple, kwargs: dict) -> int:
+    for a in args:
+        if isinstance(a, np.ndarray):
+            return a.size
+    for a in kwargs.values():
+        if isinstance(a, np.ndarray):
+            return a.size
+    return 0
+
+
+def profiled(name: str, size: Callable[..., int] | None = None) -> Callable:
+    """Decorator that records each call as stage `name` while profiling is enabled.
+
+    `size(*args, **kwargs)` gives the array size to record; by default it
+    is the size of the first ndarray argument (0 if there is none). Calls
+    that raise are not recorded.
+    """
+    def wrap(fn: Callable) -> Callable:
+        if not _AVAILABLE:
+            return fn
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            out = fn(*args, **kwargs)
+            dt = time.perf_counter() - t0
+            n = size(*args, **kwargs) if size is not None else _first_array_size(args, kwargs)
+            record(name, dt, int(n))
+            return out
+        return inner
+    return wrap
+
+
+class _Stage:
+    __slots__ = ("name", "size", "t0")
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+
+    def __enter__(self) -> "_Stage":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self.name, time.perf_counter() - self.t0, self.size)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str, size: int = 0) -> _Stage | _NoStage:
+    """``with stage("name"):`` times the block as stage `name` while profiling is enabled."""
+    return _Stage(name, size) if _enabled else _NO_STAGE
+
+
+def report() -> dict[str, dict[str, Any]]:
+    """Per-stage statistics, slowest total first."""
+    stats = sorted(_registry.values(), key=lambda s: s.total_s, reverse=True)
+    return {s.name: s.as_dict() for s in stats}
+
+
+def markdown_table(rep: dict[str, dict[str, Any]]) -> list[str]:
+    """`report()` as Markdown table lines."""
+    lines = [
+        "| stage | calls | total ms | mean ms | p50 ms | p95 ms | max ms | mean size |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for name, s in rep.items():
+        lines.append(
+            f"| `{name}` | {s['count']} | {s['total_ms']:.2f} | {s['mean_ms']:.3f} | {s['p50_ms']:.3f} "
+            f"| {s['p95_ms']:.3f} | {s['max_ms']:.3f} | {s['mean_size']:.0f} |"
+        )
+    return lines
+
+
+class Capture:
+    """cProfile capture of a chosen block: ``with Capture() as cap: ...`` or `start`/`stop`.
+
+    `text` holds the stats table (sorted by `sort`, top `limit` rows) once stopped.
+    """
+
+    def __init__(self, sort: str = "cumulative", limit: int = 30) -> None:
+        self.sort = sort
+        self.limit = limit
+        self.text = ""
+        self._prof = cProfile.Profile()
+
+    def start(self) -> "Capture":
+        self._prof.enable()
+        return self
+
+    def stop(self) -> str:
+        self._prof.disable()
+        buf = io.StringIO()
+        pstats.Stats(self._prof, stream=buf).sort_stats(self.sort).print_stats(self.limit)
+        self.text = buf.getvalue()
+        return self.text
+
+    def __enter__(self) -> "Capture":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+
+import numpy as np
+
+from vlfm_repro.service import protocol as P
+from vlfm_repro.vlm.observation_updater import FovObservation
+
+
+class ServiceError(RuntimeError):
+    """The server rejected a request."""
+
+    def __init__(self, request_id: int, message: str) -> None:
+        super().__init__(f"request {request_id}: {message}")
+        self.request_id = request_id
+
+
+class PlanningClient:
+    """Blocking client for `PlanningServer`.
+
+    Update methods return their request id and are fire-and-forget by
+    default (``ack=False``): they only send, so many updates and a `rank`
+    pipeline into one round trip. With ``ack=True`` they wait until the
+    server has applied them. An error reply to an earlier fire-and-forget
+    message is raised by the next call that reads from the socket.
+
+    `send` / `receive` expose the raw frames for custom pipelining.
+    """
+
+    def __init__(self, path: str | os.PathLike, timeout: float | None = 30.0) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(os.fspath(path))
+        self._next_id = 1
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> "PlanningClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def send(self, msg_type: int, payload: bytes = b"", flags: int = 0) -> int:
+        """Send one frame; returns its request id."""
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF or 1
+        self.sock.sendall(P.pack_frame(msg_type, request_id, payload, flags))
+        return request_id
+
+    def _recv_exact(self, n: int) -> bytes:
+        buf = bytearray(n)
+        view = memoryview(buf)
+        got = 0
+        while got < n:
+            k = self.sock.recv_into(view[got:])
+            if k == 0:
+                raise ConnectionError("server closed the connection")
+            got += k
+        return bytes(buf)
+
+    def receive(self) -> tuple[int, int, bytes]:
+        """Next reply as (type, request id, payload)."""
+        length, msg_type, _, _, request_id = P.HEADER.unpack(self._recv_exact(P.HEADER.size))
+        return msg_type, request_id, self._recv_exact(length) if length else b""
+
+    def wait(self, request_id: int) -> tuple[int, bytes]:
+        """Read replies up to the one for `request_id`; raises `ServiceError` on any error reply."""
+        while True:
+            msg_type, rid, payload = self.receive()
+            if msg_type == P.MSG_ERROR:
+                raise ServiceError(rid, payload.decode("utf-8", "replace"))
+            if rid == request_id:
+                return msg_type, payload
+
+    def _update(self, msg_type: int, payload: bytes, ack: bool) -> int:
+        rid = self.send(msg_type, payload, P.FLAG_ACK if ack else 0)
+        if ack:
+            self.wait(rid)
+        return rid
+
+    def init(self, shape: tuple[int, int], resolution: float = 0.05, origin_xy: tuple[float, float] = (0.0, 0.0),
+             grid: np.ndarray | None = None, ack: bool = True) -> int:
+        """Start a new map, all unknown unless `grid` is given."""
+        return self._update(P.MSG_INIT, P.encode_init(shape, resolution, origin_xy, grid), ack)
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray | int, ack: bool = False) -> int:
+        return self._update(P.MSG_CELLS, P.encode_cells(rows, cols, values), ack)
+
+    def update_region(self, r0: int, c0: int, patch: np.ndarray, ack: bool = False) -> int:
+        return self._update(P.MSG_REGION, P.encode_region(r0, c0, patch), ack)
+
+    def observe(self, obs: FovObservation, ack: bool = False) -> int:
+        return self._update(P.MSG_OBSERVE, P.encode_observe(obs), ack)
+
+    def set_prompt(self, prompt: str, ack: bool = False) -> int:
+        """Switch the active prompt; the server keeps one value map per prompt."""
+        return self._update(P.MSG_PROMPT, prompt.encode("utf-8"), ack)
+
+    def rank(self, robot_rc: tuple[int, int] | None = None, top_k: int = 0, radius_cells: int = 3,
+             mode: str = "mean", cost_weight: float = 0.1, stickiness: float = 0.0) -> P.RankReply:
+        """Rank the current frontiers (by utility when `robot_rc` is given, else by score)."""
+        req = P.RankRequest(robot_rc, top_k, radius_cells, mode, cost_weight, stickiness)
+        _, payload = self.wait(self.send(P.MSG_RANK, P.encode_rank(req)))
+        return P.decode_ranked(payload)
+
+    def stats(self) -> dict:
+        _, payload = self.wait(self.send(P.MSG_STATS))
+        return json.loads(payload.decode("utf-8"))
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+# Binary wire format of the planning service.
+#
+# Every message is a 12-byte little-endian header followed by `length`
+# payload bytes:
+#
+#   u32 length | u8 type | u8 flags | u16 reserved | u32 request id
+#
+# Replies echo the request id. Map updates are fire-and-forget unless sent
+# with FLAG_ACK; errors are always answered with MSG_ERROR. Requests on one
+# connection are handled in order, so clients may pipeline freely.
+
+from dataclasses import dataclass
+import struct
+
+import numpy as np
+
+from vlfm_repro.vlm.observation_updater import FovObservation
+
+HEADER = struct.Struct("<IBBHI")
+MAX_PAYLOAD = 64 << 20
+
+FLAG_ACK = 0x01
+
+# Requests
+MSG_INIT = 0x01      # u32 h, u32 w, f32 resolution, f32 origin x, f32 origin y [, int8 grid h*w]
+MSG_CELLS = 0x02     # u32 n, i32 rows[n], i32 cols[n], i8 values[n]
+MSG_REGION = 0x03    # i32 r0, i32 c0, u32 ph, u32 pw, i8 patch[ph*pw]
+MSG_OBSERVE = 0x04   # i32 r, i32 c, f32 heading, f32 score, f32 confidence, f32 fov, u32 range cells
+MSG_PROMPT = 0x05    # utf-8 prompt
+MSG_RANK = 0x06      # i32 r, i32 c (-1: no robot, rank by score), u16 top_k (0: all), u8 radius,
+                     # u8 mode, f32 cost weight, f32 stickiness
+MSG_STATS = 0x07     # empty
+# Replies
+MSG_OK = 0x80        # u64 map version, u64 value version
+MSG_RANKED = 0x81    # u64 map version, u64 value version, u32 n, n * RANK_ENTRY
+MSG_STATS_REPLY = 0x82  # utf-8 JSON
+MSG_ERROR = 0xFF     # utf-8 message
+
+MSG_NAMES = {
+    MSG_INIT: "init", MSG_CELLS: "cells", MSG_REGION: "region", MSG_OBSERVE: "observe",
+    MSG_PROMPT: "prompt", MSG_RANK: "rank", MSG_STATS: "stats",
+}
+UPDATE_MSGS = frozenset((MSG_INIT, MSG_CELLS, MSG_REGION, MSG_OBSERVE, MSG_PROMPT))
+SCORE_MODES = ("mean", "max")
+
+_INIT = struct.Struct("<IIfff")
+_COUNT = struct.Struct("<I")
+_REGION = struct.Struct("<iiII")
+_OBSERVE = struct.Struct("<iiffffI")
+_RANK = struct.Struct("<iiHBBff")
+_VERSIONS = struct.Struct("<QQ")
+RANK_ENTRY = struct.Struct("<IfffIf")   # id, score, centroid r, centroid c, size, path cost (inf: none)
+
+
+class ProtocolError(ValueError):
+    """Malformed message."""
+
+
+@dataclass(frozen=True)
+class RankRequest:
+    robot_rc: tuple[int, int] | None = None
+    top_k: int = 0
+    radius_cells: int = 3
+    mode: str = "mean"
+    cost_weight: float = 0.1
+    stickiness: float = 0.0
+
+
+@dataclass(frozen=True)
+class RankEntry:
+    frontier_id: int
+    score: float
+    centroid_rc: tuple[float, float]
+    size: int
+    path_cost: float | None
+
+
+@dataclass(frozen=True)
+class RankReply:
+    map_version: int
+    value_version: int
+    frontiers: list[RankEntry]
+
+
+def pack_frame(msg_type: int, request_id: int, payload: bytes = b"", flags: int = 0) -> bytes:
+    return HEADER.pack(len(payload), msg_type, flags, 0, request_id) + payload
+
+
+def _take(payload: bytes, st: struct.Struct) -> tuple:
+    if len(payload) < st.size:
+        raise ProtocolError(f"payload too short: {len(payload)} < {st.size} bytes")
+    return st.unpack_from(payload)
+
+
+def encode_init(shape: tuple[int, int], resolution: float = 0.05,
+                origin_xy: tuple[float, float] = (0.0, 0.0), grid: np.ndarray | None = None) -> bytes:
+    h, w = shape
+    out = _INIT.pack(h, w, resolution, *origin_xy)
+    if grid is not None:
+        out += np.ascontiguousarray(grid, dtype=np.int8).tobytes()
+    return out
+
+
+def decode_init(payload: bytes) -> tuple[tuple[int, int], float, tuple[float, float], np.ndarray | None]:
+    h, w, res, ox, oy = _take(payload, _INIT)
+    body = payload[_INIT.size:]
+    grid = None
+    if body:
+        if len(body) != h * w:
+            raise ProtocolError(f"init grid has {len(body)} bytes, expected {h * w}")
+        grid = np.frombuffer(body, dtype=np.int8).reshape(h, w).copy()
+    return (h, w), res, (ox, oy), grid
+
+
+def encode_cells(rows: np.ndarray, cols: np.ndarray, values: np.ndarray | int) -> bytes:
+    rows = np.asarray(rows, dtype="<i4").ravel()
+    cols = np.asarray(cols, dtype="<i4").ravel()
+    values = np.broadcast_to(np.asarray(values, dtype=np.int8), rows.shape)
+    if cols.shape != rows.shape:
+        raise ValueError("rows and cols must have the same length")
+    return _COUNT.pack(rows.size) + rows.tobytes() + cols.tobytes() + np.ascontiguousarray(values).tobytes()
+
+
+def decode_cells(payload: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    (n,) = _take(payload, _COUNT)
+    if len(payload) != _COUNT.size + 9 * n:
+        raise ProtocolError(f"cells payload has {len(payload)} bytes, expected {_COUNT.size + 9 * n}")
+    o = _COUNT.size
+    rows = np.frombuffer(payload, dtype="<i4", count=n, offset=o)
+    cols = np.frombuffer(payload, dtype="<i4", count=n, offset=o + 4 * n)
+    values = np.frombuffer(payload, dtype=np.int8, count=n, offset=o + 8 * n)
+    return rows, cols, values
+
+
+def encode_region(r0: int, c0: int, patch: np.ndarray) -> bytes:
+    patch = np.ascontiguousarray(patch, dtype=np.int8)
+    if patch.ndim != 2:
+        raise ValueError("patch must be 2D")
+    return _REGION.pack(r0, c0, *patch.shape) + patch.tobytes()
+
+
+def decode_region(payload: bytes) -> tuple[int, int, np.ndarray]:
+    r0, c0, ph, pw = _take(payload, _REGION)
+    if len(payload) != _REGION.size + ph * pw:
+        raise ProtocolError(f"region payload has {len(payload)} bytes, expected {_REGION.size + ph * pw}")
+    return r0, c0, np.frombuffer(payload, dtype=np.int8, offset=_REGION.size).reshape(ph, pw)
+
+
+def encode_observe(obs: FovObservation) -> bytes:
+    r, c = obs.center_rc
+    return _OBSERVE.pack(r, c, obs.heading_rad, obs.score, obs.confidence, obs.fov_rad, obs.range_cells)
+
+
+def decode_observe(payload: bytes) -> FovObservation:
+    r, c, heading, score, conf, fov, rng = _take(payload, _OBSERVE)
+    return FovObservation((r, c), heading, score, conf, fov_rad=fov, range_cells=rng)
+
+
+def encode_rank(req: RankRequest) -> bytes:
+    r, c = req.robot_rc if req.robot_rc is not None else (-1, -1)
+    return _RANK.pack(r, c, req.top_k, req.radius_cells, SCORE_MODES.index(req.mode), req.cost_weight, req.stickiness)
+
+
+def decode_rank(payload: bytes) -> RankRequest:
+    r, c, top_k, radius, mode, weight, stickiness = _take(payload, _RANK)
+    if mode >= len(SCORE_MODES):
+        raise ProtocolError(f"unknown score mode {mode}")
+    robot = None if r < 0 or c < 0 else (r, c)
+    return RankRequest(robot, top_k, radius, SCORE_MODES[mode], weight, stickiness)
+
+
+def encode_versions(map_version: int, value_version: int) -> bytes:
+    return _VERSIONS.pack(map_version, value_version)
+
+
+def decode_versions(payload: bytes) -> tuple[int, int]:
+    return _take(payload, _VERSIONS)
+
+
+def encode_ranked(map_version: int, value_version: int, entries: list[RankEntry]) -> bytes:
+    parts = [_VERSIONS.pack(map_version, value_version), _COUNT.pack(len(entries))]
+    for e in entries:
+        cost = float("inf") if e.path_cost is None else e.path_cost
+        parts.append(RANK_ENTRY.pack(e.frontier_id, e.score, *e.centroid_rc, e.size, cost))
+    return b"".join(parts)
+
+
+def decode_ranked(payload: bytes) -> RankReply:
+    mv, vv = _take(payload, _VERSIONS)
+    (n,) = _COUNT.unpack_from(payload, _VERSIONS.size)
+    o = _VERSIONS.size + _COUNT.size
+    entries = []
+    for fid, score, cr, cc, size, cost in RANK_ENTRY.iter_unpack(payload[o:o + n * RANK_ENTRY.size]):
+        entries.append(RankEntry(fid, score, (cr, cc), size, None if cost == float("inf") else cost))
+    return RankReply(mv, vv, entries)
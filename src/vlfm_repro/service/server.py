@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import json
+import os
+import socket
+import stat
+import threading
+import time
+
+import numpy as np
+
+from vlfm_repro.frontier.identity import FrontierIdentityTracker
+from vlfm_repro.frontier.incremental import IncrementalFrontierTracker
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+from vlfm_repro.nav.geodesic import geodesic_distance
+from vlfm_repro.service import protocol as P
+from vlfm_repro.vlm.observation_updater import FovObservation, apply_fov_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+# Latency samples kept per message type for the stats percentiles.
+LATENCY_WINDOW = 4096
+
+
+class PlanningState:
+    """Warm map state of the planning service.
+
+    Map updates only touch the grid and value map. Frontier extraction,
+    identity matching and the robot's geodesic field are brought up to date
+    lazily by `rank`, so any number of queued updates costs one refresh.
+    """
+
+    def __init__(self, og: OccupancyGrid | None = None, prompt: str = "", min_cluster_size: int = 5) -> None:
+        self.min_cluster_size = min_cluster_size
+        self.prompt = prompt
+        self.og: OccupancyGrid | None = None
+        self.value_maps: dict[str, ValueMap] = {}
+        self.refreshes = 0
+        self.updates_since_refresh = 0
+        self.updates_coalesced = 0
+        self.generation = 0
+        if og is not None:
+            self.reset(og)
+
+    @property
+    def vm(self) -> ValueMap:
+        return self.value_maps[self.prompt]
+
+    def reset(self, og: OccupancyGrid) -> None:
+        """Replace the map; value maps and frontier ids start over.
+
+        Everything is built before any of it is installed, so a failure
+        (e.g. out of memory) leaves the previous map in place.
+        """
+        value_maps = {self.prompt: ValueMap.zeros(*og.shape)}
+        frontiers = IncrementalFrontierTracker(og, min_cluster_size=self.min_cluster_size)
+        identity = FrontierIdentityTracker()
+        identity.update(frontiers.clusters())
+        self.generation += 1
+        self.og = og
+        self.value_maps = value_maps
+        self.frontiers = frontiers
+        self.identity = identity
+        self._seen_version = og.version
+        self._field_key: tuple | None = None
+        self._field: np.ndarray | None = None
+
+    def _require_map(self) -> OccupancyGrid:
+        if self.og is None:
+            raise ValueError("no map: send init first")
+        return self.og
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> None:
+        og = self._require_map()
+        h, w = og.shape
+        if rows.size and (rows.min() < 0 or cols.min() < 0 or rows.max() >= h or cols.max() >= w):
+            raise ValueError(f"cell outside the {h}x{w} map")
+        if values.size and (values.min() < -1 or values.max() > 1):
+            raise ValueError("cell values must be -1, 0 or 1")
+        og.set_cells(rows, cols, values)
+        self.updates_since_refresh += 1
+
+    def update_region(self, r0: int, c0: int, patch: np.ndarray) -> None:
+        og = self._require_map()
+        if patch.size and (patch.min() < -1 or patch.max() > 1):
+            raise ValueError("cell values must be -1, 0 or 1")
+        og.update_region(r0, c0, patch)
+        self.updates_since_refresh += 1
+
+    def observe(self, obs: FovObservation) -> None:
+        og = self._require_map()
+        apply_fov_observation(self.vm, og, obs)
+
+    def set_prompt(self, prompt: str) -> None:
+        """Switch the active prompt; each prompt keeps its own value map."""
+        og = self._require_map()
+        self.prompt = prompt
+        if prompt not in self.value_maps:
+            self.value_maps[prompt] = ValueMap.zeros(*og.shape)
+
+    def _refresh(self) -> None:
+        og = self._require_map()
+        if og.version == self._seen_version:
+            return
+        self.frontiers.refresh()
+        self.identity.update(self.frontiers.clusters())
+        self._seen_version = og.version
+        self.refreshes += 1
+        self.updates_coalesced += self.updates_since_refresh
+        self.updates_since_refresh = 0
+
+    def rank(self, req: P.RankRequest) -> list[RankedFrontier]:
+        self._refresh()
+        og = self._require_map()
+        field = None
+        if req.robot_rc is not None:
+            if not og.in_bounds(*req.robot_rc):
+                raise ValueError(f"robot cell {req.robot_rc} outside the map")
+            key = (req.robot_rc, og.version)
+            if self._field_key != key:
+                self._field = geodesic_distance(og, req.robot_rc)
+                self._field_key = key
+            field = self._field
+        ranked = self.identity.rank(
+            self.vm,
+            radius_cells=req.radius_cells,
+            mode=req.mode,
+            distance_field=field,
+            cost_key=self._field_key if field is not None else None,
+            cost_weight=req.cost_weight,
+            stickiness=req.stickiness,
+        )
+        return ranked[:req.top_k] if req.top_k else ranked
+
+    def versions(self) -> tuple[int, int]:
+        return (self.og.version if self.og is not None else 0, self.vm.version if self.og is not None else 0)
+
+
+def _entry(rf: RankedFrontier) -> P.RankEntry:
+    cr, cc = rf.cluster.centroid_rc
+    return P.RankEntry(rf.frontier_id, rf.score, (float(cr), float(cc)), len(rf.cluster.cells), rf.path_cost)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink `path` if it is a socket left behind by a dead server.
+
+    Raises if `path` is not a socket, or if a server still accepts
+    connections on it.
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"a server is already listening on {path}")
+
+
+class PlanningServer:
+    """asyncio server for `PlanningState` on a Unix domain socket.
+
+    Connections only parse frames; one worker applies them in arrival order.
+    It drains everything queued at once, so updates that arrive while a
+    ranking is computed are batched, and back-to-back rank requests with no
+    update in between reuse one result.
+    """
+
+    def __init__(self, state: PlanningState | None = None) -> None:
+        self.state = state or PlanningState()
+        self.started = time.monotonic()
+        self.counts: dict[str, int] = {name: 0 for name in P.MSG_NAMES.values()}
+        self.errors = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.rank_reused = 0
+        self.latency_s: dict[str, deque] = {name: deque(maxlen=LATENCY_WINDOW) for name in P.MSG_NAMES.values()}
+        self._queue: asyncio.Queue | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._last_rank: tuple | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, path: str | os.PathLike) -> None:
+        path = os.fspath(path)
+        _remove_stale_socket(path)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._work())
+        self._server = await asyncio.start_unix_server(self._connection, path=path)
+
+    async def serve_forever(self, path: str | os.PathLike) -> None:
+        await self.start(path)
+        await self._serve()
+
+    async def _serve(self) -> None:
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def serve_in_thread(self, path: str | os.PathLike) -> threading.Thread:
+        """Run the server on its own event loop in a daemon thread; returns once it listens."""
+        ready = threading.Event()
+        failed: list[BaseException] = []
+
+        async def main() -> None:
+            try:
+                await self.start(path)
+            except BaseException as e:
+                failed.append(e)
+                return
+            finally:
+                ready.set()
+            await self._serve()
+
+        thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+        thread.start()
+        ready.wait(10.0)
+        if failed:
+            raise failed[0]
+        return thread
+
+    def stop(self) -> None:
+        """Thread-safe shutdown of a server started with `serve_in_thread`."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(P.HEADER.size)
+                length, msg_type, flags, _, request_id = P.HEADER.unpack(header)
+                if length > P.MAX_PAYLOAD:
+                    writer.write(P.pack_frame(P.MSG_ERROR, request_id, f"payload of {length} bytes is too large".encode()))
+                    break
+                payload = await reader.readexactly(length) if length else b""
+                self._queue.put_nowait((writer, msg_type, flags, request_id, payload, time.perf_counter()))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Let the worker answer what this connection already queued.
+            self._writers.discard(writer)
+            self._queue.put_nowait((writer, None, 0, 0, b"", 0.0))
+
+    async def _work(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self.batches += 1
+            self.max_batch = max(self.max_batch, len(batch))
+            touched = set()
+            for writer, msg_type, flags, request_id, payload, t_recv in batch:
+                if msg_type is None:
+                    writer.close()
+                    continue
+                reply = self._handle(msg_type, flags, request_id, payload)
+                if reply is not None and not writer.is_closing():
+                    writer.write(reply)
+                    touched.add(writer)
+                name = P.MSG_NAMES.get(msg_type)
+                if name is not None:
+                    self.latency_s[name].append(time.perf_counter() - t_recv)
+            for writer in touched:
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    pass
+
+    def _handle(self, msg_type: int, flags: int, request_id: int, payload: bytes) -> bytes | None:
+        name = P.MSG_NAMES.get(msg_type)
+        try:
+            if name is None:
+                raise P.ProtocolError(f"unknown message type 0x{msg_type:02x}")
+            self.counts[name] += 1
+            if msg_type == P.MSG_RANK:
+                return P.pack_frame(P.MSG_RANKED, request_id, self._rank(P.decode_rank(payload)))
+            if msg_type == P.MSG_STATS:
+                return P.pack_frame(P.MSG_STATS_REPLY, request_id, json.dumps(self.stats()).encode("utf-8"))
+            if msg_type == P.MSG_INIT:
+                shape, res, origin, grid = P.decode_init(payload)
+                if grid is None:
+                    grid = np.full(shape, -1, dtype=np.int8)
+                self.state.reset(OccupancyGrid(grid=grid, resolution=res, origin_xy=origin))
+            elif msg_type == P.MSG_CELLS:
+                self.state.set_cells(*P.decode_cells(payload))
+            elif msg_type == P.MSG_REGION:
+                self.state.update_region(*P.decode_region(payload))
+            elif msg_type == P.MSG_OBSERVE:
+                self.state.observe(P.decode_observe(payload))
+            elif msg_type == P.MSG_PROMPT:
+                self.state.set_prompt(payload.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            self.errors += 1
+            return P.pack_frame(P.MSG_ERROR, request_id, str(e).encode("utf-8"))
+        except Exception as e:
+            # Any other failure (e.g. MemoryError on a huge INIT) is reported
+            # to the sender as well; it must not end the worker.
+            self.errors += 1
+            return P.pack_frame(P.MSG_ERROR, request_id, f"{type(e).__name__}: {e}".encode("utf-8"))
+        if flags & P.FLAG_ACK:
+            return P.pack_frame(P.MSG_OK, request_id, P.encode_versions(*self.state.versions()))
+        return None
+
+    def _rank(self, req: P.RankRequest) -> bytes:
+        versions = (self.state.generation, self.state.prompt, *self.state.versions())
+        if self._last_rank is not None and self._last_rank[0] == (req, versions):
+            self.rank_reused += 1
+            return self._last_rank[1]
+        ranked = self.state.rank(req)
+        out = P.encode_ranked(*self.state.versions(), [_entry(rf) for rf in ranked])
+        self._last_rank = ((req, versions), out)
+        return out
+
+    def stats(self) -> dict:
+        latency = {}
+        for name, samples in self.latency_s.items():
+            if samples:
+                ms = 1e3 * np.fromiter(samples, dtype=np.float64)
+                p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+                latency[name] = {"count": len(ms), "p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "max_ms": float(ms.max())}
+        st = self.state
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "messages": dict(self.counts),
+            "errors": self.errors,
+            "batches": self.batches,
+            "max_batch": self.max_batch,
+            "rank_reused": self.rank_reused,
+            "refreshes": st.refreshes,
+            "updates_coalesced": st.updates_coalesced,
+            "latency": latency,
+            "map": None if st.og is None else {
+                "shape": list(st.og.shape),
+                "version": st.og.version,
+                "prompt": st.prompt,
+                "prompts": list(st.value_maps),
+                "frontiers": len(st.identity.frontiers),
+            },
+        }
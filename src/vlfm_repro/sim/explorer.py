@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+import time
+
+import numpy as np
+
+from vlfm_repro import profiling
+from vlfm_repro.frontier.identity import FrontierIdentityTracker
+from vlfm_repro.frontier.incremental import IncrementalFrontierTracker
+from vlfm_repro.mapping.episode_log import EpisodeRecorder
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.visibility import visible_cells
+from vlfm_repro.nav.geodesic import ORTHO_COST, UNREACHABLE, chamfer_distance
+from vlfm_repro.nav.planner import InflationLayer
+from vlfm_repro.sim.floorplan import FloorPlan
+from vlfm_repro.vlm.observation_updater import FovObservation, fov_confidence
+from vlfm_repro.vlm.scorers import DummyScorer, VLMScorer
+from vlfm_repro.vlm.value_map import ValueMap
+
+# Timed parts of one step, in order.
+STAGES = ("sense", "value", "frontier", "geodesic", "rank", "plan")
+
+_STEPS_8 = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+@dataclass
+class ExplorationConfig:
+    max_steps: int = 500
+    step_m: float = 0.25               # forward motion per step
+    fov_deg: float = 79.0
+    sensor_range_m: float = 5.0
+    robot_radius_m: float = 0.15
+    success_distance_m: float = 1.0
+    cue_scale_m: float = 3.0           # decay of the simulated semantic cue
+    radius_cells: int = 3              # frontier scoring window
+    score_mode: str = "mean"           # window statistic, "mean" or "max"
+    cost_weight: float = 0.1
+    stickiness: float = 0.02
+    min_cluster_size: int = 5
+    initial_spin: bool = True          # look around (4 turns) before moving
+    cprofile_step: int | None = None   # cProfile this step into `ExplorationSim.cprofile_text`
+    episode_log: str | None = None     # record every step here (see `vlfm_repro.mapping.episode_log`)
+
+
+@dataclass
+class EpisodeResult:
+    success: bool
+    spl: float
+    path_length_m: float
+    shortest_path_m: float
+    num_steps: int
+    wall_time_s: float
+    stage_ms: dict[str, list[float]] = field(default_factory=dict)
+    trajectory: list[tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def steps_per_sec(self) -> float:
+        return self.num_steps / self.wall_time_s if self.wall_time_s > 0 else 0.0
+
+
+def _descend(cost: np.ndarray, start: tuple[int, int]) -> list[tuple[int, int]]:
+    """Cells from `start` down the steepest descent of `cost` to a zero-cost cell."""
+    h, w = cost.shape
+    path = [start]
+    r, c = start
+    while cost[r, c] > 0:
+        best = (cost[r, c], r, c)
+        for dr, dc in _STEPS_8:
+            rr, cc = r + dr, c + dc
+            if 0 <= rr < h and 0 <= cc < w and cost[rr, cc] < best[0]:
+                best = (cost[rr, cc], rr, cc)
+        if (best[1], best[2]) == (r, c):
+            break
+        r, c = best[1], best[2]
+        path.append((r, c))
+    return path
+
+
+class ExplorationSim:
+    """Closed-loop object-goal exploration in a 2D `FloorPlan`.
+
+    Each step the agent senses a field-of-view cone (ray cast against the
+    ground truth), writes it into its own `OccupancyGrid`, scores the frame
+    with a `VLMScorer` and fuses that into a `ValueMap`. It then updates its
+    frontiers incrementally, ranks them by value minus weighted path cost and
+    moves `step_m` along the geodesic path to the best one. Once a target
+    object has been seen, it heads for the object instead and stops within
+    `success_distance_m` of it.
+
+    The frame given to the scorer is the ground-truth proximity cue
+    ``exp(-d / cue_scale_m)`` (d: geodesic distance to the nearest target) at
+    the visible cells, so a `DummyScorer` scores frames closer to the target
+    higher. Success and SPL follow the ObjectNav definitions, with the
+    shortest path measured to the success region on the ground-truth map.
+    """
+
+    def __init__(
+        self,
+        plan: FloorPlan,
+        prompt: str,
+        config: ExplorationConfig | None = None,
+        scorer: VLMScorer | None = None,
+    ) -> None:
+        self.plan = plan
+        self.prompt = prompt
+        self.cfg = config or ExplorationConfig()
+        self.scorer = scorer or DummyScorer()
+        res = plan.resolution
+        h, w = plan.shape
+
+        self.gt = plan.occupancy()
+        self.target = plan.object_mask(prompt)
+        if not self.target.any():
+            raise ValueError(f"floor plan has no {prompt!r}")
+        cost = chamfer_distance(self.gt.grid == 0, self.target)
+        self.gt_dist = np.where(cost == UNREACHABLE, np.inf, cost * (res / ORTHO_COST)).astype(np.float32)
+        self.cue = np.exp(-self.gt_dist / self.cfg.cue_scale_m).astype(np.float32)
+
+        self.og = OccupancyGrid(grid=np.full((h, w), -1, dtype=np.int8), resolution=res)
+        self.vm = ValueMap.zeros(h, w)
+        self.frontiers = IncrementalFrontierTracker(self.og, min_cluster_size=self.cfg.min_cluster_size)
+        self.identity = FrontierIdentityTracker()
+        self.inflation = InflationLayer(self.og, robot_radius_m=self.cfg.robot_radius_m)
+        self.seen_target = np.zeros((h, w), dtype=bool)
+
+        self.pos = plan.start_rc
+        self.heading = 0.0
+        self.path_length_m = 0.0
+        self.steps = 0
+        self.done = False
+        self.stopped = False
+        self.trajectory = [self.pos]
+        self.stage_ms: dict[str, list[float]] = {s: [] for s in STAGES}
+        self._range_cells = int(round(self.cfg.sensor_range_m / res))
+        self._step_cells = max(1, int(round(self.cfg.step_m / res)))
+        self._fov = math.radians(self.cfg.fov_deg)
+        self._pending_turns = 3 if self.cfg.initial_spin else 0
+        self.cprofile_text: str | None = None
+        self.last_ranked: list = []
+        self.recorder = None
+        if self.cfg.episode_log:
+            meta = {"prompt": prompt, "start_rc": list(plan.start_rc)}
+            self.recorder = EpisodeRecorder(self.cfg.episode_log, self.og, self.vm, meta=meta)
+
+    @property
+    def success(self) -> bool:
+        return self.stopped and float(self.gt_dist[self.pos]) <= self.cfg.success_distance_m
+
+    def _timed(self, stage: str, t0: float) -> float:
+        t1 = time.perf_counter()
+        self.stage_ms[stage].append(1e3 * (t1 - t0))
+        profiling.record(f"sim.{stage}", t1 - t0)
+        return t1
+
+    def step(self) -> bool:
+        """Sense, update maps, plan and act once; returns True when the episode is over."""
+        if self.done:
+            return True
+        if self.steps == self.cfg.cprofile_step:
+            with profiling.Capture() as cap:
+                self._step()
+            self.cprofile_text = cap.text
+        else:
+            self._step()
+        self.steps += 1
+        self.done = self.stopped or self.steps >= self.cfg.max_steps
+        if self.recorder is not None:
+            extra = {"pos": list(self.pos), "heading": self.heading, "stopped": self.stopped}
+            self.recorder.record(frontiers=self.last_ranked, extra=extra)
+            if self.done:
+                self.close()
+        return self.done
+
+    def close(self) -> None:
+        """Close the episode log, if any; `run` does this even when a step raises."""
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _step(self) -> None:
+        t = time.perf_counter()
+        rows, cols = visible_cells(self.gt, self.pos, self.heading, self._fov, self._range_cells)
+        truth = self.gt.grid[rows, cols]
+        new = self.og.grid[rows, cols] != truth
+        self.og.set_cells(rows[new], cols[new], truth[new])
+        self.seen_target[rows, cols] |= self.target[rows, cols]
+        t = self._timed("sense", t)
+
+        score, conf = self.scorer.score(self.cue[rows, cols], self.prompt)
+        obs = FovObservation(self.pos, self.heading, score, conf, fov_rad=self._fov, range_cells=self._range_cells)
+        self.vm.update_cells(rows, cols, score, fov_confidence(rows, cols, obs))
+        t = self._timed("value", t)
+
+        self.frontiers.refresh()
+        self.identity.update(self.frontiers.clusters())
+        t = self._timed("frontier", t)
+
+        if self._pending_turns:
+            self._pending_turns -= 1
+            self.heading += 0.5 * math.pi
+            for stage in STAGES[3:]:
+                t = self._timed(stage, t)
+        else:
+            path = self._plan(t)
+            if path is not None:
+                self._follow(path)
+
+    def _plan(self, t: float) -> list[tuple[int, int]] | None:
+        """Path toward the seen target or the best frontier; None to stop or turn."""
+        self.inflation.refresh()
+        # Walls seen late can put the robot inside the inflation band; let it
+        # step off through known free cells around it.
+        passable = self.inflation.traversable.copy()
+        k = self.inflation.radius_cells + 1
+        r, c = self.pos
+        r0, c0 = max(0, r - k), max(0, c - k)
+        passable[r0:r + k + 1, c0:c + k + 1] |= self.og.grid[r0:r + k + 1, c0:c + k + 1] == 0
+        res = self.og.resolution
+        if self.seen_target.any():
+            cost = chamfer_distance(passable, self.seen_target)
+            if cost[self.pos] != UNREACHABLE:
+                self.last_ranked = []
+                t = self._timed("geodesic", t)
+                t = self._timed("rank", t)
+                path = None
+                if cost[self.pos] * (res / ORTHO_COST) <= self.cfg.success_distance_m:
+                    self.stopped = True
+                else:
+                    path = _descend(cost, self.pos)
+                self._timed("plan", t)
+                return path
+            # Seen but not reachable on the known map yet: keep exploring.
+
+        cost = chamfer_distance(passable, np.array([self.pos]))
+        dist_m = np.where(cost == UNREACHABLE, np.inf, cost * (res / ORTHO_COST)).astype(np.float32)
+        t = self._timed("geodesic", t)
+        ranked = self.identity.rank(
+            self.vm,
+            radius_cells=self.cfg.radius_cells,
+            mode=self.cfg.score_mode,
+            distance_field=dist_m,
+            cost_key=(self.pos, self.og.version),
+            cost_weight=self.cfg.cost_weight,
+            stickiness=self.cfg.stickiness,
+        )
+        t = self._timed("rank", t)
+        self.last_ranked = ranked
+        if not ranked:
+            # Nothing left to explore and the target was never reached.
+            self.stopped = True
+            self._timed("plan", t)
+            return None
+        cells = np.asarray(ranked[0].cluster.cells, dtype=np.intp).reshape(-1, 2)
+        goal = cells[np.argmin(cost[cells[:, 0], cells[:, 1]])]
+        path = _descend(cost, (int(goal[0]), int(goal[1])))[::-1]
+        self._timed("plan", t)
+        if len(path) == 1:
+            # Standing on the frontier: turn to look past it.
+            self.heading += self._fov
+            return None
+        return path
+
+    def _follow(self, path: list[tuple[int, int]]) -> None:
+        prev = self.pos
+        for cell in path[1:self._step_cells + 1]:
+            self.path_length_m += self.og.resolution * math.hypot(cell[0] - prev[0], cell[1] - prev[1])
+            prev = cell
+        if prev != self.pos:
+            self.heading = math.atan2(prev[0] - self.pos[0], prev[1] - self.pos[1])
+            self.pos = (int(prev[0]), int(prev[1]))
+            self.trajectory.append(self.pos)
+
+    def run(self) -> EpisodeResult:
+        t0 = time.perf_counter()
+        try:
+            while not self.step():
+                pass
+        finally:
+            self.close()
+        wall = time.perf_counter() - t0
+        start_dist = float(self.gt_dist[self.plan.start_rc])
+        shortest = max(0.0, start_dist - self.cfg.success_distance_m)
+        spl = 0.0
+        if self.success:
+            spl = shortest / max(self.path_length_m, shortest) if shortest > 0 else 1.0
+        return EpisodeResult(
+            success=self.success,
+            spl=spl,
+            path_length_m=self.path_length_m,
+            shortest_path_m=shortest,
+            num_steps=self.steps,
+            wall_time_s=wall,
+            stage_ms=self.stage_ms,
+            trajectory=self.trajectory,
+        )
+
+
+def summarize(results: list[EpisodeResult]) -> dict:
+    """Aggregate episodes into the `results` block of a run's metrics.json."""
+    if not results:
+        return {"success_rate": None, "spl": None, "path_length": None, "num_steps": None}
+    steps = sum(r.num_steps for r in results)
+    wall = sum(r.wall_time_s for r in results)
+    latency = {}
+    for stage in STAGES:
+        ms = np.concatenate([np.asarray(r.stage_ms.get(stage, []), dtype=np.float64) for r in results])
+        if ms.size:
+            latency[stage] = {
+                "mean": float(ms.mean()),
+                "p50": float(np.percentile(ms, 50)),
+                "p95": float(np.percentile(ms, 95)),
+            }
+    return {
+        "success_rate": float(np.mean([r.success for r in results])),
+        "spl": float(np.mean([r.spl for r in results])),
+        "path_length": float(np.mean([r.path_length_m for r in results])),
+        "num_steps": float(np.mean([r.num_steps for r in results])),
+        "episodes": len(results),
+        "steps_per_sec": steps / wall if wall > 0 else None,
+        "latency_ms": latency,
+    }
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+CATEGORIES = ("chair", "bed", "toilet", "tv_monitor", "plant", "sofa")
+
+
+@dataclass
+class FloorPlan:
+    """Ground-truth map of a simulated scene.
+
+    - grid: int8 (H,W), 0 = free and 1 = occupied (walls and objects); no unknown cells
+    - objects: category -> (N,2) cells of every object of that category
+    - rooms: (R,4) half-open cell boxes of the room interiors
+    """
+    grid: np.ndarray
+    objects: dict[str, np.ndarray]
+    rooms: np.ndarray
+    start_rc: tuple[int, int]
+    resolution: float = 0.05
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.grid.shape
+
+    def occupancy(self) -> OccupancyGrid:
+        return OccupancyGrid(grid=self.grid, resolution=self.resolution)
+
+    def object_mask(self, category: str) -> np.ndarray:
+        mask = np.zeros(self.shape, dtype=bool)
+        cells = self.objects.get(category)
+        if cells is not None and len(cells):
+            mask[cells[:, 0], cells[:, 1]] = True
+        return mask
+
+
+def _split_rooms(
+    grid: np.ndarray,
+    box: tuple[int, int, int, int],
+    rng: np.random.Generator,
+    min_room: int,
+    wall: int,
+    door: int,
+    rooms: list,
+) -> None:
+    """Recursively split `box` with a wall that has one door, until rooms are small."""
+    r0, c0, r1, c1 = box
+    h, w = r1 - r0, c1 - c0
+    can_h = h >= 2 * min_room + wall
+    can_w = w >= 2 * min_room + wall
+    if not (can_h or can_w) or (rng.random() < 0.15 and len(rooms) > 1):
+        rooms.append(box)
+        return
+    horizontal = can_h and (not can_w or h > w or (h == w and rng.random() < 0.5))
+    for _attempt in range(20):
+        if horizontal:
+            k = int(rng.integers(r0 + min_room, r1 - min_room - wall + 1))
+            # Both wall ends must meet solid wall, not a door of an enclosing wall.
+            ends = grid[k - door:k + wall + door, [c0 - 1, c1]]
+        else:
+            k = int(rng.integers(c0 + min_room, c1 - min_room - wall + 1))
+            ends = grid[[r0 - 1, r1], k - door:k + wall + door]
+        if ends.all():
+            break
+    else:
+        rooms.append(box)
+        return
+    if horizontal:
+        d = int(rng.integers(c0, max(c0 + 1, c1 - door)))
+        grid[k:k + wall, c0:c1] = 1
+        grid[k:k + wall, d:d + door] = 0
+        _split_rooms(grid, (r0, c0, k, c1), rng, min_room, wall, door, rooms)
+        _split_rooms(grid, (k + wall, c0, r1, c1), rng, min_room, wall, door, rooms)
+    else:
+        d = int(rng.integers(r0, max(r0 + 1, r1 - door)))
+        grid[r0:r1, k:k + wall] = 1
+        grid[d:d + door, k:k + wall] = 0
+        _split_rooms(grid, (r0, c0, r1, k), rng, min_room, wall, door, rooms)
+        _split_rooms(grid, (r0, k + wall, r1, c1), rng, min_room, wall, door, rooms)
+
+
+def make_floor_plan(
+    h: int = 400,
+    w: int = 400,
+    seed: int = 0,
+    resolution: float = 0.05,
+    min_room_cells: int = 60,
+    wall_cells: int = 2,
+    door_cells: int = 18,
+    object_cells: int = 8,
+    objects_per_category: int = 1,
+    categories: tuple[str, ...] = CATEGORIES,
+    clearance_cells: int = 6,
+) -> FloorPlan:
+    """Random rooms-and-doors floor plan with square objects placed in rooms.
+
+    The interior is split recursively (binary space partitioning) by
+    `wall_cells` thick walls, each with one `door_cells` wide door, so every
+    room is reachable. Objects keep `clearance_cells` from walls and doors,
+    and the start cell is a free cell at least that far from any obstacle.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((h, w), dtype=np.int8)
+    grid[:wall_cells, :] = 1
+    grid[-wall_cells:, :] = 1
+    grid[:, :wall_cells] = 1
+    grid[:, -wall_cells:] = 1
+    rooms: list[tuple[int, int, int, int]] = []
+    _split_rooms(
+        grid, (wall_cells, wall_cells, h - wall_cells, w - wall_cells),
+        rng, min_room_cells, wall_cells, door_cells, rooms,
+    )
+
+    objects: dict[str, np.ndarray] = {}
+    k = object_cells
+    m = clearance_cells
+    for name in categories:
+        cells = []
+        for _ in range(objects_per_category):
+            for _attempt in range(50):
+                r0, c0, r1, c1 = rooms[int(rng.integers(len(rooms)))]
+                if r1 - r0 < k + 2 * m or c1 - c0 < k + 2 * m:
+                    continue
+                orr = int(rng.integers(r0 + m, r1 - m - k + 1))
+                oc = int(rng.integers(c0 + m, c1 - m - k + 1))
+                # Keep a free margin around the object so it never blocks a passage.
+                if grid[orr - m:orr + k + m, oc - m:oc + k + m].any():
+                    continue
+                grid[orr:orr + k, oc:oc + k] = 1
+                rr, cc = np.mgrid[orr:orr + k, oc:oc + k]
+                cells.append(np.stack([rr.ravel(), cc.ravel()], axis=1))
+                break
+        objects[name] = np.concatenate(cells).astype(np.int64) if cells else np.zeros((0, 2), dtype=np.int64)
+
+    # Start somewhere with clearance from every obstacle.
+    for _attempt in range(1000):
+        r, c = int(rng.integers(m, h - m)), int(rng.integers(m, w - m))
+        if not grid[r - m:r + m + 1, c - m:c + m + 1].any():
+            break
+    else:
+        r, c = (int(v) for v in np.argwhere(grid == 0)[0])
+
+    return FloorPlan(
+        grid=grid,
+        objects=objects,
+        rooms=np.array(rooms, dtype=np.int64).reshape(-1, 4),
+        start_rc=(r, c),
+        resolution=resolution,
+    )
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+import itertools
+import json
+from multiprocessing import shared_memory
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from vlfm_repro.sim.explorer import ExplorationConfig, ExplorationSim
+from vlfm_repro.sim.floorplan import FloorPlan, make_floor_plan
+
+# Per-episode columns of results.csv, after the swept parameters.
+RESULT_FIELDS = ("success", "spl", "path_length_m", "shortest_path_m", "num_steps", "wall_time_s", "steps_per_sec")
+
+
+def sweep_grid(**axes: Iterable) -> list[dict[str, Any]]:
+    """Cartesian product of parameter axes, e.g. ``sweep_grid(seed=[0, 1], radius_cells=[3, 6])``."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(axes[n]) for n in names))]
+
+
+def cell_key(params: dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+class SharedPlans:
+    """Ground-truth grids of several floor plans in one shared memory block.
+
+    The creating process owns the block; workers `attach` to it by name
+    and get `FloorPlan`s whose grids are read-only views of the block, so
+    no grid is pickled or copied per task. The small per-plan metadata
+    (objects, rooms, start) travels in `spec`.
+    """
+
+    def __init__(self, plans: dict[int, FloorPlan]) -> None:
+        total = sum(p.grid.nbytes for p in plans.values())
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, total))
+        entries = {}
+        offset = 0
+        for key, p in plans.items():
+            view = np.ndarray(p.grid.shape, dtype=np.int8, buffer=self.shm.buf, offset=offset)
+            view[...] = p.grid
+            entries[key] = {
+                "offset": offset,
+                "shape": p.grid.shape,
+                "objects": p.objects,
+                "rooms": p.rooms,
+                "start_rc": p.start_rc,
+                "resolution": p.resolution,
+            }
+            offset += p.grid.nbytes
+        self.spec = {"name": self.shm.name, "plans": entries}
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedPlans":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_plans(spec: dict) -> tuple[shared_memory.SharedMemory, dict[int, FloorPlan]]:
+    """Open the block described by `spec`; keep the returned handle alive while the plans are used."""
+    # Pool workers share their parent's resource tracker, so attaching
+    # registers nothing new and the creator's unlink stays the only cleanup.
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    plans = {}
+    for key, e in spec["plans"].items():
+        grid = np.ndarray(e["shape"], dtype=np.int8, buffer=shm.buf, offset=e["offset"])
+        grid.flags.writeable = False
+        plans[key] = FloorPlan(
+            grid=grid, objects=e["objects"], rooms=e["rooms"],
+            start_rc=e["start_rc"], resolution=e["resolution"],
+        )
+    return shm, plans
+
+
+# Worker-process state, set once by `_init_worker`.
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(spec: dict, settings: dict) -> None:
+    _WORKER["shm"], _WORKER["plans"] = attach_plans(spec)
+    _WORKER["settings"] = settings
+
+
+def run_cell(params: dict[str, Any], plans: dict[int, FloorPlan], settings: dict[str, Any]) -> dict[str, Any]:
+    """One episode: `params` holds `seed` plus any `ExplorationConfig` fields."""
+    config = dict(settings.get("config", {}))
+    config.update({k: v for k, v in params.items() if k != "seed"})
+    sim = ExplorationSim(plans[params["seed"]], settings["prompt"], ExplorationConfig(**config))
+    r = sim.run()
+    return {
+        **params,
+        "success": bool(r.success),
+        "spl": float(r.spl),
+        "path_length_m": float(r.path_length_m),
+        "shortest_path_m": float(r.shortest_path_m),
+        "num_steps": int(r.num_steps),
+        "wall_time_s": float(r.wall_time_s),
+        "steps_per_sec": float(r.steps_per_sec),
+    }
+
+
+def _run_in_worker(params: dict[str, Any]) -> dict[str, Any]:
+    return run_cell(params, _WORKER["plans"], _WORKER["settings"])
+
+
+def aggregate(rows: list[dict[str, Any]], params: list[str]) -> list[dict[str, Any]]:
+    """Mean metrics over seeds for every combination of the non-seed parameters."""
+    groups: dict[str, list[dict]] = {}
+    names = [p for p in params if p != "seed"]
+    for row in rows:
+        groups.setdefault(cell_key({n: row.get(n) for n in names}), []).append(row)
+    out = []
+    for key in sorted(groups):
+        g = groups[key]
+        steps = sum(r["num_steps"] for r in g)
+        wall = sum(r["wall_time_s"] for r in g)
+        out.append({
+            **json.loads(key),
+            "episodes": len(g),
+            "success_rate": float(np.mean([r["success"] for r in g])),
+            "spl": float(np.mean([r["spl"] for r in g])),
+            "path_length": float(np.mean([r["path_length_m"] for r in g])),
+            "num_steps": float(np.mean([r["num_steps"] for r in g])),
+            "steps_per_sec": steps / wall if wall > 0 else None,
+        })
+    return out
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def run_sweep(
+    cells: list[dict[str, Any]],
+    out_dir: str | Path,
+    map_size: tuple[int, int] = (400, 400),
+    prompt: str = "chair",
+    config: dict[str, Any] | None = None,
+    workers: int | None = None,
+    progress: bool = False,
+) -> list[dict[str, Any]]:
+    """Run every parameter cell (one episode each) over a process pool.
+
+    Each cell needs a `seed` (the floor plan) and may set any
+    `ExplorationConfig` field; `config` holds the fields shared by all
+    cells. Floor plans are built once in this process and shared with the
+    workers through `SharedPlans`.
+
+    Results stream into `out_dir` as episodes finish. `results.jsonl` is
+    the append-only progress log, `results.csv` has the same rows, and
+    `summary.json` (rewritten atomically after each episode) holds the
+    per-setting means from `aggregate`. Rerunning with the same `out_dir`
+    skips cells already in the log, so an interrupted sweep resumes where
+    it stopped. A cell that raises is listed under ``failed`` in
+    `summary.json` and left out of the log, so the other cells still run
+    and a rerun retries it; once every cell has been tried, a
+    `RuntimeError` reports the failures. `workers=0` runs in this process.
+    Returns all rows, including resumed ones.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    settings = {"map_size": list(map_size), "prompt": prompt, "config": dict(config or {})}
+    manifest = out / "sweep.json"
+    if manifest.exists():
+        if json.loads(manifest.read_text(encoding="utf-8")) != settings:
+            raise ValueError(f"{out} holds a sweep with different settings; use a new directory")
+    else:
+        _write_atomic(manifest, json.dumps(settings, indent=2, sort_keys=True))
+
+    log = out / "results.jsonl"
+    rows: list[dict[str, Any]] = []
+    if log.exists():
+        with open(log, encoding="utf-8") as f:
+            # A torn last line from an interrupted write is dropped and rerun.
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    param_names = sorted({k for c in cells for k in c})
+    done = {cell_key({k: r[k] for k in param_names if k in r}) for r in rows}
+    pending = [c for c in cells if cell_key(c) not in done]
+    remaining = [len(pending)]
+    failed: list[dict[str, Any]] = []
+
+    def write_summary() -> None:
+        summary = {
+            "settings": settings,
+            "completed": len(cells) - remaining[0],
+            "total": len(cells),
+            "failed": failed,
+            "results": aggregate(rows, param_names),
+        }
+        _write_atomic(out / "summary.json", json.dumps(summary, indent=2))
+
+    # Rewrite the log without any torn line before appending to it.
+    _write_atomic(log, "".join(json.dumps(r, sort_keys=True) + "\n" for r in rows))
+    fields = param_names + list(RESULT_FIELDS)
+    with open(log, "a", encoding="utf-8") as log_file, \
+            open(out / "results.csv", "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+        def record(row: dict[str, Any]) -> None:
+            rows.append(row)
+            remaining[0] -= 1
+            log_file.write(json.dumps(row, sort_keys=True) + "\n")
+            log_file.flush()
+            writer.writerow(row)
+            csv_file.flush()
+            write_summary()
+            if progress:
+                print(f"[{len(cells) - remaining[0]}/{len(cells)}] {cell_key({k: row[k] for k in param_names})} "
+                      f"success={row['success']} spl={row['spl']:.3f}", flush=True)
+
+        def record_failure(cell: dict[str, Any], exc: Exception) -> None:
+            failed.append({"params": cell, "error": f"{type(exc).__name__}: {exc}"})
+            write_summary()
+            if progress:
+                print(f"[failed] {cell_key(cell)} {failed[-1]['error']}", flush=True)
+
+        write_summary()
+        h, w = map_size
+        plans = {s: make_floor_plan(h, w, seed=s) for s in sorted({int(c["seed"]) for c in pending})}
+        if workers == 0:
+            for c in pending:
+                try:
+                    row = run_cell(c, plans, settings)
+                except Exception as e:
+                    record_failure(c, e)
+                else:
+                    record(row)
+        elif pending:
+            with SharedPlans(plans) as shared, ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(shared.spec, settings)
+            ) as pool:
+                cell_of = {pool.submit(_run_in_worker, c): c for c in pending}
+                futures = set(cell_of)
+                while futures:
+                    finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        try:
+                            row = fut.result()
+                        except Exception as e:
+                            record_failure(cell_of[fut], e)
+                        else:
+                            record(row)
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} of {len(cells)} sweep cells failed (see {out / 'summary.json'}); "
+            f"first: {cell_key(failed[0]['params'])} {failed[0]['error']}"
+        )
+    return rows
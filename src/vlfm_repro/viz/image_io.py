@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+# Image and animation output without an imaging library.
+#
+# PNGs are written with filter type 0 and zlib, which suits the large flat
+# areas of map frames. GIFs use one global color table; quantizing is a
+# single lookup in a nearest-color table over 5-bit-per-channel bins that
+# is built once per color table. The image data is "uncompressed" LZW: a
+# clear code every `_GIF_RUN` literals keeps the code width at 9 bits,
+# which makes the code stream a vectorized bit-packing job. Each GIF frame after the first only
+# carries the bounding box of the pixels that changed, which keeps per-step
+# animations of slowly growing maps small.
+
+from functools import lru_cache
+from pathlib import Path
+import shutil
+import struct
+import subprocess
+import zlib
+
+import numpy as np
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_COLOR_TYPES = {1: 0, 3: 2, 4: 6}  # channels -> gray, RGB, RGBA
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def encode_png(img: np.ndarray, level: int = 6) -> bytes:
+    """PNG bytes of an (H, W) gray or (H, W, 3|4) RGB(A) uint8 image."""
+    if img.dtype != np.uint8:
+        raise ValueError(f"expected a uint8 image, got {img.dtype}")
+    channels = 1 if img.ndim == 2 else img.shape[2]
+    if img.ndim not in (2, 3) or channels not in _PNG_COLOR_TYPES:
+        raise ValueError(f"expected (H, W), (H, W, 3) or (H, W, 4), got {img.shape}")
+    h, w = img.shape[:2]
+    raw = np.zeros((h, 1 + w * channels), dtype=np.uint8)  # column 0: filter type 0 (none)
+    raw[:, 1:] = img.reshape(h, w * channels)
+    ihdr = struct.pack(">IIBBBBB", w, h, 8, _PNG_COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join([
+        _PNG_SIGNATURE,
+        _png_chunk(b"IHDR", ihdr),
+        _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def write_png(path: str | Path, img: np.ndarray, level: int = 6) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_png(img, level))
+    return path
+
+
+_GIF_RUN = 250
+
+
+def _default_gif_colors() -> np.ndarray:
+    """6x6x6 color cube plus 40 extra grays."""
+    levels = np.rint(np.linspace(0, 255, 6))
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    grays = np.rint(np.linspace(0, 255, 42)[1:-1])
+    cube = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    return np.concatenate([cube, np.repeat(grays[:, None], 3, axis=1)]).astype(np.uint8)
+
+
+GIF_COLORS = _default_gif_colors()
+
+
+@lru_cache(maxsize=8)
+def _nearest_color_lut(colors: bytes) -> np.ndarray:
+    """Index of the nearest color for every 5-bit-per-channel RGB bin (flat, 32768 entries)."""
+    table = np.frombuffer(colors, dtype=np.uint8).reshape(-1, 3).astype(np.float32)
+    centers = (np.arange(32, dtype=np.float32) * 8 + 3.5)
+    r, g, b = np.meshgrid(centers, centers, centers, indexing="ij")
+    bins = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    lut = np.empty(len(bins), dtype=np.uint8)
+    for i in range(0, len(bins), 4096):
+        d = ((bins[i:i + 4096, None, :] - table[None]) ** 2).sum(axis=2)
+        lut[i:i + 4096] = d.argmin(axis=1)
+    return lut
+
+
+def _color_table(colors: np.ndarray | None) -> np.ndarray:
+    table = GIF_COLORS if colors is None else np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+    if not 1 <= len(table) <= 256:
+        raise ValueError(f"a GIF color table holds 1 to 256 colors, got {len(table)}")
+    return table
+
+
+def quantize_rgb(img: np.ndarray, colors: np.ndarray | None = None) -> np.ndarray:
+    """(H, W) indices into `colors` (default `GIF_COLORS`) of an (H, W, 3) uint8 image.
+
+    Colors are matched per 5-bit-per-channel bin, so colors of the table
+    that share a bin may be merged.
+    """
+    lut = _nearest_color_lut(_color_table(colors).tobytes())
+    q = img >> 3
+    flat = q[..., 0].astype(np.uint16) << 10
+    flat |= q[..., 1].astype(np.uint16) << 5
+    flat |= q[..., 2]
+    return lut.take(flat)
+
+
+def _lzw_literal_stream(indices: np.ndarray) -> bytes:
+    """GIF image data (LZW minimum code size 8) that only uses literal codes."""
+    clear, end = 256, 257
+    pix = indices.ravel().astype(np.uint16)
+    n = pix.size
+    runs = -(-n // _GIF_RUN)
+    codes = np.full((runs, _GIF_RUN + 1), clear, dtype=np.uint16)
+    body = np.zeros(runs * _GIF_RUN, dtype=np.uint16)
+    body[:n] = pix
+    codes[:, 1:] = body.reshape(runs, _GIF_RUN)
+    codes = np.append(codes.reshape(-1)[: n + runs], np.uint16(end))
+    bits = ((codes[:, None] >> np.arange(9, dtype=np.uint16)) & 1).astype(np.uint8)
+    data = np.packbits(bits.reshape(-1), bitorder="little").tobytes()
+    blocks = [bytes((8,))]
+    for i in range(0, len(data), 255):
+        chunk = data[i:i + 255]
+        blocks += [bytes((len(chunk),)), chunk]
+    blocks.append(b"\x00")
+    return b"".join(blocks)
+
+
+class GifWriter:
+    """Animated GIF written frame by frame; all frames must have the first frame's size.
+
+    `colors` is the global color table, at most 256 RGB rows (default
+    `GIF_COLORS`); `Palette.gif_colors` suits frames from `render_map`.
+    """
+
+    def __init__(self, path: str | Path, fps: float = 10.0, loop: int = 0, colors: np.ndarray | None = None) -> None:
+        self.colors = np.zeros((256, 3), dtype=np.uint8)
+        table = _color_table(colors)
+        self.colors[:len(table)] = table
+        self._table = table
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.delay_cs = max(1, round(100 / fps))
+        self.loop = loop
+        self.frames = 0
+        self._f = open(self.path, "wb")
+        self._prev: np.ndarray | None = None
+
+    def append(self, img: np.ndarray) -> None:
+        idx = quantize_rgb(img, self._table)
+        h, w = idx.shape
+        if self._prev is None:
+            self._f.write(b"GIF89a" + struct.pack("<HHBBB", w, h, 0xF7, 0, 0) + self.colors.tobytes())
+            self._f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\x00")
+            r0, c0, r1, c1 = 0, 0, h, w
+        else:
+            if idx.shape != self._prev.shape:
+                raise ValueError(f"frame size {idx.shape} differs from the first frame's {self._prev.shape}")
+            changed = idx != self._prev
+            rows = np.flatnonzero(changed.any(axis=1))
+            if rows.size:
+                cols = np.flatnonzero(changed.any(axis=0))
+                r0, c0, r1, c1 = int(rows[0]), int(cols[0]), int(rows[-1]) + 1, int(cols[-1]) + 1
+            else:
+                r0, c0, r1, c1 = 0, 0, 1, 1  # An unchanged frame still needs one pixel to carry its delay.
+        # Graphic control: disposal 1 (keep the previous frame under this one), no transparency.
+        self._f.write(b"\x21\xf9\x04\x04" + struct.pack("<H", self.delay_cs) + b"\x00\x00")
+        self._f.write(b"\x2c" + struct.pack("<HHHHB", c0, r0, c1 - c0, r1 - r0, 0))
+        self._f.write(_lzw_literal_stream(idx[r0:r1, c0:c1]))
+        self._prev = idx
+        self.frames += 1
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.write(b"\x3b")
+            self._f.close()
+
+    def __enter__(self) -> "GifWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PngSequenceWriter:
+    """Numbered PNG files ``<prefix>_000000.png``, ... in a directory."""
+
+    def __init__(self, directory: str | Path, prefix: str = "frame", level: int = 3) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.level = level
+        self.frames = 0
+
+    def append(self, img: np.ndarray) -> None:
+        write_png(self.directory / f"{self.prefix}_{self.frames:06d}.png", img, self.level)
+        self.frames += 1
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PngSequenceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FfmpegWriter:
+    """Video encoded by an ``ffmpeg`` subprocess fed raw RGB frames on stdin."""
+
+    def __init__(self, path: str | Path, fps: float = 10.0, codec: str = "libx264", crf: int = 23) -> None:
+        exe = shutil.which("ffmpeg")
+        if exe is None:
+            raise RuntimeError("ffmpeg not found on PATH; write a .gif or a PNG sequence instead")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.cmd = [exe, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-r", str(fps)]
+        self.out_args = ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", codec, "-crf", str(crf),
+                         "-pix_fmt", "yuv420p", str(self.path)]
+        self.frames = 0
+        self._proc: subprocess.Popen | None = None
+        self._shape: tuple[int, ...] | None = None
+
+    def append(self, img: np.ndarray) -> None:
+        if self._proc is None:
+            self._shape = img.shape
+            h, w = img.shape[:2]
+            self._proc = subprocess.Popen(self.cmd + ["-s", f"{w}x{h}", "-i", "-"] + self.out_args, stdin=subprocess.PIPE)
+        elif img.shape != self._shape:
+            raise ValueError(f"frame size {img.shape} differs from the first frame's {self._shape}")
+        self._proc.stdin.write(np.ascontiguousarray(img, dtype=np.uint8).tobytes())
+        self.frames += 1
+
+    def close(self) -> None:
+        if self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with status {self._proc.returncode}")
+            self._proc = None
+
+    def __enter__(self) -> "FfmpegWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_frame_writer(
+    path: str | Path, fps: float = 10.0, colors: np.ndarray | None = None
+) -> GifWriter | PngSequenceWriter | FfmpegWriter:
+    """GIF for ``*.gif`` (with color table `colors`), ffmpeg video for ``*.mp4`` / ``*.mkv`` / ``*.webm``,
+    else a PNG sequence directory."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gif":
+        return GifWriter(path, fps, colors=colors)
+    if suffix in (".mp4", ".mkv", ".webm"):
+        return FfmpegWriter(path, fps, codec="libvpx-vp9" if suffix == ".webm" else "libx264")
+    return PngSequenceWriter(path)
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+# Headless map rendering straight into RGB uint8 buffers.
+#
+# Each cell costs one lookup in a per-palette table of packed RGBA pixels,
+# indexed by the grid byte alone or, with a value map, by (grid class,
+# quantized confidence, 8-bit value) with the heatmap blend precomputed.
+# Markers and the tiny digit font are cached offset stamps scattered into
+# the RGB image after upscaling.
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+
+RGB = tuple[int, int, int]
+
+# Colormap anchors sampled from matplotlib's maps at 9 evenly spaced points.
+_COLORMAPS: dict[str, tuple[RGB, ...]] = {
+    "viridis": ((68, 1, 84), (71, 44, 122), (59, 81, 139), (44, 113, 142), (33, 144, 141),
+                (39, 173, 129), (92, 200, 99), (170, 220, 50), (253, 231, 37)),
+    "magma": ((0, 0, 4), (28, 16, 68), (79, 18, 123), (129, 37, 129), (181, 54, 122),
+              (229, 80, 100), (251, 135, 97), (254, 194, 135), (252, 253, 191)),
+    "gray": ((0, 0, 0), (255, 255, 255)),
+}
+
+
+@lru_cache(maxsize=None)
+def colormap_lut(name: str, n: int = 256) -> np.ndarray:
+    """(n, 3) uint8 table interpolating the named colormap's anchors."""
+    try:
+        anchors = np.array(_COLORMAPS[name], dtype=np.float64)
+    except KeyError:
+        raise ValueError(f"unknown colormap {name!r}; choose from {sorted(_COLORMAPS)}") from None
+    x = np.linspace(0.0, 1.0, len(anchors))
+    t = np.linspace(0.0, 1.0, n)
+    lut = np.stack([np.interp(t, x, anchors[:, k]) for k in range(3)], axis=1)
+    lut = np.rint(lut).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+# Confidence is quantized to this many blend weights.
+ALPHA_LEVELS = 16
+
+
+def _pack(rgb: np.ndarray) -> np.ndarray:
+    """uint32 pixels whose little-endian bytes are R, G, B, 255."""
+    rgb = np.asarray(rgb, dtype=np.uint32)
+    return (rgb[..., 0] | rgb[..., 1] << 8 | rgb[..., 2] << 16 | np.uint32(255) << 24).astype("<u4")
+
+
+def _unpack(px: np.ndarray) -> np.ndarray:
+    """(..., 3) uint8 RGB of `_pack`ed pixels."""
+    return np.ascontiguousarray(px.view(np.uint8).reshape(px.shape + (4,))[..., :3])
+
+
+@dataclass(frozen=True)
+class Palette:
+    unknown: RGB = (64, 64, 72)
+    free: RGB = (232, 232, 228)
+    occupied: RGB = (24, 24, 24)
+    frontier: RGB = (31, 119, 180)
+    # Ranked centroid colors, best first; reused cyclically.
+    ranked: tuple[RGB, ...] = ((214, 39, 40), (255, 127, 14), (44, 160, 44), (148, 103, 189))
+    heatmap: str = "magma"
+    heat_alpha: float = 0.55
+
+    @cached_property
+    def grid_classes(self) -> np.ndarray:
+        """(256,) table from a grid byte to 0 free, 1 occupied, 2 unknown (-1 reads as 255)."""
+        cls = np.full(256, 2, dtype=np.uint8)
+        cls[0], cls[1] = 0, 1
+        cls.flags.writeable = False
+        return cls
+
+    @cached_property
+    def grid_lut(self) -> np.ndarray:
+        """(256,) packed colors indexed by grid byte."""
+        lut = _pack(np.array([self.free, self.occupied, self.unknown]))[self.grid_classes]
+        lut.flags.writeable = False
+        return lut
+
+    @cached_property
+    def blend_lut(self) -> np.ndarray:
+        """(3 * ALPHA_LEVELS * 256,) packed colors of (grid class, confidence level, value level)."""
+        base = np.array([self.free, self.occupied, self.unknown], dtype=np.float64)[:, None, None]
+        heat = colormap_lut(self.heatmap).astype(np.float64)[None, None]
+        a = (self.heat_alpha * np.linspace(0.0, 1.0, ALPHA_LEVELS))[None, :, None, None]
+        lut = _pack(np.rint(base * (1.0 - a) + heat * a)).reshape(-1)
+        lut.flags.writeable = False
+        return lut
+
+    @cached_property
+    def gif_colors(self) -> np.ndarray:
+        """(256, 3) GIF color table for `render_map` frames.
+
+        The palette's own colors exactly, then heatmap blends over free,
+        unknown and occupied cells at a few confidence levels.
+        """
+        fixed = np.array([self.unknown, self.free, self.occupied, self.frontier, *self.ranked], dtype=np.uint8)
+        blends = _unpack(self.blend_lut).reshape(3, ALPHA_LEVELS, 256, 3)
+        thirds = [ALPHA_LEVELS // 3, 2 * ALPHA_LEVELS // 3, ALPHA_LEVELS - 1]
+        samples = [
+            blends[0][thirds][:, np.linspace(0, 255, 40).astype(int)],
+            blends[2][thirds][:, np.linspace(0, 255, 32).astype(int)],
+            blends[1][ALPHA_LEVELS - 1][np.linspace(0, 255, 32).astype(int)],
+        ]
+        table = np.concatenate([fixed] + [s.reshape(-1, 3) for s in samples])[:256]
+        table.flags.writeable = False
+        return table
+
+
+DEFAULT_PALETTE = Palette()
+
+
+def quantize(values: np.ndarray, vmin: float = 0.0, vmax: float = 1.0, levels: int = 256) -> np.ndarray:
+    """Map `values` linearly onto 0..levels-1 (clipped; NaN reads as 0)."""
+    scale = (levels - 1) / max(vmax - vmin, 1e-12)
+    q = np.nan_to_num((values - vmin) * scale + 0.5, nan=0.0)
+    return np.clip(q, 0.0, levels - 1).astype(np.uint8)
+
+
+def _render_packed(
+    grid: np.ndarray,
+    value: np.ndarray | None,
+    conf: np.ndarray | None,
+    palette: Palette,
+    vmin: float,
+    vmax: float,
+) -> np.ndarray:
+    g = np.ascontiguousarray(grid, dtype=np.int8).view(np.uint8)
+    if value is None:
+        return palette.grid_lut.take(g)
+    # One table lookup per cell: index = (class * ALPHA_LEVELS + confidence level) * 256 + value level.
+    idx = palette.grid_classes.take(g).astype(np.int32) * ALPHA_LEVELS
+    if conf is None:
+        idx += ALPHA_LEVELS - 1
+    else:
+        idx += quantize(conf, 0.0, 1.0, ALPHA_LEVELS)
+    idx <<= 8
+    idx += quantize(value, vmin, vmax)
+    return palette.blend_lut.take(idx)
+
+
+def render_grid(
+    grid: np.ndarray,
+    value: np.ndarray | None = None,
+    conf: np.ndarray | None = None,
+    palette: Palette = DEFAULT_PALETTE,
+    vmin: float = 0.0,
+    vmax: float = 1.0,
+) -> np.ndarray:
+    """(H, W, 3) uint8 image of an int8 occupancy grid, with the value map blended in when given.
+
+    The heatmap's weight is ``palette.heat_alpha``, scaled by `conf`
+    (clipped to [0, 1]) when given, so unobserved cells keep their grid color.
+    """
+    return _unpack(_render_packed(grid, value, conf, palette, vmin, vmax))
+
+
+def upscale(img: np.ndarray, scale: int, flip: bool = False) -> np.ndarray:
+    """Nearest-neighbour `scale`x enlargement, rows reversed first with ``flip=True``.
+
+    Returns `img` itself when there is nothing to do, else a new contiguous array.
+    """
+    src = img[::-1] if flip else img
+    if scale == 1:
+        return np.ascontiguousarray(src)
+    # Columns first, so that the row repeat copies whole contiguous rows.
+    return np.repeat(np.repeat(src, scale, axis=1), scale, axis=0)
+
+
+@lru_cache(maxsize=None)
+def marker_stamp(shape: str, radius: int, width: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """Row and column offsets of a marker's pixels around its center.
+
+    Shapes: "o" ring, "disc", "x", "+", "s" square outline, "^" filled triangle.
+    """
+    d = np.arange(-radius, radius + 1)
+    dr, dc = np.meshgrid(d, d, indexing="ij")
+    dist = np.hypot(dr, dc)
+    if shape == "o":
+        m = (dist <= radius + 0.5) & (dist > radius + 0.5 - width)
+    elif shape == "disc":
+        m = dist <= radius + 0.5
+    elif shape == "x":
+        m = np.abs(np.abs(dr) - np.abs(dc)) < width
+    elif shape == "+":
+        m = (np.abs(dr) < width) | (np.abs(dc) < width)
+    elif shape == "s":
+        m = np.maximum(np.abs(dr), np.abs(dc)) > radius - width
+    elif shape == "^":
+        m = 2 * np.abs(dc) <= dr + radius
+    else:
+        raise ValueError(f"unknown marker shape {shape!r}")
+    return dr[m], dc[m]
+
+
+def draw_markers(
+    img: np.ndarray,
+    centers_px: np.ndarray,
+    color: RGB,
+    shape: str = "o",
+    radius: int = 3,
+    width: int = 1,
+) -> np.ndarray:
+    """Stamp a marker at each (row, col) pixel center, clipped to the image."""
+    centers = np.asarray(centers_px, dtype=np.int64).reshape(-1, 2)
+    dr, dc = marker_stamp(shape, radius, width)
+    rr = (centers[:, :1] + dr).ravel()
+    cc = (centers[:, 1:] + dc).ravel()
+    keep = (rr >= 0) & (rr < img.shape[0]) & (cc >= 0) & (cc < img.shape[1])
+    img[rr[keep], cc[keep]] = color
+    return img
+
+
+# 3x5 glyphs, one string of 0/1 per row. Lowercase text is drawn in uppercase.
+_GLYPHS = {
+    "0": ("111", "101", "101", "101", "111"), "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"), "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"), "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"), "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"), "9": ("111", "101", "111", "001", "111"),
+    ".": ("000", "000", "000", "000", "010"), ":": ("000", "010", "000", "010", "000"),
+    "-": ("000", "000", "111", "000", "000"), "#": ("101", "111", "101", "111", "101"),
+    " ": ("000", "000", "000", "000", "000"),
+    "A": ("010", "101", "111", "101", "101"), "B": ("110", "101", "110", "101", "110"),
+    "C": ("011", "100", "100", "100", "011"), "D": ("110", "101", "101", "101", "110"),
+    "E": ("111", "100", "110", "100", "111"), "F": ("111", "100", "110", "100", "100"),
+    "G": ("011", "100", "101", "101", "011"), "H": ("101", "101", "111", "101", "101"),
+    "I": ("111", "010", "010", "010", "111"), "J": ("001", "001", "001", "101", "010"),
+    "K": ("101", "101", "110", "101", "101"), "L": ("100", "100", "100", "100", "111"),
+    "M": ("101", "111", "111", "101", "101"), "N": ("110", "101", "101", "101", "101"),
+    "O": ("010", "101", "101", "101", "010"), "P": ("110", "101", "110", "100", "100"),
+    "Q": ("010", "101", "101", "110", "011"), "R": ("110", "101", "110", "101", "101"),
+    "S": ("011", "100", "010", "001", "110"), "T": ("111", "010", "010", "010", "010"),
+    "U": ("101", "101", "101", "101", "111"), "V": ("101", "101", "101", "101", "010"),
+    "W": ("101", "101", "111", "111", "101"), "X": ("101", "101", "010", "101", "101"),
+    "Y": ("101", "101", "010", "010", "010"), "Z": ("111", "001", "010", "100", "111"),
+    "_": ("000", "000", "000", "000", "111"), "(": ("001", "010", "010", "010", "001"),
+    ")": ("100", "010", "010", "010", "100"), "=": ("000", "111", "000", "111", "000"),
+    ",": ("000", "000", "000", "010", "100"), "/": ("001", "001", "010", "100", "100"),
+    "+": ("000", "010", "111", "010", "000"),
+}
+GLYPH_SIZE = (5, 3)
+
+
+@lru_cache(maxsize=1024)
+def _text_stamp(text: str, scale: int) -> tuple[np.ndarray, np.ndarray]:
+    try:
+        rows = ["0".join(_GLYPHS[ch][r] for ch in text.upper()) for r in range(GLYPH_SIZE[0])]
+    except KeyError as e:
+        raise ValueError(f"no glyph for {e.args[0]!r}; available: {''.join(sorted(_GLYPHS))!r}") from None
+    bits = np.array([[ch == "1" for ch in row] for row in rows], dtype=bool)
+    bits = np.kron(bits, np.ones((scale, scale), dtype=bool))
+    return np.nonzero(bits)
+
+
+def draw_text(img: np.ndarray, top_left_px: tuple[int, int], text: str, color: RGB, scale: int = 1) -> np.ndarray:
+    """Draw letters, digits and ``.:-#_()=,/+`` with a 3x5 pixel font, clipped to the image."""
+    dr, dc = _text_stamp(text, scale)
+    rr, cc = dr + int(top_left_px[0]), dc + int(top_left_px[1])
+    keep = (rr >= 0) & (rr < img.shape[0]) & (cc >= 0) & (cc < img.shape[1])
+    img[rr[keep], cc[keep]] = color
+    return img
+
+
+def add_caption(
+    img: np.ndarray,
+    title: str = "",
+    legend: Sequence[tuple[str, RGB, str]] = (),
+    palette: Palette = DEFAULT_PALETTE,
+    scale: int = 2,
+) -> np.ndarray:
+    """`img` below a strip with a `title` line and one line per legend entry.
+
+    Legend entries are ``(label, color, marker shape)``; each line shows the
+    marker, then the label. The strip uses the palette's free color with
+    occupied-colored text, so captioned frames keep to `Palette.gif_colors`.
+    """
+    lines = ([title] if title else []) + [label for label, _, _ in legend]
+    if not lines:
+        return img
+    pad = 2 * scale
+    line_h = (GLYPH_SIZE[0] + 3) * scale
+    strip = np.empty((pad + line_h * len(lines), img.shape[1], 3), dtype=np.uint8)
+    strip[...] = palette.free
+    radius = GLYPH_SIZE[0] * scale // 2
+    indent = pad + 2 * radius + 2 * scale
+    for i, text in enumerate(lines):
+        top = pad + i * line_h
+        left = pad
+        if i >= len(lines) - len(legend):
+            _, color, shape = legend[i - len(lines) + len(legend)]
+            draw_markers(strip, (top + radius, pad + radius), color, shape, radius, max(1, scale // 2))
+            left = indent
+        draw_text(strip, (top, left), text, palette.occupied, scale)
+    return np.concatenate([strip, img])
+
+
+def _ranked_arrays(ranked: Sequence[RankedFrontier] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Centroids (N, 2) and scores of ranked frontiers or of episode-log frontier records."""
+    if isinstance(ranked, np.ndarray):
+        return np.stack([ranked["centroid_r"], ranked["centroid_c"]], axis=1), ranked["score"]
+    rc = np.array([rf.cluster.centroid_rc for rf in ranked], dtype=np.float64).reshape(-1, 2)
+    return rc, np.array([rf.score for rf in ranked], dtype=np.float64)
+
+
+def cell_to_px(rc: np.ndarray, shape: tuple[int, int], scale: int, origin_lower: bool) -> np.ndarray:
+    """Pixel centers of (row, col) cell coordinates in an image made by `render_map`."""
+    rc = np.asarray(rc, dtype=np.float64).reshape(-1, 2)
+    r = shape[0] - 1 - rc[:, 0] if origin_lower else rc[:, 0]
+    return np.floor((np.stack([r, rc[:, 1]], axis=1) + 0.5) * scale).astype(np.int64)
+
+
+def render_map(
+    grid: np.ndarray,
+    value: np.ndarray | None = None,
+    conf: np.ndarray | None = None,
+    frontiers: np.ndarray | Sequence[tuple[int, int]] | None = None,
+    ranked: Sequence[RankedFrontier] | np.ndarray | None = None,
+    palette: Palette = DEFAULT_PALETTE,
+    scale: int = 1,
+    origin_lower: bool = True,
+    vmin: float = 0.0,
+    vmax: float = 1.0,
+    top_k: int = 3,
+    markers: str = "x",
+    labels: bool = True,
+) -> np.ndarray:
+    """One RGB frame of the maps.
+
+    `frontiers` is a boolean (H, W) mask or a list / (N, 2) array of cells.
+    `ranked` are `RankedFrontier`s or `FRONTIER_DTYPE` records from an
+    episode log, best first; the first `top_k` get a marker in their
+    palette color and, with `labels`, a ``#rank:score`` label.
+    ``origin_lower=True`` puts row 0 at the bottom like ``imshow(origin="lower")``.
+    """
+    h, w = grid.shape
+    px = _render_packed(grid, value, conf, palette, vmin, vmax)
+    if frontiers is not None:
+        f = np.asarray(frontiers)
+        color = _pack(np.array(palette.frontier))
+        if f.dtype == bool and f.shape == (h, w):
+            px[f] = color
+        elif f.size:
+            f = f.reshape(-1, 2).astype(np.intp, copy=False)
+            px[f[:, 0], f[:, 1]] = color
+    img = upscale(_unpack(px), scale, flip=origin_lower)
+
+    if ranked is not None and top_k > 0 and len(ranked):
+        rc, scores = _ranked_arrays(ranked[:top_k])
+        centers = cell_to_px(rc, (h, w), scale, origin_lower)
+        radius = max(2, 2 * scale)
+        width = max(1, scale // 2)
+        text_scale = max(1, scale // 2)
+        # Worst first so the best stays on top where markers overlap.
+        for i in range(len(centers) - 1, -1, -1):
+            color = palette.ranked[i % len(palette.ranked)]
+            draw_markers(img, centers[i], color, markers, radius, width)
+            if labels:
+                top = centers[i, 0] - radius - GLYPH_SIZE[0] * text_scale
+                draw_text(img, (top, centers[i, 1] + radius + 1), f"#{i + 1}:{scores[i]:.2f}", color, text_scale)
+    return img
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import time
+from typing import Tuple
+
+import numpy as np
+
+from vlfm_repro.profiling import profiled
+from vlfm_repro.vlm.scorers import VLMScorer, score_batch
+
+
+@dataclass
+class _Request:
+    image: np.ndarray
+    prompt: str
+    future: Future
+    enqueued: float
+
+
+class MicroBatcher:
+    """Collects `score` requests from many callers into batches.
+
+    A collector thread takes queued requests until `max_batch_size` is
+    reached or the oldest request has waited `max_delay_s`, then runs the
+    batch through `score_batch` on `executor` and resolves each caller's
+    future. With a process pool, `scorer` must be picklable.
+
+    At most `max_in_flight` batches are handed to the executor at once
+    (default: its worker count), so a slow scorer backs requests up in this
+    queue, where they show in `queue_depth` and join larger batches.
+
+    The batcher itself satisfies `VLMScorer`: `score()` submits and blocks.
+    """
+
+    def __init__(
+        self,
+        scorer: VLMScorer,
+        max_batch_size: int = 16,
+        max_delay_s: float = 0.005,
+        executor: Executor | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_in_flight is None:
+            # Thread and process pools both keep their size in _max_workers.
+            max_in_flight = getattr(executor, "_max_workers", 1) if executor is not None else 1
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.scorer = scorer
+        self.max_batch_size = int(max_batch_size)
+        self.max_delay_s = float(max_delay_s)
+        self.max_in_flight = int(max_in_flight)
+        self._owns_executor = executor is None
+        self._executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+
+        self._queue: deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._in_flight_batches = 0
+        self._in_flight = 0
+        self._batch_sizes: Counter[int] = Counter()
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+        self._thread = threading.Thread(target=self._collect, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image: np.ndarray, prompt: str) -> Future:
+        """Queue one pair; the future resolves to (score, confidence)."""
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.append(_Request(image, prompt, fut, time.perf_counter()))
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify()
+        return fut
+
+    @profiled("vlm.batcher.score", size=lambda self, image, prompt: np.size(image))
+    def score(self, image: np.ndarray, prompt: str) -> Tuple[float, float]:
+        return self.submit(image, prompt).result()
+
+    def stats(self) -> dict:
+        """Counters for tuning batch size against latency."""
+        with self._cond:
+            batches = sum(self._batch_sizes.values())
+            dispatched = sum(k * v for k, v in self._batch_sizes.items())
+            return {
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self._in_flight,
+                "batches": batches,
+                "mean_batch_size": dispatched / batches if batches else 0.0,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "mean_queue_wait_ms": 1e3 * self._wait_total_s / dispatched if dispatched else 0.0,
+                "max_queue_wait_ms": 1e3 * self._wait_max_s,
+            }
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting requests; queued requests are still scored."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _collect(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                while self._in_flight_batches >= self.max_in_flight:
+                    self._cond.wait()
+                deadline = self._queue[0].enqueued + self.max_delay_s
+                while len(self._queue) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                n = min(self.max_batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(n)]
+
+            now = time.perf_counter()
+            batch = [req for req in batch if req.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            with self._cond:
+                self._in_flight_batches += 1
+                self._in_flight += len(batch)
+                self._batch_sizes[len(batch)] += 1
+                for req in batch:
+                    wait = now - req.enqueued
+                    self._wait_total_s += wait
+                    self._wait_max_s = max(self._wait_max_s, wait)
+
+            images = [req.image for req in batch]
+            prompts = [req.prompt for req in batch]
+            try:
+                job = self._executor.submit(score_batch, self.scorer, images, prompts)
+            except Exception as exc:  # executor shut down underneath us
+                self._resolve(batch, None, exc)
+                continue
+            job.add_done_callback(lambda f, batch=batch: self._finish(batch, f))
+
+    def _finish(self, batch: list[_Request], job: Future) -> None:
+        exc = job.exception()
+        self._resolve(batch, None if exc else job.result(), exc)
+
+    def _resolve(self, batch: list[_Request], results: list | None, exc: BaseException | None) -> None:
+        if exc is None and len(results) != len(batch):
+            exc = RuntimeError(f"scorer returned {len(results)} results for {len(batch)} requests")
+        for i, req in enumerate(batch):
+            if exc is None:
+                req.future.set_result(tuple(results[i]))
+            else:
+                req.future.set_exception(exc)
+        with self._cond:
+            self._in_flight_batches -= 1
+            self._in_flight -= len(batch)
+            if exc is None:
+                self._completed += len(batch)
+            else:
+                self._failed += len(batch)
+            self._cond.notify()
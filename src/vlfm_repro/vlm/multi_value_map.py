@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+@dataclass
+class MultiValueMap:
+    """Value + confidence maps for K prompts, stored as contiguous (K,H,W) stacks.
+
+    Channel k fuses exactly like a `ValueMap`, but a patch update touches all
+    K channels in one vectorized pass, and spatial kernels and per-channel
+    confidences can be broadcast instead of materialized K times.
+
+    - value:   float32 (K,H,W)
+    - conf:    float32 (K,H,W)
+    - prompts: one label per channel
+    """
+    value: np.ndarray
+    conf: np.ndarray
+    prompts: tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        if self.value.ndim != 3 or self.value.shape != self.conf.shape:
+            raise ValueError("value and conf must both be (K,H,W)")
+        if len(self.prompts) != self.value.shape[0]:
+            raise ValueError("need one prompt per channel")
+        self.prompts = tuple(self.prompts)
+
+    @classmethod
+    def zeros(cls, prompts: Sequence[str], h: int, w: int) -> "MultiValueMap":
+        k = len(prompts)
+        return cls(
+            value=np.zeros((k, h, w), dtype=np.float32),
+            conf=np.zeros((k, h, w), dtype=np.float32),
+            prompts=tuple(prompts),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.value.shape[1:]
+
+    def channel(self, prompt: str | int) -> ValueMap:
+        """Zero-copy `ValueMap` view of one channel, by prompt or index."""
+        k = self.prompts.index(prompt) if isinstance(prompt, str) else int(prompt)
+        return ValueMap(value=self.value[k], conf=self.conf[k])
+
+    def update_patch(
+        self,
+        r0: int, c0: int,
+        patch_value: np.ndarray,
+        patch_conf: np.ndarray,
+    ) -> None:
+        """Fuse a patch into all channels via confidence-weighted averaging.
+
+        `patch_value` and `patch_conf` must broadcast to (K,ph,pw), e.g. a
+        (K,1,1) confidence per prompt against a (K,ph,pw) value patch.
+        """
+        k = self.value.shape[0]
+        patch_value = np.asarray(patch_value)
+        ph, pw = patch_value.shape[-2:]
+        r1, c1 = r0 + ph, c0 + pw
+        v_old = self.value[:, r0:r1, c0:c1]
+        c_old = self.conf[:, r0:r1, c0:c1]
+
+        c_new = np.broadcast_to(np.clip(patch_conf, 0.0, 1.0).astype(np.float32), (k, ph, pw))
+        v_new = np.broadcast_to(np.clip(patch_value, 0.0, 1.0).astype(np.float32), (k, ph, pw))
+
+        denom = (c_old + c_new)
+        out = np.where(denom > 1e-6, (c_old * v_old + c_new * v_new) / denom, v_old)
+
+        self.value[:, r0:r1, c0:c1] = out
+        self.conf[:, r0:r1, c0:c1] = np.clip(denom, 0.0, 1.0)
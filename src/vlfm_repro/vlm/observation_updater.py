@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
 import numpy as np
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.visibility import visible_cells
+from vlfm_repro.profiling import profiled
 from vlfm_repro.vlm.value_map import ValueMap
+from vlfm_repro.vlm.multi_value_map import MultiValueMap
 
 
 @dataclass
@@ -13,26 +20,224 @@ class Observation:
     radius_cells: int = 12
 
 
-def apply_observation(vm: ValueMap, obs: Observation) -> None:
-    """
-    Apply a gaussian patch to the map using the existing vm.update_patch(...)
-    without changing ValueMap internals.
+@dataclass
+class MultiObservation:
+    """One observation scored against every prompt of a `MultiValueMap`."""
+    center_rc: tuple[int, int]
+    scores: Sequence[float]
+    confidences: Sequence[float]
+    radius_cells: int = 12
+
+
+@dataclass
+class FovObservation:
+    """A camera frame scored once and projected onto the cells it actually saw.
+
+    `heading_rad` is measured from +col toward +row (world +x toward +y).
     """
-    h, w = vm.value.shape
-    cr, cc = obs.center_rc
-    r = int(obs.radius_cells)
+    center_rc: tuple[int, int]
+    heading_rad: float
+    score: float
+    confidence: float
+    fov_rad: float = float(np.deg2rad(79.0))
+    range_cells: int = 60
+    angular_res_rad: float | None = None
+
+
+@lru_cache(maxsize=64)
+def gaussian_kernel(radius_cells: int) -> np.ndarray:
+    """Read-only (2r+1, 2r+1) float32 Gaussian used by `apply_observation`, cached per radius."""
+    r = int(radius_cells)
+    d = np.arange(-r, r + 1)
+    dist2 = d[:, None] ** 2 + d[None, :] ** 2
+    sigma2 = max(1.0, (r * 0.6) ** 2)
+    kernel = np.exp(-dist2 / (2.0 * sigma2)).astype(np.float32)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _gaussian_window(shape: tuple[int, int], center_rc: tuple[int, int], radius_cells: int):
+    """Top-left corner of the clipped window and the matching slice of the cached kernel."""
+    h, w = shape
+    cr, cc = center_rc
+    r = int(radius_cells)
 
     r0 = max(0, cr - r)
     r1 = min(h, cr + r + 1)
     c0 = max(0, cc - r)
     c1 = min(w, cc + r + 1)
 
-    yy, xx = np.mgrid[r0:r1, c0:c1]
-    dist2 = (yy - cr) ** 2 + (xx - cc) ** 2
-    sigma2 = max(1.0, (r * 0.6) ** 2)
-    kernel = np.exp(-dist2 / (2.0 * sigma2)).astype(np.float32)
+    kr, kc = r0 - (cr - r), c0 - (cc - r)
+    kernel = gaussian_kernel(r)[kr:kr + max(0, r1 - r0), kc:kc + max(0, c1 - c0)]
+    return r0, c0, kernel
+
+
+@profiled("vlm.apply_observation", size=lambda vm, obs: (2 * obs.radius_cells + 1) ** 2)
+def apply_observation(vm: ValueMap, obs: Observation) -> None:
+    """
+    Apply a gaussian patch to the map.
 
-    value_patch = (float(obs.score) * kernel).astype(np.float32)
-    conf_patch = (float(obs.confidence) * np.ones_like(kernel, dtype=np.float32))
+    The kernel comes from a per-radius cache (sliced at map borders) and is
+    fused through `ValueMap.fuse_kernel`, so steady-state updates allocate
+    no arrays. Equivalent to `vm.update_patch` with ``score * kernel`` and a
+    constant confidence patch.
+    """
+    r0, c0, kernel = _gaussian_window(vm.value.shape, obs.center_rc, obs.radius_cells)
+    vm.fuse_kernel(r0, c0, kernel, obs.score, obs.confidence)
+
+
+def apply_multi_observation(mvm: MultiValueMap, obs: MultiObservation) -> None:
+    """Apply one observation to all K prompt channels in a single fused pass.
+
+    The Gaussian kernel is computed once and shared; per-prompt scores and
+    confidences are broadcast against it, so each channel ends up exactly as
+    if `apply_observation` had been called on it alone.
+    """
+    k = mvm.value.shape[0]
+    scores = np.asarray(obs.scores, dtype=np.float32).reshape(k, 1, 1)
+    confs = np.asarray(obs.confidences, dtype=np.float32).reshape(k, 1, 1)
+    r0, c0, kernel = _gaussian_window(mvm.shape, obs.center_rc, obs.radius_cells)
+
+    value_patch = scores * kernel
+    mvm.update_patch(r0, c0, value_patch, confs)
+
+
+def _observation_stream(shape: tuple[int, int], observations: Sequence[Observation]):
+    """Every in-map (flat cell, value, confidence) contribution, in observation order.
+
+    Observations sharing a radius are expanded together as (N,2r+1,2r+1)
+    windows. Values and confidences are clipped float32 exactly as
+    `fuse_kernel` prepares them.
+    """
+    h, w = shape
+    n = len(observations)
+    centers = np.array([o.center_rc for o in observations], dtype=np.int64).reshape(n, 2)
+    scores = np.array([o.score for o in observations], dtype=np.float32)
+    confs = np.clip(np.array([o.confidence for o in observations], dtype=np.float64), 0.0, 1.0).astype(np.float32)
+    radii = np.array([int(o.radius_cells) for o in observations], dtype=np.int64)
+
+    cells, index, vals = [], [], []
+    radius_groups = np.unique(radii)
+    for r in radius_groups:
+        sel = np.flatnonzero(radii == r)
+        d = np.arange(-r, r + 1)
+        rows = centers[sel, 0, None, None] + d[None, :, None]
+        cols = centers[sel, 1, None, None] + d[None, None, :]
+        v = scores[sel, None, None] * gaussian_kernel(int(r))
+        np.minimum(np.maximum(v, 0.0, out=v), 1.0, out=v)
+        flat = rows * w + cols
+        idx = np.broadcast_to(sel[:, None, None], flat.shape)
+        valid = (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+        if valid.all():
+            cells.append(flat.ravel())
+            index.append(idx.ravel())
+            vals.append(v.ravel())
+        else:
+            cells.append(flat[valid])
+            index.append(idx[valid])
+            vals.append(v[valid])
+    cells, index, vals = np.concatenate(cells), np.concatenate(index), np.concatenate(vals)
+    if radius_groups.size > 1:
+        order = np.argsort(index, kind="stable")
+        cells, index, vals = cells[order], index[order], vals[order]
+    return cells, vals, confs[index]
+
+
+@profiled("vlm.apply_observations", size=lambda vm, observations, *a, **k: len(observations))
+def apply_observations(vm: ValueMap, observations: Sequence[Observation], mode: str = "sequential") -> None:
+    """Fuse a batch of observations in one vectorized pass.
 
-    vm.update_patch(r0, c0, value_patch, conf_patch)
+    `mode="sequential"` is bit-identical to calling `apply_observation` on
+    each observation in order, including the confidence clip at 1.0 after
+    every update. Contributions are stably sorted by cell and fused
+    in depth levels: level j applies the j-th update of every cell at once,
+    so the loop runs once per maximum overlap rather than once per
+    observation, on compact per-cell state.
+
+    `mode="commutative"` scatter-adds confidence-weighted values and
+    confidences and blends once per cell. It is order-independent and
+    faster, and equals the sequential result up to rounding as long as no
+    cell's accumulated confidence exceeds 1.0; past that it weighs the map's
+    history more than the clipped sequential update does.
+    """
+    if mode not in ("sequential", "commutative"):
+        raise ValueError(f"unknown mode: {mode}")
+    if len(observations) == 0:
+        return
+    cells, vals, confs = _observation_stream(vm.value.shape, observations)
+    if cells.size == 0:
+        return
+    w = vm.value.shape[1]
+
+    if mode == "commutative":
+        lo = cells.min()
+        local = cells - lo
+        touched = np.flatnonzero(np.bincount(local))
+        sum_c = np.bincount(local, weights=confs)[touched]
+        sum_cv = np.bincount(local, weights=confs * vals)[touched]
+        rr, cc = np.divmod(touched + lo, w)
+        v_old = vm.value[rr, cc].astype(np.float64)
+        c_old = vm.conf[rr, cc].astype(np.float64)
+        denom = c_old + sum_c
+        out = v_old.copy()
+        np.divide(c_old * v_old + sum_cv, denom, out=out, where=denom > 1e-6)
+        vm.value[rr, cc] = out
+        vm.conf[rr, cc] = np.clip(denom, 0.0, 1.0)
+        vm.mark_dirty(int(rr.min()), int(cc.min()), int(rr.max()) + 1, int(cc.max()) + 1)
+        return
+
+    # A stable sort keeps each cell's updates in observation order.
+    order = np.argsort(cells, kind="stable")
+    cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    counts = np.diff(np.r_[starts, cells.size])
+    # Deepest cells first, so the cells still active at level j are a prefix.
+    by_depth = np.argsort(-counts, kind="stable")
+    starts, counts = starts[by_depth], counts[by_depth]
+    rr, cc = np.divmod(cells[starts], w)
+    value, conf = vm.value[rr, cc], vm.conf[rr, cc]
+    vals, confs = vals[order], confs[order]
+    active = np.searchsorted(-counts, -np.arange(1, counts[0] + 1), side="right")
+    for j, m in enumerate(active):
+        at = starts[:m] + j
+        v_old, c_old = value[:m], conf[:m]
+        v_new, c_new = vals[at], confs[at]
+        # Same float32 operations, in the same order, as `ValueMap._fuse`.
+        denom = c_old + c_new
+        num = c_old * v_old
+        num = num + v_new * c_new
+        np.divide(num, denom, out=v_old, where=denom > 1e-6)
+        np.minimum(np.maximum(denom, 0.0), 1.0, out=c_old)
+    vm.value[rr, cc] = value
+    vm.conf[rr, cc] = conf
+    vm.mark_dirty(int(rr.min()), int(cc.min()), int(rr.max()) + 1, int(cc.max()) + 1)
+
+
+def fov_confidence(rows: np.ndarray, cols: np.ndarray, obs: FovObservation) -> np.ndarray:
+    """Cone-shaped confidence: ``confidence * cos^2(pi/2 * angle / (fov/2))``.
+
+    Highest along the optical axis and zero at the edges of the field of view.
+    """
+    dy = rows - obs.center_rc[0]
+    dx = cols - obs.center_rc[1]
+    off = (np.arctan2(dy, dx) - obs.heading_rad + np.pi) % (2.0 * np.pi) - np.pi
+    off[(dy == 0) & (dx == 0)] = 0.0
+    t = np.clip(np.abs(off) / (0.5 * obs.fov_rad), 0.0, 1.0)
+    return (float(obs.confidence) * np.cos(0.5 * np.pi * t) ** 2).astype(np.float32)
+
+
+@profiled("vlm.apply_fov_observation", size=lambda vm, og, obs: obs.range_cells)
+def apply_fov_observation(vm: ValueMap, og: OccupancyGrid, obs: FovObservation) -> tuple[np.ndarray, np.ndarray]:
+    """Fuse a frame's score into the cells visible from its pose.
+
+    Visibility comes from ray casting against `og` (see
+    `vlfm_repro.mapping.visibility.visible_cells`), so value never leaks
+    through walls and cells outside the view cone are not touched.
+    Returns the (rows, cols) that were updated.
+    """
+    rows, cols = visible_cells(
+        og, obs.center_rc, obs.heading_rad, obs.fov_rad, obs.range_cells, obs.angular_res_rad
+    )
+    if rows.size:
+        vm.update_cells(rows, cols, obs.score, fov_confidence(rows, cols, obs))
+    return rows, cols
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+from pathlib import Path
+import sqlite3
+import threading
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from vlfm_repro.profiling import profiled
+from vlfm_repro.vlm.scorers import VLMScorer, score_batch
+
+
+def image_key(image: np.ndarray, stride: int = 1, perceptual: bool = False) -> bytes:
+    """Digest of an image buffer for cache lookups.
+
+    The default is exact: every pixel, plus dtype and shape. `stride > 1`
+    hashes only every stride-th row and column. `perceptual=True` hashes an
+    8x8 grid of block means quantized to 16 levels, so near-identical views
+    share a key. Both are opt-in because they trade exactness for hit rate.
+    """
+    img = np.asarray(image)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{img.dtype.str}|{img.shape}|{stride}|{int(perceptual)}".encode("utf-8"))
+    if perceptual:
+        g = img.astype(np.float32)
+        if g.ndim >= 3:
+            g = g.mean(axis=-1)
+        rows = np.array_split(np.arange(g.shape[0]), 8)
+        cols = np.array_split(np.arange(g.shape[1]), 8)
+        blocks = np.array([[g[np.ix_(r, c)].mean() if r.size and c.size else 0.0 for c in cols] for r in rows])
+        lo, hi = float(blocks.min()), float(blocks.max())
+        q = np.zeros(blocks.shape, dtype=np.uint8) if hi <= lo else np.round(15 * (blocks - lo) / (hi - lo)).astype(np.uint8)
+        h.update(q.tobytes())
+    else:
+        if stride > 1:
+            img = img[::stride, ::stride]
+        h.update(np.ascontiguousarray(img).data)
+    return h.digest()
+
+
+class CachedScorer:
+    """Content-addressed cache in front of any `VLMScorer`.
+
+    Results are keyed on the image digest (see `image_key`), the prompt and
+    a scorer identity. A bounded in-memory LRU tier sits in front of an
+    optional sqlite file, so scores survive across runs. Cached values are
+    returned exactly as the wrapped scorer produced them.
+
+    `scorer_id` defaults to the scorer's class and ``repr``, which captures
+    dataclass parameters such as `DummyScorer.seed`. Pass an explicit id for
+    scorers whose ``repr`` is not stable across processes.
+    """
+
+    def __init__(
+        self,
+        scorer: VLMScorer,
+        max_entries: int = 4096,
+        path: str | Path | None = None,
+        scorer_id: str | None = None,
+        stride: int = 1,
+        perceptual: bool = False,
+    ) -> None:
+        self.scorer = scorer
+        self.max_entries = int(max_entries)
+        self.scorer_id = scorer_id or f"{type(scorer).__module__}.{type(scorer).__qualname__}:{scorer!r}"
+        self.stride = int(stride)
+        self.perceptual = bool(perceptual)
+
+        self._lru: OrderedDict[bytes, Tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores (key BLOB PRIMARY KEY, score REAL NOT NULL, confidence REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def key(self, image: np.ndarray, prompt: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.scorer_id.encode("utf-8"))
+        h.update(b"\0")
+        h.update(prompt.encode("utf-8"))
+        h.update(b"\0")
+        h.update(image_key(image, stride=self.stride, perceptual=self.perceptual))
+        return h.digest()
+
+    @profiled("vlm.cache.score", size=lambda self, image, prompt: np.size(image))
+    def score(self, image: np.ndarray, prompt: str) -> Tuple[float, float]:
+        return self.score_batch([image], [prompt])[0]
+
+    def score_batch(self, images: Sequence[np.ndarray], prompts: Sequence[str]) -> List[Tuple[float, float]]:
+        if len(images) != len(prompts):
+            raise ValueError("images and prompts must have the same length")
+        keys = [self.key(img, p) for img, p in zip(images, prompts)]
+        out: list[Tuple[float, float] | None] = [None] * len(keys)
+        pending: dict[bytes, list[int]] = {}
+        with self._lock:
+            for i, k in enumerate(keys):
+                hit = self._lookup(k)
+                if hit is not None:
+                    out[i] = hit
+                else:
+                    pending.setdefault(k, []).append(i)
+
+        if pending:
+            # Identical misses in one batch are scored once.
+            first = [idx[0] for idx in pending.values()]
+            fresh = score_batch(self.scorer, [images[i] for i in first], [prompts[i] for i in first])
+            with self._lock:
+                for (k, idx), res in zip(pending.items(), fresh):
+                    res = (float(res[0]), float(res[1]))
+                    self.misses += 1
+                    self.hits += len(idx) - 1
+                    self._insert(k, res)
+                    if self._db is not None:
+                        self._db.execute("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", (k, res[0], res[1]))
+                    for i in idx:
+                        out[i] = res
+                if self._db is not None:
+                    self._db.commit()
+        return out  # type: ignore[return-value]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._lru),
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> "CachedScorer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _lookup(self, k: bytes) -> Tuple[float, float] | None:
+        hit = self._lru.get(k)
+        if hit is not None:
+            self._lru.move_to_end(k)
+            self.hits += 1
+            return hit
+        if self._db is not None:
+            row = self._db.execute("SELECT score, confidence FROM scores WHERE key = ?", (k,)).fetchone()
+            if row is not None:
+                hit = (row[0], row[1])
+                self.disk_hits += 1
+                self._insert(k, hit)
+                return hit
+        return None
+
+    def _insert(self, k: bytes, value: Tuple[float, float]) -> None:
+        self._lru[k] = value
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self.evictions += 1
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol, Tuple
+from typing import List, Protocol, Sequence, Tuple
 import numpy as np
+from vlfm_repro.profiling import profiled
 
 
 class VLMScorer(Protocol):
@@ -11,6 +12,25 @@ class VLMScorer(Protocol):
         ...
 
 
+class BatchVLMScorer(VLMScorer, Protocol):
+    """Scorer that can evaluate many (image, prompt) pairs in one call."""
+
+    def score_batch(self, images: Sequence[np.ndarray], prompts: Sequence[str]) -> List[Tuple[float, float]]:
+        """Return one (score, confidence) per pair, in input order."""
+        ...
+
+
+@profiled("vlm.score_batch", size=lambda scorer, images, prompts: len(images))
+def score_batch(scorer: VLMScorer, images: Sequence[np.ndarray], prompts: Sequence[str]) -> List[Tuple[float, float]]:
+    """Score pairs with `scorer.score_batch` if it has one, else one `score` call per pair."""
+    if len(images) != len(prompts):
+        raise ValueError("images and prompts must have the same length")
+    batch_fn = getattr(scorer, "score_batch", None)
+    if batch_fn is not None:
+        return list(batch_fn(images, prompts))
+    return [scorer.score(img, p) for img, p in zip(images, prompts)]
+
+
 @dataclass
 class DummyScorer:
     """
@@ -19,6 +39,7 @@ class DummyScorer:
     """
     seed: int = 0
 
+    @profiled("vlm.score", size=lambda self, image, prompt: np.size(image))
     def score(self, image: np.ndarray, prompt: str) -> Tuple[float, float]:
         img = np.asarray(image, dtype=np.float32)
         if img.ndim >= 3:
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
+from vlfm_repro.profiling import profiled
+
+# Side of the square tiles whose last-write version a ValueMap tracks.
+VALUE_TILE = 16
 
 @dataclass
 class ValueMap:
@@ -12,9 +16,20 @@ class ValueMap:
 
     - value: float32 (H,W) in [0,1] (suggested)
     - conf:  float32 (H,W) in [0,1]
+
+    Writes made through the update methods bump `version` and stamp the
+    VALUE_TILE x VALUE_TILE tiles they touch, so caches can ask whether a
+    region changed since they last looked (`changed_since`). Direct writes to
+    `value`/`conf` are not tracked unless followed by `mark_dirty`.
     """
     value: np.ndarray
     conf: np.ndarray
+    # Flat float32/bool scratch buffers reused by the fusion paths; grown on
+    # demand. `_views` caches their (ph,pw) views for the last patch shape.
+    _scratch: tuple[np.ndarray, ...] | None = field(default=None, init=False, repr=False, compare=False)
+    _views: tuple | None = field(default=None, init=False, repr=False, compare=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    _tile_version: np.ndarray | None = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def zeros(cls, h: int, w: int) -> "ValueMap":
@@ -23,6 +38,57 @@ class ValueMap:
             conf=np.zeros((h, w), dtype=np.float32),
         )
 
+    def mark_dirty(self, r0: int, c0: int, r1: int, c1: int) -> None:
+        """Record that cells in the half-open box [r0:r1, c0:c1] may have changed."""
+        h, w = self.value.shape
+        r0, c0, r1, c1 = max(0, r0), max(0, c0), min(h, r1), min(w, c1)
+        if r0 >= r1 or c0 >= c1:
+            return
+        if self._tile_version is None:
+            self._tile_version = np.zeros((-(-h // VALUE_TILE), -(-w // VALUE_TILE)), dtype=np.int64)
+        self.version += 1
+        t = VALUE_TILE
+        self._tile_version[r0 // t:(r1 - 1) // t + 1, c0 // t:(c1 - 1) // t + 1] = self.version
+
+    def changed_tiles(self, version: int) -> np.ndarray:
+        """Bool mask over VALUE_TILE tiles written after `version`."""
+        if self._tile_version is None:
+            h, w = self.value.shape
+            return np.zeros((-(-h // VALUE_TILE), -(-w // VALUE_TILE)), dtype=bool)
+        return self._tile_version > version
+
+    def changed_boxes(self, version: int) -> list[tuple[int, int, int, int]]:
+        """Cell boxes covering the tiles written after `version`: one per run of tiles in a tile row."""
+        if version >= self.version or self._tile_version is None:
+            return []
+        tiles = self._tile_version > version
+        h, w = self.value.shape
+        t = VALUE_TILE
+        out = []
+        for tr in np.flatnonzero(tiles.any(axis=1)):
+            row = np.concatenate(([False], tiles[tr], [False]))
+            edges = np.flatnonzero(row[1:] != row[:-1]).reshape(-1, 2)
+            r0, r1 = int(tr) * t, min(h, (int(tr) + 1) * t)
+            out.extend((r0, int(a) * t, r1, min(w, int(b) * t)) for a, b in edges)
+        return out
+
+    def changed_since(self, version: int, box: tuple[int, int, int, int] | None = None) -> bool:
+        """Whether cells in `box` (default: the whole map) may have changed after `version`.
+
+        Answers at tile granularity, so it may report changes next to `box`.
+        """
+        if version >= self.version or self._tile_version is None:
+            return False
+        if box is None:
+            return True
+        h, w = self.value.shape
+        r0, c0, r1, c1 = max(0, box[0]), max(0, box[1]), min(h, box[2]), min(w, box[3])
+        if r0 >= r1 or c0 >= c1:
+            return False
+        t = VALUE_TILE
+        return bool(self._tile_version[r0 // t:(r1 - 1) // t + 1, c0 // t:(c1 - 1) // t + 1].max() > version)
+
+    @profiled("value_map.update_patch")
     def update_patch(
         self,
         r0: int, c0: int,
@@ -31,15 +97,84 @@ class ValueMap:
     ) -> None:
         """Fuse a patch into the global map via confidence-weighted averaging."""
         ph, pw = patch_value.shape
+        v_new, c_new, _, _, _ = self._buffers(ph, pw)
+        np.clip(patch_value, 0.0, 1.0, out=v_new)
+        np.clip(patch_conf, 0.0, 1.0, out=c_new)
+        self._fuse(r0, c0, v_new, c_new)
+
+    def fuse_kernel(
+        self,
+        r0: int, c0: int,
+        kernel: np.ndarray,
+        score: float,
+        confidence: float,
+    ) -> None:
+        """`update_patch` with ``value = score * kernel`` and a constant confidence.
+
+        Runs entirely in preallocated scratch space and writes the result in
+        place, so repeated observation updates allocate no arrays. The result
+        is bit-identical to building both patches and calling `update_patch`.
+        """
+        ph, pw = kernel.shape
+        v_new = self._buffers(ph, pw)[0]
+        np.multiply(kernel, np.float32(score), out=v_new)
+        np.minimum(np.maximum(v_new, 0.0, out=v_new), 1.0, out=v_new)
+        c_new = np.float32(min(max(float(confidence), 0.0), 1.0))
+        self._fuse(r0, c0, v_new, c_new)
+
+    @profiled("value_map.update_cells")
+    def update_cells(
+        self,
+        rows: np.ndarray, cols: np.ndarray,
+        cell_value: np.ndarray | float,
+        cell_conf: np.ndarray | float,
+    ) -> None:
+        """`update_patch` for scattered cells; (rows[i], cols[i]) must be unique."""
+        v_old = self.value[rows, cols]
+        c_old = self.conf[rows, cols]
+        v_new = np.clip(np.asarray(cell_value, dtype=np.float32), 0.0, 1.0)
+        c_new = np.clip(np.asarray(cell_conf, dtype=np.float32), 0.0, 1.0)
+        denom = c_old + c_new
+        num = c_old * v_old
+        num = num + v_new * c_new
+        np.divide(num, denom, out=v_old, where=denom > 1e-6)
+        self.value[rows, cols] = v_old
+        self.conf[rows, cols] = np.clip(denom, 0.0, 1.0)
+        if np.size(rows):
+            self.mark_dirty(int(np.min(rows)), int(np.min(cols)), int(np.max(rows)) + 1, int(np.max(cols)) + 1)
+
+    def _buffers(self, ph: int, pw: int) -> tuple[np.ndarray, ...]:
+        """(v_new, c_new, denom, num, mask) scratch views of shape (ph,pw)."""
+        if self._views is not None and self._views[0] == (ph, pw):
+            return self._views[1]
+        n = ph * pw
+        if self._scratch is None or self._scratch[0].size < n:
+            self._scratch = (
+                *(np.empty(n, dtype=np.float32) for _ in range(4)),
+                np.empty(n, dtype=bool),
+            )
+        views = tuple(buf[:n].reshape(ph, pw) for buf in self._scratch)
+        self._views = ((ph, pw), views)
+        return views
+
+    def _fuse(self, r0: int, c0: int, v_new: np.ndarray, c_new: np.ndarray | np.float32) -> None:
+        # In-place version of
+        #   denom = c_old + c_new
+        #   value = where(denom > 1e-6, (c_old * v_old + c_new * v_new) / denom, v_old)
+        #   conf  = clip(denom, 0, 1)
+        # with the same float32 operations in the same order.
+        ph, pw = v_new.shape
         r1, c1 = r0 + ph, c0 + pw
         v_old = self.value[r0:r1, c0:c1]
         c_old = self.conf[r0:r1, c0:c1]
+        _, _, denom, num, mask = self._buffers(ph, pw)
 
-        c_new = np.clip(patch_conf, 0.0, 1.0).astype(np.float32)
-        v_new = np.clip(patch_value, 0.0, 1.0).astype(np.float32)
-
-        denom = (c_old + c_new)
-        out = np.where(denom > 1e-6, (c_old * v_old + c_new * v_new) / denom, v_old)
-
-        self.value[r0:r1, c0:c1] = out
-        self.conf[r0:r1, c0:c1] = np.clip(denom, 0.0, 1.0)
+        np.add(c_old, c_new, out=denom)
+        np.multiply(c_old, v_old, out=num)
+        np.multiply(v_new, c_new, out=v_new)
+        np.add(num, v_new, out=num)
+        np.greater(denom, 1e-6, out=mask)
+        np.divide(num, denom, out=num, where=mask)
+        np.copyto(v_old, num, where=mask)
+        np.minimum(np.maximum(denom, 0.0, out=denom), 1.0, out=c_old)
+        self.mark_dirty(r0, c0, r1, c1)
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import numpy as np
+
+from vlfm_repro.vlm.batching import MicroBatcher
+from vlfm_repro.vlm.scorers import DummyScorer, score_batch
+
+def test_score_batch_falls_back_to_single_calls():
+    scorer = DummyScorer(seed=3)
+    images = [np.full((4, 4), v, dtype=np.float32) for v in (0.1, 0.5, 0.9)]
+    prompts = ["chair", "bed", "sofa"]
+    assert score_batch(scorer, images, prompts) == [scorer.score(i, p) for i, p in zip(images, prompts)]
+
+def test_micro_batcher_resolves_concurrent_requests():
+    scorer = DummyScorer(seed=1)
+    images = [np.full((8, 8), i / 40.0, dtype=np.float32) for i in range(40)]
+    prompts = [f"object{i % 5}" for i in range(40)]
+
+    with MicroBatcher(scorer, max_batch_size=8, max_delay_s=0.05) as batcher:
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            results = list(callers.map(batcher.score, images, prompts))
+        stats = batcher.stats()
+
+    assert results == [scorer.score(i, p) for i, p in zip(images, prompts)]
+    assert stats["completed"] == 40 and stats["failed"] == 0 and stats["queue_depth"] == 0
+    assert max(stats["batch_size_histogram"]) <= 8
+    assert stats["mean_batch_size"] > 1.0
+
+def test_slow_scorer_backs_up_in_the_queue():
+    release = threading.Event()
+
+    class GatedScorer(DummyScorer):
+        def score(self, image, prompt):
+            release.wait(5.0)
+            return super().score(image, prompt)
+
+    images = [np.full((4, 4), i / 10.0, dtype=np.float32) for i in range(10)]
+    with MicroBatcher(GatedScorer(), max_batch_size=2, max_delay_s=0.0) as batcher:
+        futures = [batcher.submit(image, "chair") for image in images]
+        deadline = time.perf_counter() + 2.0
+        while batcher.stats()["in_flight"] == 0 and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        time.sleep(0.02)
+        backed_up = batcher.stats()
+        release.set()
+        results = [f.result(timeout=5.0) for f in futures]
+        stats = batcher.stats()
+
+    assert backed_up["in_flight"] == 2 and backed_up["queue_depth"] == 8
+    assert len(results) == 10
+    assert stats["completed"] == 10 and stats["in_flight"] == 0 and stats["queue_depth"] == 0
@@ -0,0 +1,64 @@
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import frontier_mask
+from vlfm_repro.mapping.chunked_grid import ChunkedOccupancyGrid
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+
+def test_chunks_are_allocated_on_write_and_dropped_when_unknown():
+    cg = ChunkedOccupancyGrid()
+    assert cg.nbytes == 0 and cg.get(5, 5) == -1
+    cg.set_cells(np.array([-3, 200]), np.array([-70, 10]), np.array([1, 0]))
+    assert set(cg.chunks) == {(-1, -2), (3, 0)}
+    assert cg.get(-3, -70) == 1 and cg.get(200, 10) == 0 and cg.get(0, 0) == -1
+    assert cg.bounds == (-64, -128, 256, 64)
+    # Unallocated cells are unknown, not outside the map.
+    assert cg.is_allocated(200, 10) and not cg.is_allocated(0, 0) and cg.in_bounds(0, 0)
+    assert cg.neighbors(0, 0) == [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    cg.update_region(-10, -80, -np.ones((20, 20), dtype=np.int8))
+    assert set(cg.chunks) == {(3, 0)}
+    assert cg.nbytes == 64 * 64
+
+
+def test_dense_view_matches_dense_grid():
+    rng = np.random.default_rng(0)
+    grid = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(150, 170), p=[0.5, 0.4, 0.1])
+    grid[:70, :] = -1
+    og = OccupancyGrid(grid=grid, resolution=0.1, origin_xy=(2.0, -1.0))
+    cg = ChunkedOccupancyGrid.from_dense(og)
+    assert len(cg.chunks) == 6  # the unknown top band stays implicit
+
+    view = cg.dense_view((60, 10, 150, 170))
+    np.testing.assert_array_equal(view.grid, grid[60:150, 10:170])
+    np.testing.assert_allclose(view.world_xy(0, 0), og.world_xy(60, 10))
+
+    # The default view pads `bounds` with unknown cells, so frontiers on the
+    # chunks' outer edge match those of the dense map surrounded by unknown.
+    view = cg.dense_view()
+    r0, c0, r1, c1 = cg.bounds
+    assert view.shape == (r1 - r0 + 2, c1 - c0 + 2)
+    padded = np.full((300, 300), -1, dtype=np.int8)
+    padded[10:160, 10:180] = grid
+    expected = frontier_mask(OccupancyGrid(grid=padded))[r0 + 9:r1 + 11, c0 + 9:c1 + 11]
+    np.testing.assert_array_equal(frontier_mask(view), expected)
+    np.testing.assert_allclose(view.world_xy(1, 1), og.world_xy(r0, c0))
+
+    # Windows that straddle chunk borders and reach past the explored area.
+    for r0, c0, r1, c1 in [(-5, -7, 37, 280), (63, 64, 64, 129), (140, 160, 150, 170), (0, 0, 0, 10)]:
+        expected = padded[r0 + 10:r1 + 10, c0 + 10:c1 + 10]
+        np.testing.assert_array_equal(cg.window(r0, c0, r1, c1), expected)
+
+
+def test_single_explored_chunk_has_frontiers_on_its_edge():
+    cg = ChunkedOccupancyGrid()
+    cg.update_region(0, 0, np.zeros((64, 64), dtype=np.int8))
+    assert int(frontier_mask(cg.dense_view()).sum()) == 4 * 64 - 4
+
+
+def test_writes_are_logged_as_dirty_boxes():
+    cg = ChunkedOccupancyGrid()
+    cg.update_region(-5, -5, np.zeros((3, 4), dtype=np.int8))
+    v = cg.version
+    cg.set_cells(np.array([10]), np.array([12]), 1)
+    assert cg.dirty_since(v) == [(10, 12, 11, 13)]
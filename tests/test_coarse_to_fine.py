@@ -0,0 +1,44 @@
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import cluster_frontiers, frontier_mask
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.pyramid import MapPyramid
+from vlfm_repro.nav.coarse_to_fine import coarse_to_fine_frontiers
+from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.vlm.observation_updater import Observation, apply_observations
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def _explored_map(seed, n=300):
+    rng = np.random.default_rng(seed)
+    grid = -np.ones((n, n), dtype=np.int8)
+    for _ in range(12):
+        r0, c0 = (int(v) for v in rng.integers(0, n - 60, size=2))
+        grid[r0:r0 + int(rng.integers(15, 60)), c0:c0 + int(rng.integers(15, 60))] = 0
+    grid[rng.random((n, n)) < 0.01] = 1
+    vm = ValueMap.zeros(n, n)
+    apply_observations(vm, [
+        Observation(center_rc=(int(r), int(c)), score=float(s), confidence=0.8, radius_cells=15)
+        for r, c, s in zip(rng.integers(0, n, 30), rng.integers(0, n, 30), rng.random(30))
+    ])
+    return OccupancyGrid(grid=grid), vm
+
+
+def test_exact_search_matches_exhaustive_top_k():
+    for seed in range(4):
+        og, vm = _explored_map(seed)
+        clusters = cluster_frontiers(og, frontier_mask(og))
+        full = rank_frontiers(vm, clusters)[:5]
+        fast = coarse_to_fine_frontiers(MapPyramid(og, vm, levels=2, factor=4), top_k=5)
+        assert [rf.score for rf in fast] == [rf.score for rf in full]
+        kth = full[-1].score
+        for a, b in zip(fast, full):
+            if b.score > kth:
+                np.testing.assert_array_equal(a.cluster.cells, b.cluster.cells)
+
+
+def test_capped_search_refines_fewer_regions():
+    og, vm = _explored_map(1)
+    pyr = MapPyramid(og, vm, levels=2, factor=4)
+    capped = coarse_to_fine_frontiers(pyr, top_k=3, max_regions=1)
+    assert 0 < len(capped) <= 3
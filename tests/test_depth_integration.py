@@ -0,0 +1,47 @@
+import numpy as np
+
+from vlfm_repro.mapping.depth_integration import (
+    CameraIntrinsics,
+    CameraPose,
+    DepthIntegrator,
+    depth_to_points,
+    ray_cells,
+)
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+
+
+def _wall_frame(intr, cam_height, wall_dist):
+    """Depth of a wall `wall_dist` ahead over a floor, seen by a level camera."""
+    v = np.arange(intr.height, dtype=np.float32)[:, None]
+    up = -(v - intr.cy) / intr.fy
+    floor = np.where(up < 0, cam_height / np.maximum(-up, 1e-6), np.inf)
+    return np.broadcast_to(np.minimum(wall_dist, floor), (intr.height, intr.width)).astype(np.float32)
+
+
+def test_back_projection_recovers_the_wall_plane():
+    intr = CameraIntrinsics.from_hfov(64, 48, np.deg2rad(90))
+    pose = CameraPose(x=1.0, y=2.0, z=0.5, yaw=np.pi / 2)
+    pts = depth_to_points(np.full((48, 64), 2.0, np.float32), intr, pose)
+    np.testing.assert_allclose(pts[:, 1], 4.0, atol=1e-5)
+    assert abs(pts[:, 0].mean() - 1.0) < 1e-3
+
+
+def test_ray_cells_are_a_connected_line_without_the_end():
+    rows, cols = ray_cells((0, 0), np.array([[3, 7]]))
+    assert (rows[0], cols[0]) == (0, 0) and len(rows) == 7
+    assert np.all(np.abs(np.diff(rows)) <= 1) and np.all(np.diff(cols) == 1)
+
+
+def test_integrating_a_wall_marks_hits_and_carves_free_space():
+    og = OccupancyGrid(grid=-np.ones((100, 100), dtype=np.int8), resolution=0.05)
+    intr = CameraIntrinsics.from_hfov(160, 120, np.deg2rad(90))
+    integ = DepthIntegrator(og)
+    version = og.version
+    box = integ.integrate(_wall_frame(intr, 0.5, 2.0), intr, CameraPose(x=1.0, y=1.0, z=0.5, yaw=0.0))
+
+    assert box is not None and og.version > version
+    row = og.grid[20]
+    assert row[60] == 1
+    assert np.all(row[21:59] == 0)
+    assert np.all(row[62:] == -1)
+    assert np.all(og.grid[:, :19] == -1)
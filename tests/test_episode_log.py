@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster
+from vlfm_repro.mapping.episode_log import KIND_KEYFRAME, EpisodeRecorder, EpisodeReplay
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+from vlfm_repro.sim.explorer import ExplorationConfig, ExplorationSim
+from vlfm_repro.sim.floorplan import make_floor_plan
+from vlfm_repro.vlm.value_map import ValueMap
+
+def _record_random_episode(path, steps=60, **kwargs):
+    rng = np.random.default_rng(0)
+    og = OccupancyGrid(grid=np.full((50, 70), -1, dtype=np.int8))
+    vm = ValueMap.zeros(50, 70)
+    history = []
+    with EpisodeRecorder(path, og, vm, **kwargs) as rec:
+        for step in range(steps):
+            r, c = rng.integers(0, 45), rng.integers(0, 65)
+            og.update_region(r, c, rng.integers(-1, 2, (5, 5)).astype(np.int8))
+            rows, cols = rng.integers(0, 50, 8), rng.integers(0, 70, 8)
+            vm.update_cells(rows, cols, float(rng.random()), np.full(8, 0.5, dtype=np.float32))
+            cl = FrontierCluster(np.array([[r, c]], dtype=np.int32), (float(r), float(c)), (0.0, 0.0))
+            ranked = [RankedFrontier(cluster=cl, score=0.5, frontier_id=step)]
+            assert rec.record(ranked, extra={"t": step}) == step
+            history.append((og.grid.copy(), vm.value.copy(), vm.conf.copy()))
+    return history
+
+def test_replay_reconstructs_every_step_in_any_order(tmp_path):
+    path = tmp_path / "ep.vlog"
+    history = _record_random_episode(path, keyframe_every=16, max_delta_ratio=100.0)
+    with EpisodeReplay(path) as rp:
+        assert len(rp) == 60
+        assert list(np.flatnonzero(rp.index["kind"] == KIND_KEYFRAME)) == [0, 16, 32, 48]
+        order = list(np.random.default_rng(1).permutation(60)) + list(range(60)) + list(range(59, -1, -1))
+        for step in order:
+            st = rp.state_at(int(step), copy=False)
+            grid, value, conf = history[step]
+            assert np.array_equal(st.grid, grid) and np.array_equal(st.value, value) and np.array_equal(st.conf, conf)
+            assert st.extra == {"t": int(step)} and st.frontiers["id"].tolist() == [step]
+        assert np.isnan(rp.state_at(-1).frontiers["utility"][0])
+
+def test_large_deltas_force_keyframes(tmp_path):
+    path = tmp_path / "ep.vlog"
+    _record_random_episode(path, steps=20, keyframe_every=1000, max_delta_ratio=0.05)
+    with EpisodeReplay(path) as rp:
+        assert (rp.index["kind"] == KIND_KEYFRAME).sum() > 1
+
+def test_truncated_log_without_index_is_recovered(tmp_path):
+    path = tmp_path / "ep.vlog"
+    history = _record_random_episode(path, steps=30, keyframe_every=8, max_delta_ratio=100.0)
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+    (tmp_path / "ep.vlog.idx").unlink()
+    with EpisodeReplay(path) as rp:
+        assert len(rp) == 29
+        assert np.array_equal(rp.state_at(28).grid, history[28][0])
+
+def test_sim_records_its_episode(tmp_path):
+    plan = make_floor_plan(120, 160, seed=2, min_room_cells=40)
+    path = tmp_path / "sim.vlog"
+    sim = ExplorationSim(plan, "chair", ExplorationConfig(max_steps=12, episode_log=str(path)))
+    result = sim.run()
+    with EpisodeReplay(path) as rp:
+        assert len(rp) == result.num_steps and rp.meta["prompt"] == "chair"
+        last = rp.state_at(-1)
+        assert np.array_equal(last.grid, sim.og.grid) and np.array_equal(last.value, sim.vm.value)
+        assert tuple(last.extra["pos"]) == sim.pos
+        assert len(last.frontiers) == len(sim.last_ranked)
+
+def test_records_reach_the_file_before_close(tmp_path):
+    og = OccupancyGrid(grid=np.full((20, 30), -1, dtype=np.int8))
+    rec = EpisodeRecorder(tmp_path / "open.vlog", og, ValueMap.zeros(20, 30))
+    for step in range(3):
+        og.set_cells(np.array([step]), np.array([step]), 0)
+        rec.record(extra={"step": step})
+    with EpisodeReplay(tmp_path / "open.vlog") as rp:
+        assert len(rp) == 3 and rp.state_at(2).extra == {"step": 2}
+    rec.close()
+
+def test_sim_closes_its_log_when_a_step_raises(tmp_path, monkeypatch):
+    plan = make_floor_plan(120, 160, seed=2, min_room_cells=40)
+    sim = ExplorationSim(plan, "chair", ExplorationConfig(max_steps=12, episode_log=str(tmp_path / "sim.vlog")))
+    step = sim._step
+
+    def failing_step():
+        if sim.steps == 3:
+            raise RuntimeError("sensor failure")
+        step()
+
+    monkeypatch.setattr(sim, "_step", failing_step)
+    with pytest.raises(RuntimeError, match="sensor failure"):
+        sim.run()
+    assert sim.recorder._log.closed
+    with EpisodeReplay(tmp_path / "sim.vlog") as rp:
+        assert len(rp) == 3
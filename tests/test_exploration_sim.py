@@ -0,0 +1,40 @@
+import numpy as np
+
+from vlfm_repro.nav.geodesic import UNREACHABLE, chamfer_distance
+from vlfm_repro.sim.explorer import STAGES, ExplorationConfig, ExplorationSim, summarize
+from vlfm_repro.sim.floorplan import CATEGORIES, make_floor_plan
+
+def test_floor_plan_is_connected_and_deterministic():
+    plan = make_floor_plan(200, 240, seed=3, min_room_cells=40)
+    again = make_floor_plan(200, 240, seed=3, min_room_cells=40)
+    assert np.array_equal(plan.grid, again.grid) and plan.start_rc == again.start_rc
+
+    free = plan.grid == 0
+    cost = chamfer_distance(free, np.array([plan.start_rc]))
+    assert not (cost[free] == UNREACHABLE).any()
+    for name in CATEGORIES:
+        cells = plan.objects[name]
+        assert len(cells) and plan.grid[cells[:, 0], cells[:, 1]].all()
+        # Every object can be approached from the start.
+        mask = plan.object_mask(name)
+        grown = np.zeros_like(mask)
+        grown[1:-1, 1:-1] = mask[:-2, 1:-1] | mask[2:, 1:-1] | mask[1:-1, :-2] | mask[1:-1, 2:]
+        assert (cost[grown & free] < UNREACHABLE).any()
+
+def test_episode_reaches_the_target_and_reports_metrics():
+    plan = make_floor_plan(120, 160, seed=2, min_room_cells=40)
+    sim = ExplorationSim(plan, "chair", ExplorationConfig(max_steps=200))
+    result = sim.run()
+
+    assert result.success
+    assert sim.gt_dist[sim.pos] <= sim.cfg.success_distance_m
+    assert 0.0 < result.spl <= 1.0
+    assert result.path_length_m >= result.shortest_path_m
+    assert all(len(result.stage_ms[s]) == result.num_steps for s in STAGES)
+    # The agent only ever writes what it has seen.
+    known = sim.og.grid != -1
+    assert np.array_equal(sim.og.grid[known], plan.grid[known])
+
+    metrics = summarize([result])
+    assert metrics["success_rate"] == 1.0 and metrics["num_steps"] == result.num_steps
+    assert set(metrics["latency_ms"]) == set(STAGES) and metrics["steps_per_sec"] > 0
@@ -1,7 +1,14 @@
 import numpy as np
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
-from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
+from vlfm_repro.frontier.frontier_extractor import (
+    FrontierCluster,
+    cluster_frontiers,
+    find_frontier_cells,
+    frontier_indices,
+    frontier_mask,
+)
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
 
 def test_frontier_cells_simple_boundary():
     g = -1 * np.ones((10, 10), dtype=np.int8)
@@ -25,3 +32,43 @@ def test_cluster_frontiers_returns_centroids():
     assert len(cl.cells) >= 10
     assert isinstance(cl.centroid_rc[0], float)
     assert isinstance(cl.centroid_xy[0], float)
+
+def test_clusters_compare_by_value():
+    g = -1 * np.ones((30, 30), dtype=np.int8)
+    g[5:25, 5:12] = 0
+    g[5:25, 15:25] = 0
+    og = OccupancyGrid(g)
+    a = cluster_frontiers(og, find_frontier_cells(og), min_cluster_size=1)
+    b = cluster_frontiers(og, frontier_mask(og), min_cluster_size=1)
+    assert a == b and a[0] in b
+    assert a[0] != a[1] and a[0] not in a[1:]
+    moved = FrontierCluster(a[0].cells + 1, a[0].centroid_rc, a[0].centroid_xy)
+    assert moved != a[0]
+    assert FrontierCluster([tuple(rc) for rc in a[0].cells], a[0].centroid_rc, a[0].centroid_xy) == a[0]
+    assert RankedFrontier(a[0], 0.5) == RankedFrontier(b[0], 0.5) != RankedFrontier(b[1], 0.5)
+
+def _reference_frontier(og, connectivity, require_free):
+    g = og.grid
+    out = set()
+    for r in range(g.shape[0]):
+        for c in range(g.shape[1]):
+            v = int(g[r, c])
+            if (require_free and v != 0) or (not require_free and v == 1):
+                continue
+            if any(int(g[rr, cc]) == -1 for rr, cc in og.neighbors(r, c, connectivity=connectivity)):
+                out.add((r, c))
+    return out
+
+def test_vectorized_frontier_matches_reference_loop():
+    rng = np.random.default_rng(0)
+    g = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(23, 31), p=[0.3, 0.5, 0.2])
+    og = OccupancyGrid(g)
+
+    for connectivity in (4, 8):
+        for require_free in (True, False):
+            expected = _reference_frontier(og, connectivity, require_free)
+            mask = frontier_mask(og, connectivity=connectivity, require_free=require_free)
+            idx = frontier_indices(og, connectivity=connectivity, require_free=require_free)
+            assert set(zip(*np.nonzero(mask))) == expected
+            assert idx.shape == (len(expected), 2)
+            assert set(find_frontier_cells(og, connectivity, require_free)) == expected
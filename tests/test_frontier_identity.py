@@ -0,0 +1,92 @@
+import numpy as np
+
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster
+from vlfm_repro.frontier.identity import FrontierIdentityTracker
+from vlfm_repro.nav.frontier_ranker import rank_frontiers, rank_frontiers_with_cost
+from vlfm_repro.vlm.value_map import ValueMap
+
+def _cluster(cells):
+    cells = np.array(sorted(cells), dtype=np.int32)
+    cr, cc = cells.mean(axis=0)
+    return FrontierCluster(cells=cells, centroid_rc=(float(cr), float(cc)), centroid_xy=(float(cc), float(cr)))
+
+def _row(r, c0, c1):
+    return _cluster([(r, c) for c in range(c0, c1)])
+
+def test_ids_persist_and_splits_merges_are_reported():
+    tr = FrontierIdentityTracker(max_centroid_dist=5.0)
+    a, b = tr.update([_row(5, 0, 20), _row(40, 0, 10)])
+    assert (a.id, b.id) == (1, 2) and tr.events.born == [1, 2]
+
+    # `a` splits in two; `b` moved two rows down (no shared cells).
+    left, right, moved = tr.update([_row(5, 0, 8), _row(5, 12, 20), _row(42, 0, 10)])
+    assert {left.id, right.id} == {1, 3}
+    assert moved.id == 2 and moved.changed
+    assert sorted(tr.events.splits[1]) == [1, 3]
+    assert tr.events.born == [3] and tr.events.vanished == []
+
+    # The two halves join again: one of them keeps its id, the other vanishes.
+    joined, moved2 = tr.update([_row(5, 0, 20), _row(42, 0, 10)])
+    assert joined.id in (1, 3) and sorted(tr.events.merges[joined.id]) == [1, 3]
+    assert moved2.id == 2 and not moved2.changed
+    assert tr.events.vanished == [({1, 3} - {joined.id}).pop()]
+
+    # Too far away to be the same frontier.
+    (far,) = tr.update([_row(80, 0, 10)])
+    assert far.id == 4 and set(tr.events.vanished) == {joined.id, 2}
+
+def test_rank_matches_rankers_and_reuses_unchanged_scores():
+    rng = np.random.default_rng(0)
+    vm = ValueMap(value=rng.random((100, 100), dtype=np.float32), conf=np.ones((100, 100), dtype=np.float32))
+    clusters = [_row(r, 10, 30) for r in (10, 50, 90)]
+    tr = FrontierIdentityTracker()
+    tr.update(clusters)
+    ranked = tr.rank(vm)
+    expected = rank_frontiers(vm, clusters)
+    assert [rf.score for rf in ranked] == [rf.score for rf in expected]
+    assert tr.last_scored == 3
+
+    # Same cells, untouched value map: nothing is rescored.
+    tr.update([_row(r, 10, 30) for r in (10, 50, 90)])
+    assert [rf.score for rf in tr.rank(vm)] == [rf.score for rf in expected]
+    assert tr.last_scored == 0
+
+    # A write near one frontier rescores only that one.
+    vm.update_cells(np.array([50]), np.array([20]), 1.0, 1.0)
+    ranked = tr.rank(vm)
+    assert tr.last_scored == 1
+    assert sorted(rf.score for rf in ranked) == sorted(rf.score for rf in rank_frontiers(vm, clusters))
+
+    dist = rng.random((100, 100)) * 20
+    with_cost = tr.rank(vm, distance_field=dist, cost_key=7)
+    assert tr.last_costed == 3
+    expected = rank_frontiers_with_cost(vm, clusters, dist)
+    assert [rf.utility for rf in with_cost] == [rf.utility for rf in expected]
+    tr.rank(vm, distance_field=dist, cost_key=7)
+    assert tr.last_costed == 0 and tr.last_scored == 0
+
+def test_rank_rescores_for_a_new_value_map():
+    tr = FrontierIdentityTracker()
+    tr.update([_row(r, 10, 30) for r in (10, 50)])
+    for k in range(5):
+        # Each map is freed before the next is allocated, so CPython may hand
+        # out the same address (and `id`) again.
+        vm = ValueMap.zeros(60, 60)
+        vm.value[:] = k
+        assert [rf.score for rf in tr.rank(vm)] == [float(k)] * 2
+        assert tr.last_scored == 2
+        del vm
+
+def test_stickiness_keeps_the_incumbent_on_near_ties():
+    vm = ValueMap.zeros(60, 60)
+    vm.value[10, :] = 0.50
+    vm.value[40, :] = 0.52
+    tr = FrontierIdentityTracker()
+    tr.update([_row(10, 0, 20), _row(40, 0, 20)])
+    assert tr.rank(vm, radius_cells=0, stickiness=0.05)[0].frontier_id == 2
+    vm.value[10, :] = 0.55
+    vm.mark_dirty(10, 0, 11, 60)
+    assert tr.rank(vm, radius_cells=0, stickiness=0.05)[0].frontier_id == 2
+    vm.value[10, :] = 0.60
+    vm.mark_dirty(10, 0, 11, 60)
+    assert tr.rank(vm, radius_cells=0, stickiness=0.05)[0].frontier_id == 1
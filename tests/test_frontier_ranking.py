@@ -1,9 +1,10 @@
 import numpy as np
 
 from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
-from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster, find_frontier_cells, cluster_frontiers
 from vlfm_repro.vlm.value_map import ValueMap
-from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.nav.frontier_ranker import rank_frontiers, score_cluster, score_clusters
+from vlfm_repro.nav.window_scoring import ValueWindowIndex
 
 def test_ranking_prefers_high_value_area():
     g = -1 * np.ones((40, 60), dtype=np.int8)
@@ -21,3 +22,24 @@ def test_ranking_prefers_high_value_area():
     ranked = rank_frontiers(vm, clusters, radius_cells=4, mode="mean")
     assert len(ranked) >= 1
     assert ranked[0].score >= ranked[-1].score
+
+def test_batch_scores_match_per_cluster_scores():
+    rng = np.random.default_rng(0)
+    g = rng.choice(np.array([-1, 0], dtype=np.int8), size=(50, 70), p=[0.6, 0.4])
+    og = OccupancyGrid(g)
+    clusters = cluster_frontiers(og, find_frontier_cells(og), min_cluster_size=1)
+    clusters.append(FrontierCluster(cells=[(0, 0)], centroid_rc=(-2.0, 71.0), centroid_xy=(0.0, 0.0)))
+
+    vm = ValueMap.zeros(*og.shape)
+    vm.value[:] = rng.random(og.shape, dtype=np.float32)
+    tables = ValueWindowIndex(vm.value)
+    tables.sat()
+
+    for mode in ("mean", "max"):
+        for radius in (0, 3, 6):
+            tables.max_filter(radius)
+            single = [score_cluster(vm, cl, radius_cells=radius, mode=mode) for cl in clusters]
+            # A fresh index gathers windows directly; a prebuilt one reads its tables.
+            for index in (ValueWindowIndex(vm.value), tables):
+                batch = score_clusters(vm, clusters, radius_cells=radius, mode=mode, index=index)
+                np.testing.assert_allclose(batch, single, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,56 @@
+import heapq
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster
+from vlfm_repro.vlm.value_map import ValueMap
+from vlfm_repro.nav.geodesic import DIAG_COST, ORTHO_COST, UNREACHABLE, chamfer_distance, geodesic_distance
+from vlfm_repro.nav.frontier_ranker import rank_frontiers_with_cost
+
+def _reference_dijkstra(passable, start, connectivity):
+    h, w = passable.shape
+    steps = [(-1, 0, ORTHO_COST), (1, 0, ORTHO_COST), (0, -1, ORTHO_COST), (0, 1, ORTHO_COST)]
+    if connectivity == 8:
+        steps += [(dr, dc, DIAG_COST) for dr in (-1, 1) for dc in (-1, 1)]
+    dist = np.full((h, w), UNREACHABLE, dtype=np.int64)
+    dist[start] = 0
+    heap = [(0, start)]
+    while heap:
+        d, (r, c) = heapq.heappop(heap)
+        if d > dist[r, c]:
+            continue
+        for dr, dc, cost in steps:
+            rr, cc = r + dr, c + dc
+            if 0 <= rr < h and 0 <= cc < w and passable[rr, cc] and d + cost < dist[rr, cc]:
+                dist[rr, cc] = d + cost
+                heapq.heappush(heap, (d + cost, (rr, cc)))
+    return dist
+
+def test_chamfer_distance_matches_dijkstra():
+    rng = np.random.default_rng(0)
+    passable = rng.random((30, 40)) < 0.7
+    for connectivity in (4, 8):
+        got = chamfer_distance(passable, np.array([(15, 20)]), connectivity=connectivity)
+        np.testing.assert_array_equal(got, _reference_dijkstra(passable, (15, 20), connectivity))
+
+def test_cost_aware_ranking_prefers_reachable_nearby_frontier():
+    g = np.zeros((20, 40), dtype=np.int8)
+    g[:, 20] = 1                      # wall splits the map; right half unreachable
+    og = OccupancyGrid(g)
+    dist = geodesic_distance(og, (10, 2))
+    assert np.isinf(dist[10, 30])
+    assert np.isclose(dist[10, 12], 10 * og.resolution)
+
+    def cluster(r, c):
+        return FrontierCluster(cells=np.array([[r, c]], dtype=np.int32), centroid_rc=(float(r), float(c)), centroid_xy=og.world_xy(r, c))
+
+    near, far, hidden = cluster(10, 5), cluster(10, 18), cluster(10, 30)
+    vm = ValueMap.zeros(*og.shape)
+    vm.value[:, 16:] = 1.0
+
+    ranked = rank_frontiers_with_cost(vm, [near, far, hidden], dist, cost_weight=0.1, radius_cells=0)
+    assert [rf.cluster.centroid_rc for rf in ranked] == [far.centroid_rc, near.centroid_rc]
+    ranked = rank_frontiers_with_cost(vm, [near, far, hidden], dist, cost_weight=2.0, radius_cells=0)
+    assert [rf.cluster.centroid_rc for rf in ranked] == [near.centroid_rc, far.centroid_rc]
+    assert ranked[0].path_cost < ranked[1].path_cost
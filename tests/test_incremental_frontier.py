@@ -0,0 +1,49 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import MAX_DIRTY_LOG, OccupancyGrid
+from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers, frontier_mask
+from vlfm_repro.frontier.incremental import IncrementalFrontierTracker
+
+def test_dirty_since_reports_boxes_and_falls_back_to_full_grid():
+    og = OccupancyGrid(-1 * np.ones((20, 30), dtype=np.int8))
+    v0 = og.version
+    og.update_region(-2, 5, np.zeros((4, 3), dtype=np.int8))
+    og.set_cells(np.array([7, 9]), np.array([3, 1]), 1)
+    assert og.dirty_since(v0) == [(0, 5, 2, 8), (7, 1, 10, 4)]
+    assert og.dirty_since(og.version) == []
+
+    for _ in range(MAX_DIRTY_LOG):
+        og.mark_dirty(0, 0, 1, 1)
+    assert og.dirty_since(v0) == [(0, 0, 20, 30)]
+
+def test_incremental_tracker_matches_full_recompute():
+    rng = np.random.default_rng(0)
+    g = -1 * np.ones((60, 80), dtype=np.int8)
+    g[20:40, 30:50] = 0
+    og = OccupancyGrid(g)
+    tracker = IncrementalFrontierTracker(og, connectivity=4, cluster_connectivity=8, min_cluster_size=3)
+
+    for _ in range(40):
+        for _ in range(rng.integers(1, 4)):
+            h, w = rng.integers(1, 9, size=2)
+            r0, c0 = rng.integers(-3, 60), rng.integers(-3, 80)
+            patch = rng.choice(np.array([-1, 0, 0, 1], dtype=np.int8), size=(h, w))
+            og.update_region(int(r0), int(c0), patch)
+        tracker.refresh()
+
+        frontier = find_frontier_cells(og, connectivity=4)
+        expected = cluster_frontiers(og, frontier, connectivity=8, min_cluster_size=3)
+        assert np.array_equal(tracker.mask, frontier_mask(og, connectivity=4))
+        assert tracker.clusters() == expected
+
+def test_far_apart_edits_are_relabeled_in_separate_windows(monkeypatch):
+    og = OccupancyGrid(-1 * np.ones((400, 400), dtype=np.int8))
+    tracker = IncrementalFrontierTracker(og, min_cluster_size=1)
+    areas = []
+    add = tracker._add_components
+    monkeypatch.setattr(tracker, "_add_components", lambda mask, offset: (areas.append(mask.size), add(mask, offset)))
+    og.update_region(5, 5, np.zeros((4, 4), dtype=np.int8))
+    og.update_region(390, 390, np.zeros((4, 4), dtype=np.int8))
+    tracker.refresh()
+    assert sorted(areas) == [16, 16]
+    assert tracker.clusters() == cluster_frontiers(og, frontier_mask(og), min_cluster_size=1)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.frontier.labeling import label_components, mask_components
+
+def _reference_components(mask, connectivity):
+    og = OccupancyGrid(np.zeros(mask.shape, dtype=np.int8))
+    todo = {(int(r), int(c)) for r, c in np.argwhere(mask)}
+    comps = []
+    while todo:
+        stack = [todo.pop()]
+        comp = set(stack)
+        while stack:
+            cur = stack.pop()
+            for nb in og.neighbors(*cur, connectivity=connectivity):
+                if nb in todo:
+                    todo.remove(nb)
+                    comp.add(nb)
+                    stack.append(nb)
+        comps.append(frozenset(comp))
+    return set(comps)
+
+def test_labeling_matches_reference_components():
+    rng = np.random.default_rng(1)
+    mask = rng.random((37, 41)) < 0.45
+    for connectivity in (4, 8):
+        expected = _reference_components(mask, connectivity)
+
+        labels, k = label_components(mask, connectivity=connectivity)
+        assert k == len(expected)
+        got = {frozenset(map(tuple, np.argwhere(labels == i).tolist())) for i in range(1, k + 1)}
+        assert got == expected
+
+        comps = mask_components(mask, connectivity=connectivity, min_size=3, offset=(100, 200))
+        kept = {c for c in expected if len(c) >= 3}
+        assert len(comps) == len(kept)
+        for i in range(len(comps)):
+            cells = comps.component(i)
+            assert cells.dtype == np.int32
+            assert frozenset((int(r) - 100, int(c) - 200) for r, c in cells) in kept
+            assert comps.sizes[i] == cells.shape[0]
+            np.testing.assert_allclose(comps.centroids[i], cells.mean(axis=0))
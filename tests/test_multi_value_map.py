@@ -0,0 +1,39 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.frontier.frontier_extractor import find_frontier_cells, cluster_frontiers
+from vlfm_repro.vlm.value_map import ValueMap
+from vlfm_repro.vlm.multi_value_map import MultiValueMap
+from vlfm_repro.vlm.observation_updater import (
+    MultiObservation,
+    Observation,
+    apply_multi_observation,
+    apply_observation,
+)
+from vlfm_repro.nav.frontier_ranker import rank_frontiers, rank_frontiers_multi
+
+def test_fused_channels_match_independent_value_maps():
+    prompts = ("chair", "bed", "sink")
+    mvm = MultiValueMap.zeros(prompts, 40, 50)
+    singles = [ValueMap.zeros(40, 50) for _ in prompts]
+    rng = np.random.default_rng(0)
+
+    for _ in range(10):
+        center = (int(rng.integers(0, 40)), int(rng.integers(0, 50)))
+        scores, confs = rng.random(3), rng.random(3)
+        apply_multi_observation(mvm, MultiObservation(center, scores, confs, radius_cells=7))
+        for vm, s, c in zip(singles, scores, confs):
+            apply_observation(vm, Observation(center, float(s), float(c), radius_cells=7))
+
+    for k, vm in enumerate(singles):
+        np.testing.assert_array_equal(mvm.value[k], vm.value)
+        np.testing.assert_array_equal(mvm.conf[k], vm.conf)
+
+    g = -1 * np.ones((40, 50), dtype=np.int8)
+    g[10:30, 10:40] = 0
+    og = OccupancyGrid(g)
+    clusters = cluster_frontiers(og, find_frontier_cells(og), min_cluster_size=3)
+    ranked = rank_frontiers_multi(mvm, clusters, radius_cells=4)
+    for k, prompt in enumerate(prompts):
+        expected = rank_frontiers(mvm.channel(prompt), clusters, radius_cells=4)
+        assert [rf.score for rf in ranked[prompt]] == [rf.score for rf in expected]
@@ -0,0 +1,50 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.geodesic import UNREACHABLE, chamfer_distance, chamfer_steps
+from vlfm_repro.nav.planner import IncrementalPlanner, InflationLayer, astar
+
+def _path_cost(path):
+    costs = {(dr, dc): cost for dr, dc, cost in chamfer_steps(8)}
+    return sum(costs[(b[0] - a[0], b[1] - a[1])] for a, b in zip(path, path[1:]))
+
+def test_inflation_layer_blocks_cells_near_obstacles():
+    g = np.zeros((20, 20), dtype=np.int8)
+    g[10, 10] = 1
+    og = OccupancyGrid(g, resolution=0.1)
+    layer = InflationLayer(og, robot_radius_m=0.2)
+    assert not layer.traversable[10, 12] and not layer.traversable[8, 10]
+    assert layer.traversable[10, 13] and layer.traversable[7, 10]
+
+    og.update_region(2, 2, np.ones((1, 1), dtype=np.int8))
+    layer.refresh()
+    fresh = InflationLayer(og, robot_radius_m=0.2)
+    np.testing.assert_array_equal(layer.traversable, fresh.traversable)
+
+def test_incremental_planner_matches_replanning_from_scratch():
+    rng = np.random.default_rng(0)
+    g = np.zeros((60, 80), dtype=np.int8)
+    g[rng.random(g.shape) < 0.05] = 1
+    g[5, 5] = g[50, 70] = 0
+    og = OccupancyGrid(g, resolution=0.05)
+    planner = IncrementalPlanner(og, robot_radius_m=0.05)
+    planner.set_goal((50, 70))
+
+    for _ in range(25):
+        r0, c0 = rng.integers(0, 55), rng.integers(0, 75)
+        patch = (rng.random((5, 5)) < 0.4).astype(np.int8)
+        og.update_region(int(r0), int(c0), patch)
+        planner.update()
+
+        fresh = chamfer_distance(planner.inflation.traversable, np.array([(50, 70)]))
+        np.testing.assert_array_equal(planner.cost_to_goal, fresh)
+
+        path = planner.path((5, 5))
+        if fresh[5, 5] == UNREACHABLE:
+            continue
+        assert path[0] == (5, 5) and path[-1] == (50, 70)
+        assert all(planner.inflation.traversable[p] for p in path[1:-1])
+        assert _path_cost(path) == fresh[5, 5]
+
+        ref = astar(planner.inflation.traversable, (5, 5), (50, 70))
+        assert _path_cost(ref) == fresh[5, 5]
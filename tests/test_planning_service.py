@@ -0,0 +1,110 @@
+import socket
+
+import numpy as np
+import pytest
+
+from vlfm_repro.frontier.frontier_extractor import cluster_frontiers, frontier_mask
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.service.client import PlanningClient, ServiceError
+from vlfm_repro.service.server import PlanningServer, PlanningState
+from vlfm_repro.vlm.observation_updater import FovObservation, apply_fov_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+@pytest.fixture
+def server_path(tmp_path):
+    server = PlanningServer()
+    path = tmp_path / "plan.sock"
+    thread = server.serve_in_thread(path)
+    yield path
+    server.stop()
+    thread.join(5.0)
+
+def test_pipelined_updates_coalesce_into_one_refresh(server_path):
+    og = OccupancyGrid(grid=np.full((60, 80), -1, dtype=np.int8))
+    vm = ValueMap.zeros(60, 80)
+    obs = FovObservation((30, 20), 0.0, score=0.9, confidence=0.8, range_cells=25)
+    with PlanningClient(server_path) as client:
+        client.init((60, 80))
+        client.update_region(10, 5, np.zeros((40, 30), dtype=np.int8))
+        og.update_region(10, 5, np.zeros((40, 30), dtype=np.int8))
+        for k in range(20):
+            rows, cols = np.full(6, 10 + 2 * k), np.arange(45, 51)
+            client.set_cells(rows, cols, 0)
+            og.set_cells(rows, cols, 0)
+        client.observe(obs)
+        apply_fov_observation(vm, og, obs)
+        reply = client.rank()
+        assert client.rank() == reply
+
+        expected = rank_frontiers(vm, cluster_frontiers(og, frontier_mask(og)))
+        assert reply.map_version == og.version and reply.value_version == vm.version
+        assert [e.score for e in reply.frontiers] == pytest.approx([rf.score for rf in expected], abs=1e-6)
+        got = np.array(sorted(e.centroid_rc for e in reply.frontiers))
+        assert np.allclose(got, sorted(tuple(rf.cluster.centroid_rc) for rf in expected), atol=1e-4)
+        assert len({e.frontier_id for e in reply.frontiers}) == len(expected) == 21
+
+        # The 20 strips are unreachable from the room, so only its own frontier remains.
+        near = client.rank(robot_rc=(30, 20), top_k=2)
+        assert [e.size for e in near.frontiers] == [max(e.size for e in reply.frontiers)]
+        assert near.frontiers[0].path_cost > 0
+
+        stats = client.stats()
+        assert stats["refreshes"] == 1 and stats["updates_coalesced"] == 21
+        assert stats["rank_reused"] == 1
+        assert stats["messages"]["cells"] == 20 and stats["messages"]["rank"] == 3
+        lat = stats["latency"]["rank"]
+        assert lat["count"] == 3 and lat["p50_ms"] <= lat["p99_ms"] <= lat["max_ms"]
+
+def test_errors_are_reported_and_the_connection_survives(server_path):
+    with PlanningClient(server_path) as client:
+        with pytest.raises(ServiceError, match="send init first"):
+            client.set_cells([0], [0], 0, ack=True)
+        client.init((20, 20), grid=np.zeros((20, 20), dtype=np.int8))
+        bad = client.set_cells([25], [3], 1)
+        with pytest.raises(ServiceError) as err:
+            client.rank()
+        assert err.value.request_id == bad
+        client.set_prompt("chair")
+        client.update_region(0, 0, np.full((20, 3), -1, dtype=np.int8))
+        assert len(client.rank().frontiers) == 1
+        assert client.stats()["errors"] == 2
+
+def test_unexpected_failures_become_error_replies(server_path, monkeypatch):
+    obs = FovObservation((5, 5), 0.0, score=0.9, confidence=0.8, range_cells=10)
+    with PlanningClient(server_path, timeout=10.0) as client:
+        with pytest.raises(ServiceError, match="send init first"):
+            client.observe(obs, ack=True)
+        client.init((20, 20), grid=np.zeros((20, 20), dtype=np.int8))
+
+        def boom(self, obs):
+            raise RuntimeError("scorer crashed")
+        monkeypatch.setattr(PlanningState, "observe", boom)
+        with pytest.raises(ServiceError, match="RuntimeError: scorer crashed"):
+            client.observe(obs, ack=True)
+        monkeypatch.undo()
+        client.observe(obs, ack=True)
+        assert client.stats()["errors"] == 2
+
+def test_start_only_replaces_a_stale_socket(tmp_path):
+    path = tmp_path / "plan.sock"
+    path.write_text("not a socket")
+    with pytest.raises(FileExistsError):
+        PlanningServer().serve_in_thread(path)
+    assert path.read_text() == "not a socket"
+    path.unlink()
+
+    # A socket file whose server is gone is taken over.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    server = PlanningServer()
+    thread = server.serve_in_thread(path)
+    try:
+        with pytest.raises(RuntimeError, match="already listening"):
+            PlanningServer().serve_in_thread(path)
+        with PlanningClient(path) as client:
+            assert client.stats()["errors"] == 0
+    finally:
+        server.stop()
+        thread.join(5.0)
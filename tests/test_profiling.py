@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from vlfm_repro import profiling
+from vlfm_repro.frontier.frontier_extractor import cluster_frontiers, find_frontier_cells
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.nav.frontier_ranker import rank_frontiers
+from vlfm_repro.sim.explorer import ExplorationConfig, ExplorationSim
+from vlfm_repro.sim.floorplan import make_floor_plan
+from vlfm_repro.vlm.batching import MicroBatcher
+from vlfm_repro.vlm.score_cache import CachedScorer
+from vlfm_repro.vlm.scorers import DummyScorer
+from vlfm_repro.vlm.value_map import ValueMap
+
+def _pipeline():
+    g = -1 * np.ones((40, 50), dtype=np.int8)
+    g[10:30, 10:40] = 0
+    og = OccupancyGrid(g)
+    vm = ValueMap.zeros(40, 50)
+    vm.update_patch(0, 0, np.full((40, 50), 0.5, dtype=np.float32), np.ones((40, 50), dtype=np.float32))
+    clusters = cluster_frontiers(og, find_frontier_cells(og))
+    return rank_frontiers(vm, clusters)
+
+def test_disabled_profiling_records_nothing():
+    profiling.reset()
+    profiling.disable()
+    _pipeline()
+    with profiling.stage("block"):
+        pass
+    assert profiling.report() == {}
+
+def test_enabled_profiling_counts_times_and_sizes():
+    profiling.reset()
+    profiling.enable()
+    try:
+        _pipeline()
+        _pipeline()
+        with profiling.stage("block", size=7):
+            pass
+    finally:
+        profiling.disable()
+    rep = profiling.report()
+    assert rep["frontier.find_cells"]["count"] == 2
+    assert rep["frontier.find_cells"]["max_size"] == 40 * 50
+    assert rep["value_map.update_patch"]["mean_size"] == 40 * 50
+    assert rep["nav.rank_frontiers"]["count"] == 2
+    assert rep["block"] == {**rep["block"], "count": 1, "max_size": 7}
+    for s in rep.values():
+        assert sum(s["hist_us_log2"]) == s["count"]
+        assert s["p50_ms"] <= s["p95_ms"] <= s["max_ms"] + 1e-12
+    totals = [s["total_ms"] for s in rep.values()]
+    assert totals == sorted(totals, reverse=True)
+    assert len(profiling.markdown_table(rep)) == 2 + len(rep)
+    profiling.reset()
+
+def test_capture_profiles_the_block():
+    with profiling.Capture(limit=50) as cap:
+        _pipeline()
+    assert "cluster_frontiers" in cap.text
+
+def test_sim_captures_the_requested_step():
+    plan = make_floor_plan(120, 160, seed=2, min_room_cells=40)
+    sim = ExplorationSim(plan, "chair", ExplorationConfig(max_steps=5, cprofile_step=2))
+    sim.run()
+    assert "_step" in sim.cprofile_text
+
+def test_failing_calls_keep_their_exception_and_wrapped_scorers_are_timed():
+    @profiling.profiled("test.fails", size=lambda x: x.size)
+    def fails(x):
+        raise KeyError(x)
+
+    profiling.reset()
+    profiling.enable()
+    try:
+        with pytest.raises(KeyError):
+            fails(3)
+        img = np.zeros((4, 5), dtype=np.float32)
+        with MicroBatcher(DummyScorer()) as batcher:
+            batcher.score(img, "chair")
+        CachedScorer(DummyScorer()).score(img, "chair")
+    finally:
+        profiling.disable()
+    rep = profiling.report()
+    assert "test.fails" not in rep
+    assert rep["vlm.batcher.score"]["count"] == rep["vlm.cache.score"]["count"] == 1
+    assert rep["vlm.score"]["count"] == 2 and rep["vlm.cache.score"]["max_size"] == 20
+    profiling.reset()
+
+def test_profiling_can_be_stripped_at_import():
+    code = (
+        "from vlfm_repro import profiling\n"
+        "from vlfm_repro.vlm.scorers import DummyScorer\n"
+        "assert DummyScorer.score.__qualname__ == 'DummyScorer.score' and not hasattr(DummyScorer.score, '__wrapped__')\n"
+        "try:\n"
+        "    profiling.enable()\n"
+        "except RuntimeError:\n"
+        "    print('stripped')\n"
+    )
+    env = {**os.environ, "VLFM_PROFILING": "0", "PYTHONPATH": os.pathsep.join(sys.path)}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "stripped"
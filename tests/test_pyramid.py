@@ -0,0 +1,43 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.pyramid import MapPyramid
+from vlfm_repro.vlm.observation_updater import Observation, apply_observation
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def _assert_levels_match(pyr, og, vm):
+    fresh = MapPyramid(og, vm, levels=len(pyr.levels), factor=pyr.factor)
+    for a, b in zip(pyr.levels, fresh.levels):
+        for name in ("any_unknown", "any_free", "any_occupied", "value_max", "value_sum", "count"):
+            np.testing.assert_array_equal(getattr(a, name), getattr(b, name), err_msg=name)
+
+
+def test_levels_summarize_blocks():
+    grid = -np.ones((10, 13), dtype=np.int8)
+    grid[0:4, 0:4] = 0
+    grid[1, 1] = 1
+    vm = ValueMap.zeros(10, 13)
+    vm.value[2, 3] = 0.8
+    lvl = MapPyramid(OccupancyGrid(grid=grid), vm, levels=2, factor=2).level(2)
+    assert lvl.shape == (3, 4)
+    assert lvl.any_free[0, 0] and lvl.any_occupied[0, 0] and not lvl.any_unknown[0, 0]
+    assert lvl.value_max[0, 0] == np.float32(0.8)
+    assert lvl.count[2, 3] == 2 * 1
+    np.testing.assert_allclose(lvl.value_mean[0, 0], 0.8 / 16)
+
+
+def test_incremental_refresh_matches_rebuild():
+    rng = np.random.default_rng(0)
+    og = OccupancyGrid(grid=-np.ones((150, 170), dtype=np.int8))
+    vm = ValueMap.zeros(150, 170)
+    pyr = MapPyramid(og, vm, levels=3, factor=3)
+    for _ in range(20):
+        r0, c0 = (int(v) for v in rng.integers(0, 140, size=2))
+        og.update_region(r0, c0, rng.integers(-1, 2, size=(12, 9)).astype(np.int8))
+        apply_observation(vm, Observation(center_rc=(int(rng.integers(0, 150)), int(rng.integers(0, 170))),
+                                          score=float(rng.random()), confidence=0.5, radius_cells=5))
+        boxes = pyr.refresh()
+        assert boxes
+        _assert_levels_match(pyr, og, vm)
+    assert pyr.refresh() == []
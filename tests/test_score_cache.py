@@ -0,0 +1,31 @@
+import numpy as np
+
+from vlfm_repro.vlm.scorers import DummyScorer
+from vlfm_repro.vlm.score_cache import CachedScorer
+
+def test_cache_hits_are_identical_and_lru_evicts():
+    scorer = DummyScorer(seed=2)
+    cached = CachedScorer(scorer, max_entries=2)
+    imgs = [np.random.default_rng(i).random((16, 16)).astype(np.float32) for i in range(3)]
+
+    first = [cached.score(img, "chair") for img in imgs]
+    assert first == [scorer.score(img, "chair") for img in imgs]
+    assert cached.stats()["misses"] == 3 and cached.stats()["evictions"] == 1
+
+    assert cached.score(imgs[2], "chair") == first[2]
+    assert cached.score(imgs[2], "bed") == scorer.score(imgs[2], "bed")
+    assert cached.stats()["hits"] == 1
+
+def test_disk_tier_survives_reopen(tmp_path):
+    path = tmp_path / "scores.sqlite"
+    img = np.linspace(0, 1, 64, dtype=np.float32).reshape(8, 8)
+    with CachedScorer(DummyScorer(seed=0), path=path) as cached:
+        expected = cached.score(img, "sofa")
+
+    with CachedScorer(DummyScorer(seed=0), path=path) as cached:
+        assert cached.score(img, "sofa") == expected
+        assert cached.stats()["disk_hits"] == 1 and cached.stats()["misses"] == 0
+
+    with CachedScorer(DummyScorer(seed=1), path=path) as cached:
+        cached.score(img, "sofa")
+        assert cached.stats()["misses"] == 1
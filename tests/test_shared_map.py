@@ -0,0 +1,76 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.shared_map import MapPublisher, MapSubscriber
+from vlfm_repro.vlm.value_map import ValueMap
+
+def _reader(name, n, out):
+    sub = MapSubscriber(name)
+    versions, torn = set(), 0
+    for _ in range(n):
+        frame = sub.latest()
+        # Every publish fills both maps with one value, so a consistent
+        # frame is uniform.
+        ok = np.all(frame.grid == frame.grid[0, 0]) and np.all(frame.value == frame.value[0, 0])
+        if frame.valid():
+            torn += not ok
+            versions.add(frame.version)
+        del frame
+    sub.close()
+    out.put((torn, len(versions)))
+
+def test_subscriber_sees_published_versions_and_changes():
+    og = OccupancyGrid(grid=np.full((40, 50), -1, dtype=np.int8))
+    vm = ValueMap.zeros(40, 50)
+    with MapPublisher((40, 50), slots=3) as pub:
+        sub = MapSubscriber(pub.name)
+        assert sub.latest() is None and sub.wait(0, timeout=0.01) is None
+        assert pub.publish(og, vm) == 1
+        first = sub.latest()
+        assert first.changed_box == (0, 0, 40, 50) and not first.grid.flags.writeable
+
+        og.update_region(5, 6, np.zeros((3, 4), dtype=np.int8))
+        vm.update_patch(20, 20, np.ones((2, 2), dtype=np.float32), np.ones((2, 2), dtype=np.float32))
+        assert pub.publish(og, vm) == 2 and sub.wait(1) == 2
+        frame = sub.read()
+        assert np.array_equal(frame.grid, og.grid) and np.array_equal(frame.value, vm.value)
+        assert frame.changed_box == (5, 6, 32, 32)
+        assert first.valid()
+
+        # Slots are reused after `slots` publishes; the old views are then flagged.
+        og.set_cells(np.array([30]), np.array([40]), 1)
+        pub.publish(og, vm)
+        pub.publish(og, vm)
+        assert pub.publish(og, vm) == 5 and sub.latest().changed_box is None
+        assert not first.valid()
+        assert np.array_equal(sub.read().grid, og.grid)
+        del first, frame
+        sub.close()
+
+def test_readers_in_other_processes_never_accept_torn_frames():
+    ctx = mp.get_context("spawn")
+    og = OccupancyGrid(grid=np.zeros((200, 300), dtype=np.int8))
+    vm = ValueMap.zeros(200, 300)
+    with MapPublisher((200, 300)) as pub:
+        pub.publish(og, vm)
+        out = ctx.Queue()
+        procs = [ctx.Process(target=_reader, args=(pub.name, 500, out)) for _ in range(2)]
+        for p in procs:
+            p.start()
+        results = []
+        v = 1
+        while len(results) < len(procs):
+            v += 1
+            og.update_region(0, 0, np.full((200, 300), v % 3 - 1, dtype=np.int8))
+            vm.value[:] = v
+            vm.mark_dirty(0, 0, 200, 300)
+            pub.publish(og, vm)
+            while not out.empty():
+                results.append(out.get())
+        assert [torn for torn, _ in results] == [0, 0]
+        assert all(n > 1 for _, n in results)
+        for p in procs:
+            p.join(10)
+            assert p.exitcode == 0
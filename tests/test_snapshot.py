@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.snapshot import (
+    PAGE_SIZE,
+    load_snapshot,
+    pack_occupancy,
+    read_header,
+    save_snapshot,
+    unpack_occupancy,
+)
+from vlfm_repro.vlm.multi_value_map import MultiValueMap
+from vlfm_repro.vlm.value_map import ValueMap
+
+
+def _state(h=37, w=53):
+    rng = np.random.default_rng(0)
+    og = OccupancyGrid(grid=rng.integers(-1, 2, size=(h, w)).astype(np.int8), resolution=0.1, origin_xy=(1.5, -2.0))
+    vm = ValueMap(value=rng.random((h, w), dtype=np.float32), conf=rng.random((h, w), dtype=np.float32))
+    return og, vm
+
+
+def test_round_trip_is_memory_mapped_and_page_aligned(tmp_path):
+    og, vm = _state()
+    path = tmp_path / "map.snap"
+    size = save_snapshot(path, og, vm, meta={"step": 7})
+    assert size == path.stat().st_size and size % PAGE_SIZE == 0
+    assert all(a["offset"] % PAGE_SIZE == 0 for a in read_header(path)["arrays"].values())
+
+    snap = load_snapshot(path)
+    assert isinstance(snap.og.grid, np.memmap) and not snap.og.grid.flags.writeable
+    np.testing.assert_array_equal(snap.og.grid, og.grid)
+    np.testing.assert_array_equal(snap.vm.value, vm.value)
+    np.testing.assert_array_equal(snap.vm.conf, vm.conf)
+    assert snap.og.resolution == 0.1 and snap.og.origin_xy == (1.5, -2.0)
+    assert snap.meta == {"step": 7}
+
+
+def test_packed_occupancy_and_multi_value_maps(tmp_path):
+    og, _ = _state(10, 11)
+    np.testing.assert_array_equal(unpack_occupancy(pack_occupancy(og.grid), og.shape), og.grid)
+    mvm = MultiValueMap.zeros(["chair", "bed"], 10, 11)
+    mvm.value[1, 2, 3] = 0.5
+    path = tmp_path / "packed.snap"
+    save_snapshot(path, og, mvm, pack=True)
+    snap = load_snapshot(path)
+    np.testing.assert_array_equal(snap.og.grid, og.grid)
+    assert snap.vm.prompts == ("chair", "bed") and snap.vm.value[1, 2, 3] == 0.5
+    assert read_header(path)["arrays"]["occupancy"]["shape"] == [28]
+
+
+def test_rejects_foreign_and_future_files(tmp_path):
+    bad = tmp_path / "bad.snap"
+    bad.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        load_snapshot(bad)
+    og, _ = _state()
+    path = tmp_path / "v.snap"
+    save_snapshot(path, og)
+    raw = bytearray(path.read_bytes())
+    raw[8] = 99
+    path.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="version"):
+        load_snapshot(path)
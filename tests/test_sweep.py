@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pytest
+
+from vlfm_repro.sim.floorplan import make_floor_plan
+from vlfm_repro.sim.sweep import SharedPlans, attach_plans, run_sweep, sweep_grid
+
+def test_shared_plans_are_read_only_views():
+    plans = {s: make_floor_plan(60, 80, seed=s, min_room_cells=20) for s in (0, 1)}
+    with SharedPlans(plans) as shared:
+        shm, views = attach_plans(shared.spec)
+        for s, p in plans.items():
+            assert np.array_equal(views[s].grid, p.grid)
+            assert not views[s].grid.flags.writeable
+            assert views[s].start_rc == p.start_rc
+        del views
+        shm.close()
+
+def test_sweep_streams_results_and_resumes(tmp_path):
+    kwargs = dict(map_size=(120, 160), config={"max_steps": 20})
+    rows = run_sweep(sweep_grid(seed=[2], radius_cells=[3], score_mode=["mean", "max"]), tmp_path, workers=2, **kwargs)
+    assert len(rows) == 2
+
+    # Simulate an interrupted append, then resume with a larger grid.
+    with open(tmp_path / "results.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"radius_cells": 6, "seed"')
+    cells = sweep_grid(seed=[2], radius_cells=[3, 6], score_mode=["mean", "max"])
+    rows = run_sweep(cells, tmp_path, workers=0, **kwargs)
+    assert len(rows) == 4
+    assert sorted((r["radius_cells"], r["score_mode"]) for r in rows[2:]) == [(6, "max"), (6, "mean")]
+
+    lines = (tmp_path / "results.jsonl").read_text().splitlines()
+    assert len(lines) == 4 and all(json.loads(line) for line in lines)
+    assert len((tmp_path / "results.csv").read_text().splitlines()) == 5
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["completed"] == summary["total"] == 4
+    assert len(summary["results"]) == 4 and {r["episodes"] for r in summary["results"]} == {1}
+
+    assert len(run_sweep(cells, tmp_path, workers=0, **kwargs)) == 4
+
+def test_failing_cell_does_not_stop_the_sweep(tmp_path):
+    kwargs = dict(map_size=(120, 160), config={"max_steps": 10})
+    cells = [{"seed": 2, "radius_cells": 3}, {"seed": 2, "radius_cells": 3, "no_such_field": 1}, {"seed": 2, "radius_cells": 6}]
+    for workers in (2, 0):
+        with pytest.raises(RuntimeError, match="1 of 3 sweep cells failed"):
+            run_sweep(cells, tmp_path, workers=workers, **kwargs)
+        # The good cells are logged on the first pass; only the bad one is retried.
+        lines = (tmp_path / "results.jsonl").read_text().splitlines()
+        assert sorted(json.loads(line)["radius_cells"] for line in lines) == [3, 6]
+        summary = json.loads((tmp_path / "summary.json").read_text())
+        assert summary["completed"] == 2
+        assert [f["params"] for f in summary["failed"]] == [cells[1]]
+        assert summary["failed"][0]["error"].startswith("TypeError")
@@ -0,0 +1,43 @@
+import numpy as np
+
+from vlfm_repro.mapping.occupancy_grid import OccupancyGrid
+from vlfm_repro.mapping.visibility import ray_fan, visible_cells
+
+
+def test_ray_fan_is_cached_and_read_only():
+    a = ray_fan(20, 0.05)
+    assert ray_fan(20, 0.05) is a
+    assert not a[1].flags.writeable
+
+
+def test_open_map_full_circle_has_no_gaps():
+    og = OccupancyGrid(grid=np.zeros((61, 61), dtype=np.int8))
+    rows, cols = visible_cells(og, (30, 30), 0.0, 2 * np.pi, 20)
+    seen = np.zeros(og.shape, dtype=bool)
+    seen[rows, cols] = True
+    yy, xx = np.mgrid[:61, :61]
+    disk = np.hypot(yy - 30, xx - 30) <= 19
+    assert seen[disk].all()
+    assert not seen[np.hypot(yy - 30, xx - 30) > 21].any()
+
+
+def test_walls_stop_rays_and_fov_limits_the_cone():
+    grid = np.zeros((50, 60), dtype=np.int8)
+    grid[:, 30] = 1
+    og = OccupancyGrid(grid=grid)
+    rows, cols = visible_cells(og, (25, 10), 0.0, np.deg2rad(90), 40)
+    assert cols.max() == 30
+    assert og.grid[25, 30] == 1 and np.any((rows == 25) & (cols == 30))
+    ang = np.arctan2(rows - 25, cols - 10)
+    near = (rows != 25) | (cols != 10)
+    assert np.all(np.abs(ang[near]) <= np.deg2rad(45) + 0.1)
+
+
+def test_rays_do_not_slip_through_diagonal_walls():
+    grid = np.zeros((41, 41), dtype=np.int8)
+    idx = np.arange(41)
+    grid[idx, 40 - idx] = 1  # one-cell-thick anti-diagonal wall
+    og = OccupancyGrid(grid=grid)
+    rows, cols = visible_cells(og, (10, 10), 0.0, 2 * np.pi, 40)
+    assert (rows + cols <= 40).all()
+    assert np.any(rows + cols == 40)  # the wall itself is seen
@@ -0,0 +1,92 @@
+import io
+
+import numpy as np
+import pytest
+
+from vlfm_repro.frontier.frontier_extractor import FrontierCluster
+from vlfm_repro.mapping.episode_log import FRONTIER_DTYPE
+from vlfm_repro.nav.frontier_ranker import RankedFrontier
+from vlfm_repro.viz.image_io import GifWriter, encode_png, quantize_rgb
+from vlfm_repro.viz.raster import DEFAULT_PALETTE as P, add_caption, cell_to_px, colormap_lut, draw_text, render_map
+
+def test_render_map_colors_cells_heatmap_and_markers():
+    grid = np.full((6, 8), -1, dtype=np.int8)
+    grid[1:5, 1:7] = 0
+    grid[2, 3] = 1
+    img = render_map(grid, origin_lower=False)
+    assert img.shape == (6, 8, 3) and img.dtype == np.uint8
+    assert tuple(img[0, 0]) == P.unknown and tuple(img[1, 1]) == P.free and tuple(img[2, 3]) == P.occupied
+    assert np.array_equal(render_map(grid, scale=3)[::3, ::3], img[::-1])
+
+    mask = np.zeros(grid.shape, dtype=bool)
+    mask[1, 1:3] = True
+    assert np.array_equal(render_map(grid, frontiers=mask), render_map(grid, frontiers=[(1, 1), (1, 2)]))
+    assert tuple(render_map(grid, frontiers=mask, origin_lower=False)[1, 2]) == P.frontier
+
+    value = np.full(grid.shape, 1.0, dtype=np.float32)
+    conf = np.zeros(grid.shape, dtype=np.float32)
+    conf[1, 1] = 1.0
+    heat = render_map(grid, value, conf, origin_lower=False)
+    assert np.array_equal(heat[conf == 0], img[conf == 0])
+    top = colormap_lut(P.heatmap)[255].astype(float)
+    expected = np.array(P.free) * (1 - P.heat_alpha) + top * P.heat_alpha
+    assert np.abs(heat[1, 1].astype(float) - expected).max() <= 1
+
+    cl = FrontierCluster(np.array([[3, 5]]), (3.0, 5.0), (0.0, 0.0))
+    ranked = [RankedFrontier(cluster=cl, score=0.25)]
+    records = np.zeros(1, dtype=FRONTIER_DTYPE)
+    records[0] = (0, 0.25, np.nan, np.nan, 3.0, 5.0, 1)
+    big = render_map(grid, ranked=ranked, scale=4)
+    assert np.array_equal(big, render_map(grid, ranked=records, scale=4))
+    (r, c), = cell_to_px((3.0, 5.0), grid.shape, 4, True)
+    assert (r, c) == (4 * (6 - 1 - 3) + 2, 4 * 5 + 2)
+    assert tuple(big[r, c]) == P.ranked[0]
+    assert not np.array_equal(big, render_map(grid, ranked=ranked, scale=4, labels=False))
+
+def test_text_captions_and_non_finite_labels():
+    img = np.zeros((20, 40, 3), dtype=np.uint8)
+    assert np.array_equal(draw_text(img.copy(), (0, 0), "Ab_(x=1)", (255, 0, 0)), draw_text(img.copy(), (0, 0), "AB_(X=1)", (255, 0, 0)))
+    with pytest.raises(ValueError, match="no glyph"):
+        draw_text(img, (0, 0), "~", (255, 0, 0))
+
+    grid = np.zeros((10, 12), dtype=np.int8)
+    cl = FrontierCluster(np.array([[5, 5]]), (5.0, 5.0), (0.0, 0.0))
+    for score in (np.nan, np.inf, -np.inf):
+        assert render_map(grid, ranked=[RankedFrontier(cluster=cl, score=score)], scale=4).shape == (40, 48, 3)
+
+    frame = render_map(grid, scale=4)
+    assert add_caption(frame) is frame
+    out = add_caption(frame, "Title", [("mode a", (214, 39, 40), "x"), ("mode b", (44, 160, 44), "^")], scale=2)
+    strip = out[:-40]
+    assert out.shape == (4 + 3 * 16 + 40, 48, 3) and np.array_equal(out[-40:], frame)
+    colors = {tuple(c) for c in strip.reshape(-1, 3)}
+    assert colors == {P.free, P.occupied, (214, 39, 40), (44, 160, 44)}
+    assert (strip[:20] == (214, 39, 40)).all(axis=2).sum() == 0 and (strip[20:36] == (214, 39, 40)).all(axis=2).any()
+
+def test_png_and_gif_decode_to_the_rendered_frames(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    rng = np.random.default_rng(0)
+    for shape in [(5, 7), (9, 4, 3), (3, 11, 4)]:
+        img = rng.integers(0, 256, shape, dtype=np.uint8)
+        assert np.array_equal(np.asarray(Image.open(io.BytesIO(encode_png(img)))), img)
+
+    grid = np.full((40, 70), -1, dtype=np.int8)
+    frames = []
+    for k in range(4):
+        grid[10:30, 5 + 10 * k:15 + 10 * k] = 0
+        grid[20, 5 + 10 * k] = 1
+        frames.append(render_map(grid, frontiers=[(12, 14 + 10 * k)], scale=2))
+    frames.append(frames[-1])
+    path = tmp_path / "ep.gif"
+    with GifWriter(path, fps=25, colors=P.gif_colors) as gif:
+        for f in frames:
+            gif.append(f)
+    im = Image.open(path)
+    assert im.n_frames == 5
+    for k, f in enumerate(frames):
+        im.seek(k)
+        assert im.info["duration"] == 40
+        # Frames made of palette colors only come back exactly.
+        assert np.array_equal(np.asarray(im.convert("RGB")), f)
+    noise = rng.integers(0, 256, (30, 30, 3), dtype=np.uint8)
+    assert np.abs(P.gif_colors[quantize_rgb(noise, P.gif_colors)].astype(int) - noise).mean() < 40